@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Compute related publications at build time.
+
+Every publication becomes a TF-IDF vector (sublinear term frequency over the
+stemmed title, abstract and summary; see lib/text.py) in one sparse matrix.
+The rows are L2-normalized, so a single sparse X @ X.T product gives the
+cosine similarity of every pair that shares a term, and the top RELATED_K
+neighbours above MIN_SIMILARITY are written to
+src/data/related-publications.json:
+
+    {"W2774954674": ["W3012345678", ...], ...}
+
+Keys and values are OpenAlex work IDs (the slug for the few non-W files).
+PublicationLayout reads the map when the site is built.
+
+Per-file term counts are cached in data/cache/ by content hash, so adding
+a paper re-parses only that file. The IDF weights and the similarity
+product are recomputed every run; neither is ever densified, so the cost
+grows with shared terms rather than with the square of the collection. The JSON is
+rewritten only when some neighbour list changed.
+"""
+
+from lib import cli, instrument
+from lib.content import publication_files, term_counts
+from lib.output import report, write_json
+from lib.paths import CACHE_DIR, PUBLICATIONS_DIR, REPO_ROOT
+
+OUTPUT_PATH = REPO_ROOT / "src" / "data" / "related-publications.json"
+CACHE_PATH = CACHE_DIR / "related-publications.json"
+
+FIELD_WEIGHTS = {"title": 2, "abstract": 1, "summary": 1}
+RELATED_K = 5
+MIN_SIMILARITY = 0.08
+
+
+def tfidf_matrix(docs: list[dict]):
+    """L2-normalized TF-IDF rows as a CSR matrix (documents x vocabulary)."""
+    import numpy as np
+    from scipy import sparse
+
+    vocabulary = {}
+    rows, cols, values = [], [], []
+    for i, doc in enumerate(docs):
+        for term, tf in doc["tf"].items():
+            rows.append(i)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            values.append(1.0 + np.log(tf))
+    matrix = sparse.csr_matrix((values, (rows, cols)), shape=(len(docs), len(vocabulary)))
+
+    df = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    idf = np.log((1 + len(docs)) / (1 + df)) + 1.0
+    matrix = matrix.multiply(idf).tocsr()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def top_neighbours(matrix, k=RELATED_K, min_similarity=MIN_SIMILARITY):
+    """Indices of the k most similar other rows for each row, best first."""
+    # Stays sparse: only pairs sharing a term are ever stored or sorted
+    similarity = (matrix @ matrix.T).tocsr()
+    neighbours = []
+    for i in range(similarity.shape[0]):
+        start, end = similarity.indptr[i], similarity.indptr[i + 1]
+        row = [(-score, int(j)) for j, score in zip(similarity.indices[start:end], similarity.data[start:end])
+               if j != i and score >= min_similarity]
+        # Stable ordering: similarity descending, then row index
+        neighbours.append([j for _, j in sorted(row)[:k]])
+    return neighbours
+
+
+def build_related(files: dict) -> dict:
+    docs = sorted(files.values(), key=lambda e: e["id"])
+    neighbours = top_neighbours(tfidf_matrix(docs))
+    return {doc["id"]: [docs[j]["id"] for j in related]
+            for doc, related in zip(docs, neighbours)}
+
+
+def check():
+    cli.run_checks([
+        (f"publications dir: {PUBLICATIONS_DIR}", PUBLICATIONS_DIR.is_dir()),
+        ("pyyaml installed", cli.available("yaml")),
+        ("scipy installed", cli.available("scipy")),
+    ])
+
+
+def main():
+    cli.require("yaml", "pyyaml")
+    cli.require("scipy", "scipy")
+    paths = publication_files()
+    print(f"Relating {len(paths)} publications...")
+    with instrument.stage("parse", files=len(paths)):
+        files, parsed = term_counts(paths, FIELD_WEIGHTS, CACHE_PATH)
+    print(f"  Parsed {parsed} changed file(s), {len(paths) - parsed} from cache")
+
+    with instrument.stage("similarity"):
+        related = build_related(files)
+    linked = sum(1 for ids in related.values() if ids)
+    print(f"  {linked} of {len(related)} publications have related work")
+    write_json(OUTPUT_PATH, related, indent=2)
+
+
+if __name__ == "__main__":
+    args = cli.parse_args(cli.make_parser("Compute related publications by TF-IDF cosine similarity."),
+                          "build-related-publications")
+    if args.check:
+        check()
+    main()
+    report()
+    instrument.finish()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Build the BM25 search index for the publications collection.
+
+Parses src/content/publications/*.md, tokenizes and stems the title,
+authors, publication, abstract and summary (see lib/text.py), and writes a
+compact inverted index to public/data/publications-search.json:
+
+    {"docs": [slug, ...], "lengths": [weighted doc length, ...], "avgdl": ...,
+     "k1": 1.2, "b": 0.75, "terms": {term: [doc, tf, doc, tf, ...]}}
+
+Term frequencies are weighted per field (a title hit counts FIELD_WEIGHTS
+["title"] times). PublicationsSearch loads the file on first search and scores
+queries client-side, so abstracts never have to be shipped to the browser.
+
+Per-file term counts are cached in data/cache/ by content hash; only changed
+or new files are re-parsed, and the index itself is rewritten only if it
+changed.
+"""
+
+from lib import cli, instrument
+from lib.content import publication_files, term_counts
+from lib.output import report, write_json
+from lib.paths import CACHE_DIR, PUBLIC_DATA, PUBLICATIONS_DIR
+from lib.text import TEXT_VERSION
+
+OUTPUT_PATH = PUBLIC_DATA / "publications-search.json"
+CACHE_PATH = CACHE_DIR / "search-index.json"
+
+FIELD_WEIGHTS = {"title": 3, "authors": 2, "publication": 1, "abstract": 1, "summary": 1}
+K1 = 1.2
+B = 0.75
+
+
+def build_index(files: dict) -> dict:
+    docs = sorted(files.values(), key=lambda e: e["slug"])
+    postings = {}
+    for i, doc in enumerate(docs):
+        for term, tf in doc["tf"].items():
+            postings.setdefault(term, []).extend((i, tf))
+    lengths = [doc["length"] for doc in docs]
+    return {
+        "version": TEXT_VERSION,
+        "k1": K1,
+        "b": B,
+        "fieldWeights": FIELD_WEIGHTS,
+        "docs": [doc["slug"] for doc in docs],
+        "lengths": lengths,
+        "avgdl": round(sum(lengths) / len(lengths), 3) if lengths else 0,
+        "terms": dict(sorted(postings.items())),
+    }
+
+
+def check():
+    cli.run_checks([
+        (f"publications dir: {PUBLICATIONS_DIR}", PUBLICATIONS_DIR.is_dir()),
+        ("pyyaml installed", cli.available("yaml")),
+    ])
+
+
+def main():
+    cli.require("yaml", "pyyaml")
+    paths = publication_files()
+    print(f"Indexing {len(paths)} publications...")
+    with instrument.stage("parse", files=len(paths)):
+        files, parsed = term_counts(paths, FIELD_WEIGHTS, CACHE_PATH)
+    print(f"  Parsed {parsed} changed file(s), {len(paths) - parsed} from cache")
+
+    with instrument.stage("build_index"):
+        index = build_index(files)
+    print(f"  {len(index['terms']):,} terms")
+    write_json(OUTPUT_PATH, index)
+
+
+if __name__ == "__main__":
+    args = cli.parse_args(cli.make_parser("Build the publications BM25 search index."), "build-search-index")
+    if args.check:
+        check()
+    main()
+    report()
+    instrument.finish()
@@ -0,0 +1,44 @@
+#!/usr/bin/env npx tsx
+/**
+ * Check the browser tokenizer (src/components/publications/bm25.ts) against
+ * the shared cases in scripts/tests/tokenizer-cases.json, which
+ * scripts/tests/test_text.py runs against scripts/lib/text.py.
+ *
+ * Usage: npm run test:tokenizer
+ */
+
+import { readFileSync } from 'fs';
+import { join } from 'path';
+import { TEXT_VERSION, stem, tokenize } from '../src/components/publications/bm25.js';
+
+interface Cases {
+  version: number;
+  tokenize: { text: string; tokens: string[] }[];
+  stem: Record<string, string>;
+}
+
+const cases: Cases = JSON.parse(
+  readFileSync(join(process.cwd(), 'scripts', 'tests', 'tokenizer-cases.json'), 'utf-8'),
+);
+
+const failures: string[] = [];
+if (cases.version !== TEXT_VERSION) {
+  failures.push(`TEXT_VERSION ${TEXT_VERSION} does not match the cases (version ${cases.version})`);
+}
+for (const { text, tokens } of cases.tokenize) {
+  const actual = tokenize(text);
+  if (JSON.stringify(actual) !== JSON.stringify(tokens)) {
+    failures.push(`tokenize(${JSON.stringify(text)}) = ${JSON.stringify(actual)}, expected ${JSON.stringify(tokens)}`);
+  }
+}
+for (const [word, expected] of Object.entries(cases.stem)) {
+  const actual = stem(word);
+  if (actual !== expected) failures.push(`stem(${JSON.stringify(word)}) = ${JSON.stringify(actual)}, expected ${JSON.stringify(expected)}`);
+}
+
+const total = cases.tokenize.length + Object.keys(cases.stem).length;
+if (failures.length) {
+  failures.forEach(f => console.error(`FAIL ${f}`));
+  process.exit(1);
+}
+console.log(`Tokenizer matches scripts/lib/text.py on ${total} cases`);
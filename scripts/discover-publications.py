@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Discover new publications on OpenAlex and create stub pages for them.
+
+collect_publication_files() in update-publication-citations.py only sees works
+that already have a W*.md file. This stage pages through the author's works
+with OpenAlex cursor pagination, restricted to records changed since the last
+run's high-water mark, and writes a publication stub for every work the site
+does not have yet. Per-run API volume therefore tracks what changed, not the
+size of the bibliography.
+
+Incremental filter:
+  - with OPENALEX_API_KEY set: from_updated_date:<high-water mark>
+  - without a key (from_updated_date is a premium filter): from_publication_date
+    a year before the high-water mark, which still bounds each run
+
+The keyless fallback is only an approximation of "changed since": a work
+published before the lookback window is never seen again, so a paper that
+OpenAlex indexes or attributes to the author late is missed. Delete
+high_water from the state file and run with --backfill to force one full scan.
+
+State (author ID and high-water mark) is kept in data/openalex-discovery.json
+and committed with the stubs so scheduled runs pick up where the last stopped.
+The author ID is resolved once from the existing W*.md works if not configured.
+
+A run without a high-water mark (no state file yet) only records the state
+and creates no stubs, so the first scheduled run does not turn the whole
+bibliography into pages; pass --backfill to create them anyway. Works whose
+DOI or normalized title matches an existing page (e.g. the preprint of a
+published article) are skipped.
+"""
+
+import json
+import os
+import re
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+
+from lib import cli, http, instrument
+from lib.content import read_markdown
+from lib.output import report, write_json, write_text
+from lib.paths import PUBLICATIONS_DIR, REPO_ROOT
+
+OPENALEX_API = "https://api.openalex.org/works"
+MAILTO = "ian.adams@sc.edu"
+AUTHOR_NAME = "Ian T. Adams"
+STATE_PATH = REPO_ROOT / "data" / "openalex-discovery.json"
+PER_PAGE = 200
+PUBLICATION_DATE_LOOKBACK = timedelta(days=365)
+
+# OpenAlex work type -> Wowchemy publication_types code
+PUBLICATION_TYPES = {
+    "article": "2",
+    "review": "2",
+    "letter": "2",
+    "editorial": "2",
+    "preprint": "3",
+    "posted-content": "3",
+    "report": "4",
+    "book": "5",
+    "book-chapter": "6",
+    "dissertation": "7",
+}
+SKIP_TYPES = {"paratext", "erratum", "retraction", "peer-review", "dataset", "other"}
+
+SELECT = ",".join([
+    "id", "doi", "title", "display_name", "type", "publication_date", "updated_date",
+    "primary_location", "authorships", "abstract_inverted_index", "cited_by_count",
+])
+
+
+def load_state() -> dict:
+    try:
+        with open(STATE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def base_params() -> dict:
+    params = {"mailto": MAILTO}
+    if os.environ.get("OPENALEX_API_KEY"):
+        params["api_key"] = os.environ["OPENALEX_API_KEY"]
+    return params
+
+
+def resolve_author_id(state: dict) -> str | None:
+    """Author ID from env/state, else the most common author across existing works."""
+    configured = os.environ.get("OPENALEX_AUTHOR_ID") or state.get("author_id")
+    if configured:
+        return configured
+
+    known = sorted(p.stem for p in PUBLICATIONS_DIR.glob("W*.md"))[:50]
+    if not known:
+        return None
+    params = {
+        **base_params(),
+        "filter": "openalex_id:" + "|".join(f"https://openalex.org/{w}" for w in known),
+        "select": "id,authorships",
+        "per_page": PER_PAGE,
+    }
+    resp = http.get(OPENALEX_API, params=params, timeout=30)
+    resp.raise_for_status()
+
+    counts = Counter()
+    for work in resp.json().get("results", []):
+        for authorship in work.get("authorships", []):
+            author = authorship.get("author") or {}
+            if author.get("id"):
+                counts[author["id"].rsplit("/", 1)[-1]] += 1
+    if not counts:
+        return None
+    author_id, hits = counts.most_common(1)[0]
+    print(f"  Resolved author ID {author_id} (on {hits}/{len(known)} known works)")
+    return author_id
+
+
+def incremental_filter(author_id: str, high_water: str | None) -> str:
+    parts = [f"author.id:{author_id}"]
+    if high_water:
+        if os.environ.get("OPENALEX_API_KEY"):
+            parts.append(f"from_updated_date:{high_water}")
+        else:
+            since = date.fromisoformat(high_water) - PUBLICATION_DATE_LOOKBACK
+            parts.append(f"from_publication_date:{since.isoformat()}")
+    return ",".join(parts)
+
+
+def iter_works(filter_expr: str):
+    """Yield works page by page using cursor pagination."""
+    cursor = "*"
+    page = 0
+    while cursor:
+        page += 1
+        params = {**base_params(), "filter": filter_expr, "select": SELECT,
+                  "per_page": PER_PAGE, "cursor": cursor}
+        with instrument.stage("http_batch", source="openalex", page=page):
+            resp = http.get(OPENALEX_API, params=params, timeout=30)
+            resp.raise_for_status()
+            data = resp.json()
+        results = data.get("results", [])
+        print(f"  Page {page}: {len(results)} works")
+        yield from results
+        cursor = data.get("meta", {}).get("next_cursor") if results else None
+
+
+def known_dois() -> set[str]:
+    """DOIs of every existing publication page, including non-W*.md slugs."""
+    dois = set()
+    for path in PUBLICATIONS_DIR.glob("*.md"):
+        for match in re.finditer(r"https?://doi\.org/(\S+?)['\"]?$", path.read_text(encoding="utf-8"), re.M):
+            dois.add(match.group(1).lower())
+    return dois
+
+
+def normalize_title(title: str) -> str:
+    """Lowercased words only, so quoting and punctuation variants compare equal."""
+    return " ".join(re.findall(r"[^\W_]+", str(title).lower()))
+
+
+def known_titles() -> set[str]:
+    titles = set()
+    for path in PUBLICATIONS_DIR.glob("*.md"):
+        meta, _ = read_markdown(path)
+        if meta.get("title"):
+            titles.add(normalize_title(meta["title"]))
+    return titles
+
+
+def rebuild_abstract(inverted: dict | None) -> str:
+    if not inverted:
+        return "No abstract available"
+    positions = [(pos, word) for word, idxs in inverted.items() for pos in idxs]
+    return " ".join(word for _, word in sorted(positions))
+
+
+def yaml_str(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def render_stub(work: dict) -> str:
+    """Render a publication page in the same layout as the existing W*.md files."""
+    oa_id = work["id"].rsplit("/", 1)[-1]
+    title = work.get("display_name") or work.get("title") or oa_id
+    authors = [
+        (a.get("author") or {}).get("display_name")
+        for a in work.get("authorships", [])
+    ]
+    authors = [a for a in authors if a] or [AUTHOR_NAME]
+    pub_date = work.get("publication_date") or f"{date.today().year}-01-01"
+    source = ((work.get("primary_location") or {}).get("source") or {}).get("display_name") or ""
+    doi_url = work.get("doi") or ""
+    url_source = doi_url or f"https://openalex.org/{oa_id}"
+    month_year = datetime.now(timezone.utc).strftime("%B %Y")
+
+    lines = ["---", f"title: {yaml_str(title)}", "authors:"]
+    lines += [f"- {yaml_str(a)}" for a in authors]
+    lines += [
+        f"date: '{pub_date}'",
+        f"publishDate: '{pub_date}'",
+        "publication_types:",
+        f"- '{PUBLICATION_TYPES.get(work.get('type'), '0')}'",
+        f"publication: {yaml_str(source)}",
+        "publication_short: ''",
+        f"abstract: {yaml_str(rebuild_abstract(work.get('abstract_inverted_index')))}",
+        "summary: ''",
+        "featured: false",
+        "url_pdf: ''",
+        "url_code: ''",
+        "url_dataset: ''",
+        "url_poster: ''",
+        "url_project: ''",
+        "url_slides: ''",
+        f"url_source: {url_source}",
+        "url_video: ''",
+        "projects: []",
+        "tags: []",
+        "categories: []",
+        "links:",
+        "- name: OpenAlex",
+        f"  url: https://openalex.org/{oa_id}",
+    ]
+    if doi_url:
+        lines += ["- name: DOI", f"  url: {doi_url}"]
+    lines += [
+        "---",
+        "",
+        "## Summary",
+        "",
+        "No summary available.",
+        "",
+        "## Citation Information",
+        "",
+        f"**Citations:** {work.get('cited_by_count', 0)} (as of {month_year})",
+        "",
+        f"[View Publication]({url_source})",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def check():
+    cli.run_checks([
+        (f"publications dir: {PUBLICATIONS_DIR}", PUBLICATIONS_DIR.is_dir()),
+        ("pyyaml installed", cli.available("yaml")),
+        (f"state file: {STATE_PATH}", STATE_PATH.exists(), False),
+        ("OPENALEX_API_KEY set (enables from_updated_date)", bool(os.environ.get("OPENALEX_API_KEY")), False),
+        (f"HTTP cache mode: {http.mode()}", True),
+    ])
+
+
+def main(backfill: bool = False):
+    cli.require("yaml", "pyyaml")
+    print("Discovering new works on OpenAlex...")
+    run_started = datetime.now(timezone.utc).date().isoformat()
+    state = load_state()
+
+    author_id = resolve_author_id(state)
+    if not author_id:
+        print("  Could not determine OpenAlex author ID; set OPENALEX_AUTHOR_ID")
+        return
+
+    high_water = state.get("high_water")
+    # Overlap by a day so works updated during this run are seen next time
+    new_state = {
+        "author_id": author_id,
+        "high_water": (date.fromisoformat(run_started) - timedelta(days=1)).isoformat(),
+    }
+    if not high_water and not backfill:
+        write_json(STATE_PATH, new_state, indent=2)
+        print("  No high-water mark yet: recorded the state without creating stubs "
+              "(rerun with --backfill for a full scan)")
+        return
+
+    filter_expr = incremental_filter(author_id, high_water)
+    print(f"  Filter: {filter_expr}")
+
+    existing_ids = {p.stem for p in PUBLICATIONS_DIR.glob("W*.md")}
+    existing_dois = known_dois()
+    existing_titles = known_titles()
+    created = []
+    seen = 0
+    for work in iter_works(filter_expr):
+        seen += 1
+        oa_id = work["id"].rsplit("/", 1)[-1]
+        doi = (work.get("doi") or "").lower().replace("https://doi.org/", "")
+        if oa_id in existing_ids or (doi and doi in existing_dois):
+            continue
+        if work.get("type") in SKIP_TYPES:
+            continue
+        title = normalize_title(work.get("display_name") or work.get("title") or "")
+        if title and title in existing_titles:
+            continue
+        write_text(PUBLICATIONS_DIR / f"{oa_id}.md", render_stub(work))
+        existing_ids.add(oa_id)
+        existing_titles.add(title)
+        created.append(oa_id)
+        print(f"  New: {oa_id} {(work.get('display_name') or '')[:70]}")
+
+    write_json(STATE_PATH, new_state, indent=2)
+    print(f"\nScanned {seen} changed works, created {len(created)} stubs")
+
+
+if __name__ == "__main__":
+    parser = cli.make_parser("Create stubs for new OpenAlex works.")
+    parser.add_argument("--backfill", action="store_true",
+                        help="on a run without a high-water mark, create stubs for every work")
+    args = cli.parse_args(parser, "discover-publications")
+    if args.check:
+        check()
+    else:
+        main(backfill=args.backfill)
+        report()
+        instrument.finish()
@@ -10,24 +10,18 @@ Strategy:
      and preserve existing h-index/i10-index
 
 Preserves existing data if all sources fail (doesn't overwrite good data with errors).
+
+scholarly is imported only by the Scholar strategies, so the OpenAlex fallback
+still runs without it. OpenAlex requests go through lib.http (see --http-cache).
 """
 
 import json
-import re
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 
-try:
-    from scholarly import scholarly, ProxyGenerator
-except ImportError:
-    print("Please install scholarly: pip install scholarly")
-    exit(1)
-
-try:
-    import requests
-except ImportError:
-    requests = None
+from lib import cli, http, instrument
+from lib.output import report, write_json
 
 SCHOLAR_ID = "g9lY5RUAAAAJ"
 SCRIPT_DIR = Path(__file__).parent
@@ -48,8 +42,15 @@ def load_existing_metrics():
     return None
 
 
+def load_scholarly():
+    """Import scholarly on demand; raises ImportError if it is not installed."""
+    from scholarly import scholarly, ProxyGenerator
+    return scholarly, ProxyGenerator
+
+
 def try_setup_proxy():
     """Attempt to set up a proxy. Returns True if successful."""
+    scholarly, ProxyGenerator = load_scholarly()
     try:
         pg = ProxyGenerator()
         success = pg.FreeProxies()
@@ -64,6 +65,9 @@ def try_setup_proxy():
 
 def fetch_scholar(use_proxy=False):
     """Fetch scholar data. Optionally set up proxy first."""
+    if http.offline():
+        raise ConnectionError("HTTP replay mode: Scholar responses are not cacheable")
+    scholarly, _ = load_scholarly()
     if use_proxy:
         print("  Setting up proxy...")
         if not try_setup_proxy():
@@ -72,8 +76,9 @@ def fetch_scholar(use_proxy=False):
     for attempt in range(1, MAX_RETRIES + 1):
         try:
             print(f"  Attempt {attempt}/{MAX_RETRIES}...")
-            author = scholarly.search_author_id(SCHOLAR_ID)
-            author = scholarly.fill(author, sections=['basics', 'indices'])
+            with instrument.stage("download", source="scholar", proxy=use_proxy):
+                author = scholarly.search_author_id(SCHOLAR_ID)
+                author = scholarly.fill(author, sections=['basics', 'indices'])
 
             h_index = author.get("hindex")
             i10_index = author.get("i10index")
@@ -101,10 +106,6 @@ def fetch_scholar(use_proxy=False):
 
 def fetch_openalex_total_citations():
     """Fallback: sum cited_by_count from OpenAlex for all publications."""
-    if requests is None:
-        print("  requests library not available, cannot use OpenAlex fallback")
-        return None
-
     oa_ids = [p.stem for p in sorted(PUBLICATIONS_DIR.glob("W*.md"))]
     if not oa_ids:
         return None
@@ -121,20 +122,34 @@ def fetch_openalex_total_citations():
             "per_page": 200,
             "mailto": "ian.adams@sc.edu",
         }
+        from_cache = False
         try:
-            resp = requests.get("https://api.openalex.org/works", params=params, timeout=30)
-            resp.raise_for_status()
-            for work in resp.json().get("results", []):
-                total += work.get("cited_by_count", 0)
+            with instrument.stage("http_batch", source="openalex", batch=batch_num):
+                resp = http.get("https://api.openalex.org/works", params=params, timeout=30)
+                from_cache = resp.from_cache
+                resp.raise_for_status()
+                for work in resp.json().get("results", []):
+                    total += work.get("cited_by_count", 0)
         except Exception as e:
             print(f"  OpenAlex batch {batch_num} failed: {e}")
             return None
-        if batch_num < len(batches):
+        if batch_num < len(batches) and not from_cache:
             time.sleep(1)
 
     return total
 
 
+def check():
+    """Validate paths and dependencies without fetching anything."""
+    cli.run_checks([
+        (f"publications dir: {PUBLICATIONS_DIR}", PUBLICATIONS_DIR.is_dir()),
+        (f"output dir: {OUTPUT_PATH.parent}", OUTPUT_PATH.parent.is_dir()),
+        ("scholarly installed (Scholar strategies)", cli.available("scholarly"), False),
+        ("requests installed (urllib is used otherwise)", cli.available("requests"), False),
+        (f"HTTP cache mode: {http.mode()}", True),
+    ])
+
+
 def main():
     print(f"Fetching Google Scholar data for ID: {SCHOLAR_ID}")
 
@@ -159,7 +174,7 @@ def main():
     print("\nStep 2: Scholar fetch with proxy...")
     try:
         # Reset scholarly state before retrying with proxy
-        scholarly.clear_proxy()
+        load_scholarly()[0].clear_proxy()
         metrics = fetch_scholar(use_proxy=True)
         print(f"  Success! h={metrics['h_index']}, i10={metrics['i10_index']}, "
               f"citations={metrics['citations']}")
@@ -192,9 +207,7 @@ def main():
         print("Preserving existing valid data")
         existing["last_fetch_attempt"] = datetime.now(timezone.utc).isoformat()
         existing["last_fetch_error"] = "All strategies failed (direct, proxy, OpenAlex)"
-        OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
-            json.dump(existing, f, indent=2)
+        write_json(OUTPUT_PATH, existing, indent=2)
     else:
         print("No existing valid data, writing fallback")
         fallback = {
@@ -207,18 +220,23 @@ def main():
             "scholar_url": f"https://scholar.google.com/citations?user={SCHOLAR_ID}",
             "error": "All strategies failed"
         }
-        OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
-            json.dump(fallback, f, indent=2)
+        write_json(OUTPUT_PATH, fallback, indent=2)
 
 
 def save_metrics(metrics):
-    """Write metrics JSON to disk."""
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
-        json.dump(metrics, f, indent=2)
-    print(f"Saved to {OUTPUT_PATH}")
+    """Write metrics JSON to disk (atomically, only if changed)."""
+    with instrument.stage("write"):
+        written = write_json(OUTPUT_PATH, metrics, indent=2)
+    if written:
+        print(f"Saved to {OUTPUT_PATH}")
+    else:
+        print(f"Unchanged: {OUTPUT_PATH}")
 
 
 if __name__ == "__main__":
+    args = cli.parse_args(cli.make_parser("Fetch Google Scholar metrics."), "fetch-scholar-metrics")
+    if args.check:
+        check()
     main()
+    report()
+    instrument.finish()
@@ -0,0 +1,220 @@
+"""
+Incremental directory sync for static assets.
+
+Replaces the old ``rmtree`` + ``copytree`` approach. Each destination keeps a
+manifest of what was last synced into it (size, mtime and SHA-256 of the
+source file), so an unchanged file is recognised from a ``stat`` call alone
+and is never rewritten. Its mtime stays stable, which keeps the Astro build
+cache warm.
+
+Rules:
+  - new or changed source files are copied (reflink, then plain copy; hardlinks
+    are opt-in because they tie the destination to the source inode)
+  - a file whose content hash matches the destination is skipped even if its
+    mtime moved (e.g. a fresh checkout)
+  - only files that this sync previously created and that have since
+    disappeared from the source are deleted; anything else living in the
+    destination (generated JSON feeds, for example) is left alone
+  - directories emptied by those deletes are removed too
+"""
+
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .digest import file_digest
+from .paths import CACHE_DIR
+
+MANIFEST_PATH = CACHE_DIR / "asset-manifest.json"
+DEFAULT_WORKERS = 8
+
+# Linux FICLONE ioctl (btrfs, xfs with reflink=1, bcachefs, ...)
+_FICLONE = 0x40049409
+
+
+@dataclass
+class SyncReport:
+    """Counters for one sync_tree() call."""
+    copied: int = 0
+    copied_bytes: int = 0
+    skipped: int = 0
+    skipped_bytes: int = 0
+    deleted: int = 0
+    methods: dict = field(default_factory=dict)
+
+    def summary(self) -> str:
+        methods = ", ".join(f"{k}={v}" for k, v in sorted(self.methods.items()))
+        return (f"{self.copied} copied ({_fmt_bytes(self.copied_bytes)}), "
+                f"{self.skipped} skipped ({_fmt_bytes(self.skipped_bytes)}), "
+                f"{self.deleted} deleted"
+                + (f" [{methods}]" if methods else ""))
+
+
+def _fmt_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n} B"
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> dict:
+    """Load the sync manifest, or an empty one if missing/corrupt."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(manifest: dict, path: Path = MANIFEST_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _try_reflink(src: Path, dst: Path) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, 'rb') as fs, open(dst, 'wb') as fd:
+            fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+        return True
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+
+
+def _place_file(src: Path, dst: Path, link: str) -> str:
+    """Materialise src at dst atomically. Returns the method used."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.sync-tmp")
+    tmp.unlink(missing_ok=True)
+
+    method = None
+    if link == "hardlink":
+        try:
+            os.link(src, tmp)
+            method = "hardlink"
+        except OSError:
+            pass
+    if method is None and link in ("auto", "reflink", "hardlink") and _try_reflink(src, tmp):
+        shutil.copystat(src, tmp)
+        method = "reflink"
+    if method is None:
+        shutil.copy2(src, tmp)
+        method = "copy"
+
+    os.replace(tmp, dst)
+    return method
+
+
+def _scan(root: Path) -> dict[str, os.stat_result]:
+    files = {}
+    for path in root.rglob("*"):
+        if path.is_file() and not path.name.endswith(".sync-tmp"):
+            files[path.relative_to(root).as_posix()] = path.stat()
+    return files
+
+
+def sync_tree(src: Path, dst: Path, manifest: dict, workers: int = DEFAULT_WORKERS,
+              link: str = "auto") -> SyncReport:
+    """
+    Make dst mirror src, touching only what changed.
+
+    ``manifest`` is the per-destination entry (rel path -> file record) and is
+    updated in place. ``link`` is one of "auto" (reflink if possible, else
+    copy), "reflink", "hardlink" or "copy".
+    """
+    report = SyncReport()
+    src_files = _scan(src)
+    dst_files = _scan(dst) if dst.exists() else {}
+
+    to_copy: list[tuple[str, os.stat_result]] = []
+    to_verify: list[tuple[str, os.stat_result]] = []
+
+    for rel, st in src_files.items():
+        entry = manifest.get(rel)
+        dst_st = dst_files.get(rel)
+        if dst_st is None:
+            to_copy.append((rel, st))
+        elif (entry
+              and entry["size"] == st.st_size
+              and entry["mtime_ns"] == st.st_mtime_ns
+              and entry.get("dst_size") == dst_st.st_size
+              and entry.get("dst_mtime_ns") == dst_st.st_mtime_ns):
+            report.skipped += 1
+            report.skipped_bytes += st.st_size
+        elif dst_st.st_size != st.st_size:
+            to_copy.append((rel, st))
+        else:
+            to_verify.append((rel, st))
+
+    def verify(item):
+        rel, st = item
+        src_hash = file_digest(src / rel)
+        return rel, st, src_hash, src_hash == file_digest(dst / rel)
+
+    def copy(item):
+        rel, st = item
+        src_hash = file_digest(src / rel)
+        method = _place_file(src / rel, dst / rel, link)
+        return rel, st, src_hash, method
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for rel, st, src_hash, same in pool.map(verify, to_verify):
+            if same:
+                report.skipped += 1
+                report.skipped_bytes += st.st_size
+                _record(manifest, rel, st, src_hash, dst / rel)
+            else:
+                to_copy.append((rel, st))
+
+        for rel, st, src_hash, method in pool.map(copy, to_copy):
+            report.copied += 1
+            report.copied_bytes += st.st_size
+            report.methods[method] = report.methods.get(method, 0) + 1
+            _record(manifest, rel, st, src_hash, dst / rel)
+
+    # Delete only files we previously synced that are gone from the source
+    for rel in list(manifest):
+        if rel not in src_files:
+            target = dst / rel
+            if target.is_file():
+                target.unlink()
+                report.deleted += 1
+                _prune_empty(target.parent, dst)
+            del manifest[rel]
+
+    return report
+
+
+def _prune_empty(directory: Path, root: Path) -> None:
+    """Remove directory and its parents up to (not including) root while empty."""
+    while directory != root and root in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:  # not empty (or already gone)
+            return
+        directory = directory.parent
+
+
+def _record(manifest: dict, rel: str, st: os.stat_result, digest: str, dst_path: Path) -> None:
+    dst_st = dst_path.stat()
+    manifest[rel] = {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": digest,
+        "dst_size": dst_st.st_size,
+        "dst_mtime_ns": dst_st.st_mtime_ns,
+    }
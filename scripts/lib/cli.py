@@ -0,0 +1,79 @@
+"""
+Common command-line handling for the data scripts.
+
+Every data script builds its parser with make_parser(), which adds:
+  --check   validate configuration, paths and installed dependencies, then exit
+            without touching the network or writing anything
+  --trace   enable lib.instrument (same as PIPELINE_TRACE=1)
+  --http-cache MODE
+            off | use | record | replay for lib.http (same as HTTP_CACHE=MODE)
+
+The runners (run-pipeline.py, run-benchmarks.py) keep their own parsers and
+do not take these flags; they launch the data scripts, which do.
+
+Heavy libraries (pandas, numpy, statsmodels, scholarly) are never imported at
+module level; stages import them when they run, via require() where a friendly
+"please install" message is wanted. A --check run therefore starts in a
+fraction of a second.
+"""
+
+import argparse
+import importlib
+import importlib.util
+import os
+import sys
+
+from . import http, instrument
+
+
+def make_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--check", action="store_true",
+                        help="validate configuration and dependencies, then exit")
+    parser.add_argument("--trace", action="store_true",
+                        help="record stage timings and a profile (see lib/instrument.py)")
+    parser.add_argument("--http-cache", choices=http.MODES,
+                        help="HTTP response cache mode (see lib/http.py)")
+    return parser
+
+
+def parse_args(parser: argparse.ArgumentParser, name: str, argv=None) -> argparse.Namespace:
+    args = parser.parse_args(argv)
+    if args.http_cache:
+        http.set_mode(args.http_cache)
+    if args.trace or os.environ.get(instrument.ENV_VAR, "") not in ("", "0"):
+        instrument.start(name)
+    return args
+
+
+def available(module: str) -> bool:
+    """True if module is importable, without importing it."""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def require(module: str, install_hint: str):
+    """Import and return module, or exit with an install hint."""
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        print(f"Please install {install_hint}: pip install {install_hint}")
+        sys.exit(1)
+
+
+def run_checks(checks: list[tuple]) -> None:
+    """
+    Print (label, ok[, required]) check results and exit.
+
+    Exits non-zero only if a required check failed; optional failures are
+    reported as warnings.
+    """
+    failed = False
+    for label, ok, *rest in checks:
+        required = rest[0] if rest else True
+        status = "ok" if ok else ("FAIL" if required else "warn")
+        print(f"  [{status}] {label}")
+        failed = failed or (required and not ok)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,100 @@
+"""
+Read the site's markdown content collections (frontmatter + body).
+
+term_counts() turns frontmatter fields into weighted term frequencies for the
+search and related-publications stages, caching them per file by content
+hash so only edited or new files are re-parsed.
+"""
+
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+from .digest import file_digest
+from .output import atomic_replace, dumps
+from .paths import PUBLICATIONS_DIR, REPO_ROOT
+from .text import TEXT_VERSION, tokenize
+
+FRONTMATTER = re.compile(r"\A---\r?\n(.*?)^---[ \t]*$\r?\n?", re.S | re.M)
+OPENALEX_ID = re.compile(r"^W\d+$")
+PLACEHOLDERS = {"No abstract available", "No summary available."}
+
+
+def read_markdown(path: Path) -> tuple[dict, str]:
+    """Split a markdown file into (frontmatter dict, body)."""
+    import yaml
+
+    text = Path(path).read_text(encoding="utf-8")
+    # Delimiters are whole "---" lines; "---" may also occur inside values
+    match = FRONTMATTER.match(text)
+    if not match:
+        return {}, text
+    return yaml.safe_load(match.group(1)) or {}, text[match.end():]
+
+
+def slug(path: Path) -> str:
+    """Astro collection slug for a content file (lowercased file stem)."""
+    return Path(path).stem.lower()
+
+
+def publication_files(directory: Path = PUBLICATIONS_DIR) -> list[Path]:
+    return sorted(p for p in Path(directory).glob("*.md") if not p.name.startswith("_"))
+
+
+def work_id(path: Path) -> str:
+    """OpenAlex work ID for W*.md files, otherwise the slug."""
+    stem = Path(path).stem
+    return stem if OPENALEX_ID.match(stem) else slug(path)
+
+
+def field_text(meta: dict, field: str) -> str:
+    value = meta.get(field) or ""
+    if isinstance(value, list):
+        value = " ".join(str(v) for v in value)
+    value = str(value)
+    return "" if value.strip() in PLACEHOLDERS else value
+
+
+def document_terms(path: Path, field_weights: dict) -> dict:
+    """Weighted term frequencies and total weighted length for one file."""
+    meta, _ = read_markdown(path)
+    tf = Counter()
+    for field, weight in field_weights.items():
+        for term in tokenize(field_text(meta, field)):
+            tf[term] += weight
+    return {"tf": dict(tf), "length": sum(tf.values())}
+
+
+def term_counts(paths: list[Path], field_weights: dict, cache_path: Path) -> tuple[dict, int]:
+    """
+    Term data per file ({relpath: {sha256, id, slug, tf, length}}) and the
+    number of files that had to be re-parsed.
+
+    Cached entries are reused when the file hash matches and the tokenizer
+    version and field weights are the ones that produced them.
+    """
+    version = [TEXT_VERSION, field_weights]
+    cached = {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("version") == version:
+            cached = cache.get("files", {})
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    files = {}
+    parsed = 0
+    for path in paths:
+        key = path.relative_to(REPO_ROOT).as_posix()
+        digest = file_digest(path)
+        entry = cached.get(key)
+        if entry is None or entry["sha256"] != digest:
+            entry = {"sha256": digest, "id": work_id(path), "slug": slug(path),
+                     **document_terms(path, field_weights)}
+            parsed += 1
+        files[key] = entry
+
+    atomic_replace(cache_path, dumps({"version": version, "files": files}).encode('utf-8'))
+    return files, parsed
@@ -0,0 +1,117 @@
+"""
+Binary classifier diagnostics from predicted probabilities.
+
+Everything is derived from one descending sort of the predictions: the
+cumulative sums of positives and negatives along that order give the
+confusion counts at every distinct threshold, and the fixed-resolution
+curves and threshold grid are read off those arrays with searchsorted.
+There are no per-threshold passes over the data.
+
+ROC and PR curves need both classes: with no positives or no negatives the
+rates are undefined, so auc, averagePrecision, roc and pr are None (null in
+the JSON) while calibration and the confusion grid are still reported.
+"""
+
+import numpy as np
+
+CALIBRATION_BINS = 10
+CURVE_POINTS = 101
+THRESHOLD_STEP = 0.01
+
+
+def _r(values, digits=4):
+    return [round(float(v), digits) for v in values]
+
+
+def cumulative_counts(y, p):
+    """Distinct thresholds (descending) with true/false positives at p >= threshold."""
+    order = np.argsort(-p, kind="mergesort")
+    p_sorted = p[order]
+    y_sorted = y[order]
+    tps = np.cumsum(y_sorted)
+    fps = np.cumsum(1 - y_sorted)
+    # Keep the last row of each tie group so tied scores move together
+    last = np.r_[np.flatnonzero(np.diff(p_sorted)), len(p_sorted) - 1]
+    return p_sorted[last], tps[last], fps[last]
+
+
+def roc_curve(tps, fps, points=CURVE_POINTS):
+    """AUC and the ROC curve resampled at evenly spaced false-positive rates."""
+    tpr = np.r_[0, tps / tps[-1]]
+    fpr = np.r_[0, fps / fps[-1]]
+    auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+    grid = np.linspace(0, 1, points)
+    # Best TPR reachable without exceeding each grid FPR
+    idx = np.searchsorted(fpr, grid, side="right") - 1
+    return auc, {"fpr": _r(grid), "tpr": _r(tpr[idx])}
+
+
+def pr_curve(tps, fps, points=CURVE_POINTS):
+    """Average precision and the interpolated PR curve at evenly spaced recalls."""
+    recall = tps / tps[-1]
+    precision = tps / (tps + fps)
+    average_precision = float(np.sum(np.diff(np.r_[0, recall]) * precision))
+    # Interpolated precision: best precision at any recall >= r
+    best = np.maximum.accumulate(precision[::-1])[::-1]
+    grid = np.linspace(0, 1, points)
+    idx = np.minimum(np.searchsorted(recall, grid, side="left"), len(recall) - 1)
+    return average_precision, {"recall": _r(grid), "precision": _r(best[idx])}
+
+
+def calibration(y, p, bins=CALIBRATION_BINS):
+    """Equal-width calibration bins; empty bins are omitted."""
+    which = np.minimum((p * bins).astype(int), bins - 1)
+    count = np.bincount(which, minlength=bins)
+    mean_p = np.bincount(which, weights=p, minlength=bins)
+    observed = np.bincount(which, weights=y, minlength=bins)
+    keep = count > 0
+    return [
+        {"lower": round(i / bins, 4), "upper": round((i + 1) / bins, 4), "count": int(n),
+         "meanPredicted": round(float(s / n), 4), "observedRate": round(float(o / n), 4)}
+        for i, n, s, o in zip(np.flatnonzero(keep).tolist(), count[keep], mean_p[keep], observed[keep])
+    ]
+
+
+def threshold_confusion(y, p, step=THRESHOLD_STEP):
+    """TP/FP/TN/FN for predicting positive at p >= t over a fixed threshold grid."""
+    thresholds = np.round(np.arange(0, 1 + step / 2, step), 10)
+    order = np.argsort(p, kind="mergesort")
+    p_asc = p[order]
+    # Positives among the first i rows in ascending order, for i = 0..n
+    pos_below = np.r_[0, np.cumsum(y[order])]
+    cut = np.searchsorted(p_asc, thresholds, side="left")
+    positives = int(y.sum())
+    negatives = len(y) - positives
+    fn = pos_below[cut]
+    tn = cut - fn
+    return {
+        "thresholds": _r(thresholds, 2),
+        "tp": (positives - fn).astype(int).tolist(),
+        "fp": (negatives - tn).astype(int).tolist(),
+        "tn": tn.astype(int).tolist(),
+        "fn": fn.astype(int).tolist(),
+    }
+
+
+def binary_diagnostics(y, p) -> dict:
+    """Calibration, ROC/PR curves, AUC and threshold confusion for one model."""
+    y = np.asarray(y, dtype=float)
+    p = np.asarray(p, dtype=float)
+    positives = int(y.sum())
+    auc = average_precision = roc = pr = None
+    if 0 < positives < len(y):
+        _, tps, fps = cumulative_counts(y, p)
+        auc, roc = roc_curve(tps, fps)
+        average_precision, pr = pr_curve(tps, fps)
+        auc, average_precision = round(auc, 4), round(average_precision, 4)
+    return {
+        "n": int(len(y)),
+        "positives": positives,
+        "auc": auc,
+        "averagePrecision": average_precision,
+        "brier": round(float(np.mean((p - y) ** 2)), 4) if len(y) else None,
+        "calibration": calibration(y, p),
+        "roc": roc,
+        "pr": pr,
+        "confusion": threshold_confusion(y, p),
+    }
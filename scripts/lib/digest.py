@@ -0,0 +1,28 @@
+"""
+Streaming file hashing.
+
+Files are read in fixed-size chunks so large PDFs and workbooks never have to
+be held in memory just to decide whether they changed.
+"""
+
+import hashlib
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+
+def file_digest(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """Return the SHA-256 hex digest of a file, reading it in chunks."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def bytes_digest(data: bytes) -> str:
+    """Return the SHA-256 hex digest of an in-memory payload."""
+    return hashlib.sha256(data).hexdigest()
@@ -0,0 +1,54 @@
+"""
+Git helpers for the local sync scripts.
+
+All staging, committing and pushing goes through commit_and_push() so a
+single change set costs one add, one commit and one push, each timed.
+"""
+
+import subprocess
+import time
+from pathlib import Path
+
+from .paths import REPO_ROOT
+
+
+def run(cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True, **kwargs)
+
+
+def _timed(label: str, cmd: list[str], timings: dict) -> subprocess.CompletedProcess:
+    start = time.perf_counter()
+    result = run(cmd)
+    timings[label] = time.perf_counter() - start
+    return result
+
+
+def commit_and_push(paths: list[Path], message: str) -> bool:
+    """Stage paths, commit with message and push. Returns True on success."""
+    rel_paths = [str(Path(p).resolve().relative_to(REPO_ROOT)) for p in paths]
+    timings: dict[str, float] = {}
+
+    result = _timed("add", ["git", "add", "--all", "--", *rel_paths], timings)
+    if result.returncode != 0:
+        print(f"git add failed:\n{result.stderr}")
+        return False
+
+    # Nothing staged means an earlier run committed but failed to push
+    staged = _timed("diff", ["git", "diff", "--cached", "--quiet", "--", *rel_paths], timings)
+    if staged.returncode != 0:
+        result = _timed("commit", ["git", "commit", "-m", message, "--", *rel_paths], timings)
+        if result.returncode != 0:
+            print(f"Commit failed:\n{result.stderr or result.stdout}")
+            return False
+        print(f"Committed: {message}")
+    else:
+        print("Nothing new to commit; pushing pending commits.")
+
+    result = _timed("push", ["git", "push"], timings)
+    if result.returncode != 0:
+        print(f"Push failed:\n{result.stderr}")
+        return False
+    print("Pushed to origin.")
+
+    print("  git timings: " + ", ".join(f"{k} {v:.2f}s" for k, v in timings.items()))
+    return True
@@ -0,0 +1,216 @@
+"""
+HTTP GET with an on-disk record/replay cache.
+
+Responses are keyed by method, URL and (sorted) query params and stored under
+data/cache/http/. The mode comes from HTTP_CACHE (or --http-cache):
+
+  off     always hit the network, never read or write the cache (default, so
+          production runs always see live data)
+  use     serve cached responses younger than the TTL, fetch and store otherwise;
+          for development, e.g. `HTTP_CACHE=use python scripts/discover-publications.py`
+  record  always fetch and overwrite the cache (refresh fixtures)
+  replay  serve only from the cache, regardless of age; a miss raises CacheMiss.
+          Nothing touches the network, so runs are deterministic and work offline.
+
+HTTP_CACHE_TTL (seconds, default 3600) bounds freshness in "use" mode and
+HTTP_CACHE_MAX_MB (default 512) bounds the cache size. The cache is sized
+once per process with stat calls and then tracked in memory; when a store
+pushes it over the limit, least-recently-used entries (by meta-file mtime,
+refreshed on every hit) are evicted. run-benchmarks.py runs in replay mode.
+
+Only successful (2xx) responses are cached. requests is used when installed,
+urllib otherwise.
+"""
+
+import json
+import os
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .digest import bytes_digest
+from .output import atomic_replace
+from .paths import CACHE_DIR
+
+HTTP_CACHE_DIR = CACHE_DIR / "http"
+MODES = ("off", "use", "record", "replay")
+DEFAULT_TTL = 3600
+DEFAULT_MAX_MB = 512
+USER_AGENT = "ianadamsresearch.com data scripts"
+
+_cache_bytes = None  # running size of HTTP_CACHE_DIR, scanned on the first store
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a request has no cached response."""
+
+
+class HTTPError(Exception):
+    def __init__(self, response: "Response"):
+        super().__init__(f"HTTP {response.status_code} for {response.url}")
+        self.response = response
+
+
+@dataclass
+class Response:
+    url: str
+    status_code: int
+    content: bytes
+    headers: dict = field(default_factory=dict)
+    from_cache: bool = False
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not 200 <= self.status_code < 300:
+            raise HTTPError(self)
+
+
+def mode() -> str:
+    value = os.environ.get("HTTP_CACHE", "off").lower()
+    if value not in MODES:
+        raise ValueError(f"HTTP_CACHE must be one of {MODES}, got {value!r}")
+    return value
+
+
+def set_mode(value: str) -> None:
+    if value not in MODES:
+        raise ValueError(f"HTTP cache mode must be one of {MODES}, got {value!r}")
+    os.environ["HTTP_CACHE"] = value
+
+
+def offline() -> bool:
+    """True when the network must not be used (strict replay)."""
+    return mode() == "replay"
+
+
+def cache_key(method: str, url: str, params: dict | None) -> str:
+    canonical = json.dumps([method.upper(), url, sorted((params or {}).items())],
+                           separators=(',', ':'), default=str)
+    return bytes_digest(canonical.encode('utf-8'))
+
+
+def _paths(key: str) -> tuple[Path, Path]:
+    base = HTTP_CACHE_DIR / key[:2] / key
+    return base.with_suffix(".body"), base.with_suffix(".meta.json")
+
+
+def _load(key: str) -> tuple[Response, dict] | None:
+    body_path, meta_path = _paths(key)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        content = body_path.read_bytes()
+    except (OSError, json.JSONDecodeError):
+        return None
+    return Response(meta["url"], meta["status"], content, meta.get("headers", {}), True), meta
+
+
+def _touch(key: str) -> None:
+    """Mark an entry as used; eviction orders entries by this mtime."""
+    try:
+        os.utime(_paths(key)[1])
+    except OSError:
+        pass
+
+
+def _store(key: str, response: Response, params: dict | None) -> None:
+    global _cache_bytes
+    body_path, meta_path = _paths(key)
+    atomic_replace(body_path, response.content)
+    atomic_replace(meta_path, json.dumps({
+        "url": response.url,
+        "params": params or {},
+        "status": response.status_code,
+        "headers": {k: v for k, v in response.headers.items()
+                    if k.lower() in ("content-type", "etag", "last-modified")},
+        "size": len(response.content),
+        "fetched": time.time(),
+    }).encode('utf-8'))
+
+    limit = float(os.environ.get("HTTP_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024
+    if _cache_bytes is None:
+        _cache_bytes = sum(p.stat().st_size for p in HTTP_CACHE_DIR.glob("*/*.body"))
+    else:
+        _cache_bytes += len(response.content)
+    if _cache_bytes > limit:
+        _cache_bytes = _evict(limit)
+
+
+def _evict(limit: float) -> int:
+    """Drop least-recently-used entries until the cache fits; returns the new size."""
+    entries = []
+    total = 0
+    for body_path in HTTP_CACHE_DIR.glob("*/*.body"):
+        meta_path = body_path.with_suffix(".meta.json")
+        try:
+            size = body_path.stat().st_size
+            used = meta_path.stat().st_mtime
+        except OSError:
+            continue
+        entries.append((used, size, body_path, meta_path))
+        total += size
+    for _, size, body_path, meta_path in sorted(entries):
+        if total <= limit * 0.9:
+            break
+        body_path.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+        total -= size
+    return total
+
+
+def _fetch(url: str, params: dict | None, timeout: float) -> Response:
+    try:
+        import requests
+    except ImportError:
+        requests = None
+
+    if requests is not None:
+        resp = requests.get(url, params=params, timeout=timeout, headers={"User-Agent": USER_AGENT})
+        return Response(resp.url, resp.status_code, resp.content, dict(resp.headers))
+
+    full_url = url + ("?" + urllib.parse.urlencode(params) if params else "")
+    req = urllib.request.Request(full_url, headers={"User-Agent": USER_AGENT})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return Response(full_url, resp.status, resp.read(), dict(resp.headers))
+    except urllib.error.HTTPError as e:
+        return Response(full_url, e.code, e.read(), dict(e.headers))
+
+
+def get(url: str, params: dict | None = None, timeout: float = 30, ttl: float | None = None) -> Response:
+    """GET url through the cache according to the current mode."""
+    current = mode()
+    key = cache_key("GET", url, params)
+    ttl = float(os.environ.get("HTTP_CACHE_TTL", DEFAULT_TTL)) if ttl is None else ttl
+
+    if current in ("use", "replay"):
+        cached = _load(key)
+        if cached is not None:
+            response, meta = cached
+            if current == "replay" or time.time() - meta.get("fetched", 0) <= ttl:
+                _touch(key)
+                return response
+        if current == "replay":
+            raise CacheMiss(f"No cached response for GET {url} {params or ''}")
+
+    response = _fetch(url, params, timeout)
+    if current != "off" and 200 <= response.status_code < 300:
+        _store(key, response, params)
+    return response
+
+
+def download(url: str, dest: Path, timeout: float = 120, ttl: float | None = None) -> Path:
+    """GET url through the cache and write the body to dest."""
+    response = get(url, timeout=timeout, ttl=ttl)
+    response.raise_for_status()
+    Path(dest).write_bytes(response.content)
+    return Path(dest)
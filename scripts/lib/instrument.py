@@ -0,0 +1,144 @@
+"""
+Opt-in instrumentation for the data scripts.
+
+Disabled by default; stage() is then a no-op context manager costing one
+attribute lookup. Enable with PIPELINE_TRACE=1 or by passing --trace to any
+data script (lib.cli adds the flag and calls start()). When enabled:
+
+  - every ``with stage("name"):`` block records wall time, the tracemalloc
+    memory delta and the peak allocation above its starting point
+  - the whole run is profiled with cProfile
+  - finish() writes, to PIPELINE_TRACE_DIR (default data/cache/traces/):
+      <script>-<time>.trace.json  Chrome trace-event format; open in Perfetto
+                                  or chrome://tracing for a flame chart of stages
+      <script>-<time>.prof        cProfile stats; view with snakeviz, or render a
+                                  flamegraph with `flameprof <file>.prof > flame.svg`
+    and appends a per-stage summary table to $GITHUB_STEP_SUMMARY (or prints it)
+"""
+
+import atexit
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from .paths import CACHE_DIR
+
+ENV_VAR = "PIPELINE_TRACE"
+DEFAULT_TRACE_DIR = CACHE_DIR / "traces"
+
+
+class _State:
+    enabled = False
+    name = "script"
+    events: list = []
+    stack: list = []
+    profiler = None
+    t0 = 0.0
+
+
+def enabled() -> bool:
+    return _State.enabled
+
+
+def start(name: str) -> None:
+    """Enable tracing unconditionally for this process."""
+    if _State.enabled:
+        return
+    _State.enabled = True
+    _State.name = name
+    _State.events = []
+    _State.stack = []
+    _State.t0 = time.perf_counter()
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _State.profiler = cProfile.Profile()
+    _State.profiler.enable()
+    atexit.register(finish)
+
+
+@contextmanager
+def stage(name: str, **attrs):
+    """Time a named stage (no-op unless tracing is enabled)."""
+    if not _State.enabled:
+        yield
+        return
+
+    mem_before = tracemalloc.get_traced_memory()[0]
+    frame = {"child_peak": 0}
+    _State.stack.append(frame)
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, frame["child_peak"])
+        _State.stack.pop()
+        if _State.stack:
+            _State.stack[-1]["child_peak"] = max(_State.stack[-1]["child_peak"], peak)
+        tracemalloc.reset_peak()
+        _State.events.append({
+            "name": name,
+            "start": start - _State.t0,
+            "seconds": end - start,
+            "mem_delta": current - mem_before,
+            "mem_peak": max(peak - mem_before, 0),
+            "depth": len(_State.stack),
+            "attrs": attrs,
+        })
+
+
+def _summary_table() -> str:
+    totals: dict[str, dict] = {}
+    for e in _State.events:
+        t = totals.setdefault(e["name"], {"calls": 0, "seconds": 0.0, "mem_delta": 0, "mem_peak": 0})
+        t["calls"] += 1
+        t["seconds"] += e["seconds"]
+        t["mem_delta"] += e["mem_delta"]
+        t["mem_peak"] = max(t["mem_peak"], e["mem_peak"])
+
+    mb = 1024 * 1024
+    lines = [f"### Stage timings: {_State.name}", "",
+             "| Stage | Calls | Time (s) | Mem Δ (MB) | Peak Δ (MB) |", "|---|---:|---:|---:|---:|"]
+    for name, t in sorted(totals.items(), key=lambda kv: -kv[1]["seconds"]):
+        lines.append(f"| {name} | {t['calls']} | {t['seconds']:.3f} | "
+                     f"{t['mem_delta'] / mb:+.1f} | {t['mem_peak'] / mb:.1f} |")
+    lines.append(f"| **total** | | {time.perf_counter() - _State.t0:.3f} | | |")
+    return "\n".join(lines)
+
+
+def finish() -> None:
+    """Write the trace, profile and summary. Safe to call more than once."""
+    if not _State.enabled:
+        return
+    _State.enabled = False
+    _State.profiler.disable()
+
+    out_dir = Path(os.environ.get("PIPELINE_TRACE_DIR", DEFAULT_TRACE_DIR))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = out_dir / f"{_State.name}-{datetime.now():%Y%m%d-%H%M%S}"
+
+    pid = os.getpid()
+    trace = {"traceEvents": [
+        {"name": e["name"], "ph": "X", "pid": pid, "tid": 0,
+         "ts": round(e["start"] * 1e6), "dur": round(e["seconds"] * 1e6),
+         "args": {"mem_delta_bytes": e["mem_delta"], "mem_peak_bytes": e["mem_peak"], **e["attrs"]}}
+        for e in _State.events
+    ], "displayTimeUnit": "ms"}
+    with open(f"{stem}.trace.json", 'w', encoding='utf-8') as f:
+        json.dump(trace, f, default=str)
+    _State.profiler.dump_stats(f"{stem}.prof")
+
+    table = _summary_table()
+    summary_path = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary_path:
+        with open(summary_path, 'a', encoding='utf-8') as f:
+            f.write(table + "\n\n")
+    print("\n" + table)
+    print(f"\nTrace written to {stem}.trace.json and {stem}.prof")
@@ -0,0 +1,189 @@
+"""
+Batched logistic regression by Newton/IRLS in NumPy.
+
+Fits B logit models in one pass: either B design matrices, or one shared
+design matrix with B response or weight vectors (bootstrap replicates,
+cross-validation masks, sensitivity sweeps). Each Newton step is a stacked
+(B, k, k) solve, so refitting a small model hundreds of times costs a few
+vectorized iterations rather than hundreds of statsmodels fits.
+
+Results follow statsmodels.Logit: params, bse, llf, llnull, prsquared and
+nobs, with weights treated as frequency weights (a zero weight drops the
+row). The design matrix is expected to include a constant column; llnull is
+the intercept-only log-likelihood.
+
+A model whose Hessian becomes singular (e.g. a bootstrap replicate in which
+a dummy is constant) fails on its own: its estimates are NaN and it is not
+converged, while the rest of the batch is fitted normally.
+
+statsmodels stays the reference implementation; scripts/tests/test_logit.py
+checks parity against it on the cascade model, bootstrap batches included.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+MAX_ITER = 35  # statsmodels' Logit.fit default
+TOL = 1e-8
+
+
+@dataclass
+class LogitBatch:
+    """Estimates for B models; every array has a leading batch axis."""
+    params: np.ndarray     # (B, k)
+    bse: np.ndarray        # (B, k)
+    llf: np.ndarray        # (B,)
+    llnull: np.ndarray     # (B,)
+    nobs: np.ndarray       # (B,)
+    converged: np.ndarray  # (B,) bool
+    iterations: int
+
+    @property
+    def prsquared(self) -> np.ndarray:
+        return 1 - self.llf / self.llnull
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+
+@dataclass
+class LogitResult:
+    """A single fit with named parameters, shaped like the statsmodels result."""
+    names: list
+    params: dict
+    bse: dict
+    llf: float
+    llnull: float
+    nobs: float
+    converged: bool
+    iterations: int
+
+    @property
+    def prsquared(self) -> float:
+        return 1 - self.llf / self.llnull
+
+    def predict(self, X) -> np.ndarray:
+        beta = np.array([self.params[n] for n in self.names])
+        return _sigmoid(np.asarray(X, dtype=float) @ beta)
+
+
+def _sigmoid(eta):
+    return np.exp(-np.logaddexp(0, -eta))
+
+
+def _loglike(eta, y, w):
+    # y*eta - log(1 + e^eta), summed with weights; logaddexp avoids overflow
+    return np.sum(w * (y * eta - np.logaddexp(0, eta)), axis=-1)
+
+
+def _solve(a, b):
+    """Solve a stack of systems; (x, ok) with NaN rows where a system is singular."""
+    try:
+        x = np.linalg.solve(a, b)
+        ok = np.ones(len(a), dtype=bool)
+    except np.linalg.LinAlgError:
+        x = np.full(np.shape(b), np.nan)
+        ok = np.zeros(len(a), dtype=bool)
+        for i in range(len(a)):
+            try:
+                x[i] = np.linalg.solve(a[i], b[i])
+                ok[i] = True
+            except np.linalg.LinAlgError:
+                pass
+    ok &= np.isfinite(x).all(axis=tuple(range(1, x.ndim)))
+    x[~ok] = np.nan
+    return x, ok
+
+
+def fit_batch(X, y, weights=None, max_iter: int = MAX_ITER, tol: float = TOL) -> LogitBatch:
+    """Fit B logit models at once.
+
+    X is (n, k) shared by every model or (B, n, k); y and weights are (n,) or
+    (B, n). At least one argument must carry the batch axis for B > 1.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    w = np.ones_like(y) if weights is None else np.asarray(weights, dtype=float)
+    shared = X.ndim == 2
+    n, k = X.shape[-2:]
+    batch = max(1 if shared else X.shape[0], len(y) if y.ndim == 2 else 1, len(w) if w.ndim == 2 else 1)
+
+    y = np.broadcast_to(y, (batch, n))
+    w = np.broadcast_to(w, (batch, n))
+    if not shared:
+        X = np.broadcast_to(X, (batch, n, k))
+
+    def linear(beta):
+        return beta @ X.T if shared else np.einsum('bnk,bk->bn', X, beta)
+
+    def gram(v):
+        # X' diag(v) X for every model
+        return (np.einsum('nk,bn,nj->bkj', X, v, X, optimize=True) if shared
+                else np.einsum('bnk,bn,bnj->bkj', X, v, X, optimize=True))
+
+    def score(r):
+        return r @ X if shared else np.einsum('bnk,bn->bk', X, r)
+
+    beta = np.zeros((batch, k))
+    active = np.ones(batch, dtype=bool)
+    failed = np.zeros(batch, dtype=bool)
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        p = _sigmoid(linear(beta))
+        rows = np.flatnonzero(active)
+        step, ok = _solve(gram(w * p * (1 - p))[rows], score(w * (y - p))[rows, :, None])
+        failed[rows[~ok]] = True
+        active[rows[~ok]] = False
+        rows, step = rows[ok], step[ok, :, 0]
+        beta[rows] += step
+        active[rows] = np.max(np.abs(step), axis=1) > tol
+        if not active.any():
+            break
+
+    eta = linear(beta)
+    p = _sigmoid(eta)
+    hessian = gram(w * p * (1 - p))
+    cov = np.full_like(hessian, np.nan)
+    fitted = np.flatnonzero(~failed)
+    cov[fitted], ok = _solve(hessian[fitted], np.broadcast_to(np.eye(k), hessian[fitted].shape))
+    failed[fitted[~ok]] = True
+    beta[failed] = np.nan
+    llf = _loglike(eta, y, w)
+    llf[failed] = np.nan
+    nobs = w.sum(axis=1)
+    ybar = np.clip((w * y).sum(axis=1) / nobs, 1e-300, 1 - 1e-16)
+    llnull = nobs * (ybar * np.log(ybar) + (1 - ybar) * np.log1p(-ybar))
+
+    return LogitBatch(
+        params=beta,
+        bse=np.sqrt(np.diagonal(cov, axis1=1, axis2=2)),
+        llf=llf,
+        llnull=llnull,
+        nobs=nobs,
+        converged=~active & ~failed,
+        iterations=iterations,
+    )
+
+
+def fit(X, y, names=None, weights=None) -> LogitResult:
+    """Fit one model; X may be a DataFrame, whose columns name the parameters."""
+    if names is None:
+        names = list(getattr(X, "columns", range(np.shape(X)[1])))
+    batch = fit_batch(np.asarray(X, dtype=float), np.asarray(y, dtype=float), weights)
+    return LogitResult(
+        names=list(names),
+        params=dict(zip(names, batch.params[0].tolist())),
+        bse=dict(zip(names, batch.bse[0].tolist())),
+        llf=float(batch.llf[0]),
+        llnull=float(batch.llnull[0]),
+        nobs=float(batch.nobs[0]),
+        converged=bool(batch.converged[0]),
+        iterations=batch.iterations,
+    )
+
+
+def bootstrap_weights(n: int, replicates: int, seed: int = 0) -> np.ndarray:
+    """(replicates, n) frequency weights equivalent to resampling rows with replacement."""
+    rng = np.random.default_rng(seed)
+    return rng.multinomial(n, np.full(n, 1 / n), size=replicates).astype(float)
@@ -0,0 +1,265 @@
+"""
+Atomic, change-aware output writer shared by the data scripts.
+
+Every generated artifact goes through write_json()/write_text():
+  - the payload is serialized deterministically (fixed separators, no NaN)
+  - its SHA-256 is compared against the file already on disk; identical
+    content is not rewritten, so mtimes and git state stay untouched.
+    JSON that differs only in key order is also left alone: keys are not
+    sorted on output, because the components iterate several objects
+    (coefficients, category counts) in the order the script built them
+  - changed content is written to a temp file in the same directory,
+    fsync'd and renamed over the target, so a crash never leaves a
+    truncated JSON file on the site
+
+JSONStream writes a large object incrementally (header members, one array
+streamed item by item, trailer members) through the same temp-file/compare/
+rename path, so memory stays bounded by what the caller holds per chunk.
+
+Each call, and each remove() of a file that is no longer produced, is
+recorded in STATS. report() prints a per-file summary and, when the
+OUTPUT_CHANGES environment variable names a file, appends the paths that
+were actually written or removed to it (one repo-relative path per line).
+Workflows use that list instead of running `git diff` over the outputs.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from .digest import bytes_digest, file_digest
+from .paths import REPO_ROOT
+
+WRITTEN = "written"
+UNCHANGED = "unchanged"
+REMOVED = "removed"
+
+# path -> WRITTEN | UNCHANGED | REMOVED for everything touched in this process
+STATS: dict[Path, str] = {}
+
+
+def dumps(obj, indent=None, separators=None, sort_keys=False) -> str:
+    """
+    Deterministic JSON serialization used for every artifact.
+
+    Key order is kept as built (see the module docstring); write_json()
+    compares with ``sort_keys=True`` so a reordering alone is not a change.
+    """
+    if separators is None and indent is None:
+        separators = (',', ':')
+    return json.dumps(obj, indent=indent, separators=separators, allow_nan=False, sort_keys=sort_keys)
+
+
+def atomic_replace(path: Path, data: bytes) -> None:
+    """Replace path with data via a temp file; no change tracking (caches, state)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def write_bytes(path: Path, data: bytes) -> bool:
+    """Atomically write data to path unless identical. Returns True if written."""
+    path = Path(path)
+    if path.exists() and path.stat().st_size == len(data) and file_digest(path) == bytes_digest(data):
+        STATS[path] = UNCHANGED
+        return False
+    atomic_replace(path, data)
+    STATS[path] = WRITTEN
+    return True
+
+
+def write_text(path: Path, text: str) -> bool:
+    return write_bytes(path, text.encode('utf-8'))
+
+
+def remove(path: Path) -> bool:
+    """Delete a generated file that is no longer produced. Returns True if it existed."""
+    path = Path(path)
+    if not path.exists():
+        return False
+    path.unlink()
+    STATS[path] = REMOVED
+    return True
+
+
+def write_json(path: Path, obj, indent=None, separators=None, ignore_keys=()) -> bool:
+    """
+    Serialize obj and write it atomically if it changed.
+
+    ``ignore_keys`` lists top-level keys (e.g. a run timestamp) that should
+    not by themselves count as a change. When the bytes differ, the existing
+    file is parsed and compared with sorted keys, so neither an ignored key
+    nor a different key order alone rewrites it.
+    """
+    path = Path(path)
+    data = dumps(obj, indent=indent, separators=separators).encode('utf-8')
+
+    if path.exists() and not (path.stat().st_size == len(data) and file_digest(path) == bytes_digest(data)):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            existing = None
+        new = obj
+        if ignore_keys and isinstance(obj, dict) and isinstance(existing, dict):
+            strip = lambda d: {k: v for k, v in d.items() if k not in ignore_keys}
+            existing, new = strip(existing), strip(obj)
+        if existing is not None and dumps(existing, sort_keys=True) == dumps(new, sort_keys=True):
+            STATS[path] = UNCHANGED
+            return False
+
+    return write_bytes(path, data)
+
+
+class JSONStream:
+    """
+    Stream ``{<header>, "<array>": [<items>...], <trailer>}`` to path.
+
+    Usage::
+
+        with JSONStream(path, ignore_keys=('updated',)) as out:
+            out.header({'source': ...})
+            out.begin_array('records')
+            for chunk in chunks:
+                out.extend(chunk)
+            out.trailer({'count': n, 'updated': ts})
+
+    Bytes go to a temp file while being hashed. On close the result is
+    compared with the existing file, with trailer ``ignore_keys`` taken from
+    the old file's trailer, so a new timestamp alone is not a change. The temp
+    file is then discarded or renamed into place. Ignored keys must be scalar
+    trailer members.
+    """
+
+    def __init__(self, path: Path, ignore_keys=()):
+        self.path = Path(path)
+        self.ignore_keys = ignore_keys
+        self.count = 0
+        self._members = 0
+        self._trailer = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+        self._file = os.fdopen(fd, 'wb')
+        self._hash = hashlib.sha256()
+        self._write("{")
+        return self
+
+    def _write(self, text: str) -> None:
+        data = text.encode('utf-8')
+        self._file.write(data)
+        self._hash.update(data)
+
+    def _member(self, key: str, value) -> str:
+        sep = "," if self._members else ""
+        self._members += 1
+        return f"{sep}{dumps(key)}:{dumps(value)}"
+
+    def header(self, members: dict) -> None:
+        self._write("".join(self._member(k, v) for k, v in members.items()))
+
+    def begin_array(self, key: str) -> None:
+        self._write(("," if self._members else "") + dumps(key) + ":[")
+        self._members += 1
+
+    def extend(self, items) -> None:
+        parts = [dumps(item) for item in items]
+        if parts:
+            self._write(("," if self.count else "") + ",".join(parts))
+            self.count += len(parts)
+
+    def trailer(self, members: dict) -> None:
+        self._write("]")
+        self._trailer = members
+
+    @staticmethod
+    def _trailer_text(members: dict) -> str:
+        # Always preceded by the array member
+        return "".join(f",{dumps(k)}:{dumps(v)}" for k, v in members.items()) + "}"
+
+    def _previous_values(self) -> dict:
+        """Ignored trailer values as they appear at the end of the existing file."""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(max(0, self.path.stat().st_size - 4096))
+                tail = f.read().decode('utf-8', errors='ignore')
+        except OSError:
+            return {}
+        values = {}
+        for key in self.ignore_keys:
+            matches = re.findall(rf'{re.escape(dumps(key))}:("(?:[^"\\]|\\.)*"|[^,}}]+)', tail)
+            if matches:
+                values[key] = json.loads(matches[-1])
+        return values
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None or self._trailer is None:
+            self._file.close()
+            Path(self._tmp).unlink(missing_ok=True)
+            return False
+
+        previous = self._previous_values()
+        if self.path.exists() and previous.keys() == set(self.ignore_keys):
+            candidate = self._hash.copy()
+            candidate.update(self._trailer_text({**self._trailer, **previous}).encode('utf-8'))
+            if candidate.hexdigest() == file_digest(self.path):
+                self._file.close()
+                Path(self._tmp).unlink()
+                STATS[self.path] = UNCHANGED
+                return False
+
+        self._write(self._trailer_text(self._trailer))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        try:
+            os.replace(self._tmp, self.path)
+        except BaseException:
+            Path(self._tmp).unlink(missing_ok=True)
+            raise
+        STATS[self.path] = WRITTEN
+        return False
+
+
+def _display(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def report() -> None:
+    """Print write/skip statistics and record changed paths for CI."""
+    if not STATS:
+        return
+    written = [p for p, s in STATS.items() if s == WRITTEN]
+    removed = [p for p, s in STATS.items() if s == REMOVED]
+    summary = f"Output: {len(written)} written, {len(STATS) - len(written) - len(removed)} unchanged"
+    print(summary + (f", {len(removed)} removed" if removed else ""))
+    for path, status in STATS.items():
+        print(f"  {status:9s} {_display(path)}")
+
+    # Removed paths are listed too: `git add` on a deleted path stages the deletion
+    changes_file = os.environ.get("OUTPUT_CHANGES")
+    if changes_file and (written or removed):
+        with open(changes_file, 'a', encoding='utf-8') as f:
+            for path in written + removed:
+                f.write(_display(path) + "\n")
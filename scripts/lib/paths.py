@@ -0,0 +1,12 @@
+"""Well-known repository paths shared by the utility scripts."""
+
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+PUBLIC_DATA = REPO_ROOT / "public" / "data"
+CONTENT_DIR = REPO_ROOT / "src" / "content"
+PUBLICATIONS_DIR = CONTENT_DIR / "publications"
+
+# Local, git-ignored state (manifests, digests, HTTP responses, ...)
+CACHE_DIR = REPO_ROOT / "data" / "cache"
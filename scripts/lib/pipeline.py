@@ -0,0 +1,198 @@
+"""
+Minimal stage scheduler for the data scripts.
+
+A Stage wraps one of the existing scripts and declares the files it reads
+(``inputs``), the files it produces (``outputs``) and the stages it must run
+after (``after``). Stages whose dependencies are satisfied run concurrently,
+each as its own Python subprocess. A stage is then an ordinary script run,
+so scripts that open their own process pools work under any multiprocessing
+start method (spawn on macOS and Windows as well as fork).
+
+A stage is skipped when its script and every declared input (every file
+beneath a directory input) hash the same as on its last successful run and all of its outputs still exist. Stages that
+fetch from the network declare no inputs and therefore always run.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .digest import bytes_digest, file_digest
+from .output import atomic_replace, dumps
+from .paths import CACHE_DIR, REPO_ROOT, SCRIPTS_DIR
+
+STATE_PATH = CACHE_DIR / "pipeline-state.json"
+
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+BLOCKED = "blocked"
+UNCHANGED = "unchanged"
+
+
+@dataclass
+class Stage:
+    name: str
+    script: str
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    after: list[str] = field(default_factory=list)
+    # Paths that must exist for the stage to make sense (e.g. a local data drop)
+    requires: list[str] = field(default_factory=list)
+    args: list[str] = field(default_factory=list)
+
+    @property
+    def script_path(self) -> Path:
+        return SCRIPTS_DIR / self.script
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str
+    seconds: float = 0.0
+    detail: str = ""
+    log: str = ""
+
+
+def _resolve(pattern: str) -> list[Path]:
+    """Expand a repo-relative or absolute path/glob to existing paths."""
+    path = Path(pattern)
+    if not any(c in pattern for c in "*?["):
+        path = path if path.is_absolute() else REPO_ROOT / path
+        return [path] if path.exists() else []
+    if path.is_absolute():
+        return sorted(Path(path.anchor).glob(str(path.relative_to(path.anchor))))
+    return sorted(REPO_ROOT.glob(pattern))
+
+
+def fingerprint(stage: Stage) -> str | None:
+    """Hash of the stage's script and inputs, or None if it must always run."""
+    if not stage.inputs:
+        return None
+    parts = [stage.script, file_digest(stage.script_path), *stage.args]
+    for pattern in stage.inputs:
+        for path in _resolve(pattern):
+            # A directory input covers every file beneath it
+            files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+            parts.extend(f"{f}:{file_digest(f)}" for f in files)
+    return bytes_digest("\n".join(parts).encode('utf-8'))
+
+
+def load_state() -> dict:
+    try:
+        with open(STATE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state: dict) -> None:
+    atomic_replace(STATE_PATH, dumps(state, indent=2, sort_keys=True).encode('utf-8'))
+
+
+def run_script(script: str, args: list[str]) -> tuple[str, float, str, str]:
+    """Run a script in a subprocess and capture its combined output."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, str(SCRIPTS_DIR / script), *args],
+                            cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, encoding='utf-8', errors='replace')
+    status, detail = OK, ""
+    if result.returncode != 0:
+        lines = result.stdout.strip().splitlines()
+        status, detail = FAILED, lines[-1] if lines else f"exit {result.returncode}"
+    return status, time.perf_counter() - start, detail, result.stdout
+
+
+def run_stages(stages: list[Stage], jobs: int | None = None, force: bool = False,
+               verbose: bool = False) -> list[StageResult]:
+    """Run stages respecting dependencies; returns results in completion order."""
+    by_name = {s.name: s for s in stages}
+    for stage in stages:
+        unknown = [d for d in stage.after if d not in by_name]
+        if unknown:
+            raise ValueError(f"Stage {stage.name} depends on unknown stage(s): {unknown}")
+
+    state = load_state()
+    results: dict[str, StageResult] = {}
+    fingerprints: dict[str, str | None] = {}
+    pending = list(stages)
+    running = {}
+
+    def finish(result: StageResult):
+        results[result.name] = result
+        label = f"[{result.name}] {result.status} ({result.seconds:.2f}s)"
+        print(label + (f" — {result.detail}" if result.detail else ""))
+        if result.log and (verbose or result.status == FAILED):
+            for line in result.log.rstrip().splitlines():
+                print(f"    {line}")
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        while pending or running:
+            progressed = False
+            for stage in list(pending):
+                deps = [results.get(d) for d in stage.after]
+                if any(r is None for r in deps):
+                    continue
+                pending.remove(stage)
+                progressed = True
+
+                # A dependency skipped for a missing requirement is simply not applicable
+                if any(r.status in (FAILED, BLOCKED) for r in deps):
+                    finish(StageResult(stage.name, BLOCKED, detail="dependency failed"))
+                    continue
+                missing = [r for r in stage.requires if not _resolve(r)]
+                if missing:
+                    finish(StageResult(stage.name, SKIPPED, detail=f"missing {missing[0]}"))
+                    continue
+
+                fp = fingerprint(stage)
+                fingerprints[stage.name] = fp
+                outputs_present = all(_resolve(o) for o in stage.outputs)
+                if (not force and fp is not None and outputs_present
+                        and state.get(stage.name, {}).get("fingerprint") == fp):
+                    finish(StageResult(stage.name, UNCHANGED, detail="inputs unchanged"))
+                    continue
+
+                future = pool.submit(run_script, stage.script, stage.args)
+                running[future] = (stage, time.perf_counter())
+
+            if not running:
+                if pending and not progressed:
+                    raise ValueError(f"Dependency cycle among: {[s.name for s in pending]}")
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, submitted = running.pop(future)
+                try:
+                    status, seconds, detail, log = future.result()
+                except Exception as e:
+                    status, seconds, detail, log = FAILED, time.perf_counter() - submitted, str(e), ""
+                finish(StageResult(stage.name, status, seconds, detail, log))
+                if status == OK and fingerprints.get(stage.name):
+                    state[stage.name] = {"fingerprint": fingerprints[stage.name],
+                                         "finished": time.time()}
+                    save_state(state)
+
+    return [results[s.name] for s in stages]
+
+
+def timing_report(results: list[StageResult], total: float) -> str:
+    """Markdown table of per-stage status and wall time."""
+    lines = ["| Stage | Status | Time (s) | Detail |", "|---|---|---:|---|"]
+    for r in results:
+        lines.append(f"| {r.name} | {r.status} | {r.seconds:.2f} | {r.detail} |")
+    lines.append(f"| **total** | | {total:.2f} | |")
+    return "\n".join(lines)
+
+
+def write_step_summary(markdown: str) -> None:
+    path = os.environ.get("GITHUB_STEP_SUMMARY")
+    if path:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(markdown + "\n")
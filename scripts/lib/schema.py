@@ -0,0 +1,145 @@
+"""
+Declarative column resolution for upstream tables whose headers drift.
+
+A Schema lists the fields a script needs. Each field has one or more regex
+rules over cleaned column names, highest priority first. resolve() maps every
+field in one pass over the header: each column is tested only against the
+rules that would beat the field's current match.
+
+resolve_cached() keeps the last accepted header and mapping in a small
+state file keyed by a header fingerprint. An unchanged header then costs
+nothing. A changed header is diffed against the accepted one. If a required
+field is missing, or a field that used to resolve now resolves differently
+or not at all, SchemaDrift is raised with a drift report. That happens
+before any data is parsed.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+
+from .digest import bytes_digest
+from .output import write_json
+
+
+def token(*words) -> str:
+    """Rule: every word appears as a whole '_'-separated token (any order)."""
+    return "^" + "".join(f"(?=(?:.*_)?{re.escape(w)}(?:_|$))" for w in words)
+
+
+def contains(*parts) -> str:
+    """Rule: every part appears as a substring (any order)."""
+    return "^" + "".join(f"(?=.*{re.escape(p)})" for p in parts)
+
+
+def exact(*names) -> str:
+    """Rule: the column is exactly one of names."""
+    return "^(?:" + "|".join(re.escape(n) for n in names) + ")$"
+
+
+class SchemaDrift(ValueError):
+    """The upstream header no longer resolves the way it did."""
+
+
+@dataclass
+class Field:
+    name: str
+    rules: tuple                  # regexes over cleaned column names, best first
+    required: bool = False
+
+
+@dataclass
+class Schema:
+    fields: list
+    _compiled: list = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._compiled = [(f.name, [re.compile(r) for r in f.rules]) for f in self.fields]
+
+    @property
+    def version(self) -> str:
+        spec = [[f.name, list(f.rules), f.required] for f in self.fields]
+        return bytes_digest(json.dumps(spec).encode())[:16]
+
+    def resolve(self, columns) -> dict:
+        """{field: column or None}; ties on rule priority go to the first column."""
+        best = {}  # field -> (rule index, column)
+        for col in columns:
+            for name, patterns in self._compiled:
+                limit = best[name][0] if name in best else len(patterns)
+                for i in range(limit):
+                    if patterns[i].search(col):
+                        best[name] = (i, col)
+                        break
+        return {f.name: best[f.name][1] if f.name in best else None for f in self.fields}
+
+    def missing(self, mapping: dict) -> list:
+        return [f.name for f in self.fields if f.required and mapping.get(f.name) is None]
+
+
+def fingerprint(columns) -> str:
+    return bytes_digest("\x1f".join(columns).encode())[:16]
+
+
+def drift_report(schema: Schema, old_header: list, columns: list, mapping: dict) -> tuple[list, list]:
+    """(report lines, blocking problems) for a header change."""
+    baseline = schema.resolve(old_header)
+    added = [c for c in columns if c not in old_header]
+    removed = [c for c in old_header if c not in columns]
+    lines = [f"header {fingerprint(old_header)} -> {fingerprint(columns)}"]
+    if added:
+        lines.append(f"  added columns:   {', '.join(added)}")
+    if removed:
+        lines.append(f"  removed columns: {', '.join(removed)}")
+
+    problems = []
+    for name, col in mapping.items():
+        before = baseline.get(name)
+        if before == col:
+            continue
+        if col is None:
+            problems.append(f"  field '{name}' no longer resolves (was '{before}')")
+        elif before is None:
+            lines.append(f"  field '{name}' now resolves to '{col}'")
+        else:
+            problems.append(f"  field '{name}' moved: '{before}' -> '{col}'")
+    return lines + problems, problems
+
+
+def resolve_cached(schema: Schema, columns, state_path, accept: bool = False) -> dict:
+    """
+    Resolve columns against schema, reusing the accepted mapping when the
+    header fingerprint is unchanged. Raises SchemaDrift on a missing required
+    field, or on a changed mapping unless accept is set.
+    """
+    columns = list(columns)
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        state = {}
+    if state.get("schema") == schema.version and state.get("fingerprint") == fingerprint(columns):
+        return state["columns"]
+
+    mapping = schema.resolve(columns)
+    lines, problems = [], []
+    if state.get("header"):
+        lines, problems = drift_report(schema, state["header"], columns, mapping)
+    else:
+        print(f"No accepted header in {state_path}; recording the current one as the baseline")
+    missing = schema.missing(mapping)
+    if missing:
+        lines.append(f"  required fields not found: {', '.join(missing)}")
+    if missing or (problems and not accept):
+        hint = "" if missing else "\nRe-run with --accept-schema if the new header is correct."
+        raise SchemaDrift("Upstream header changed:\n" + "\n".join(lines) + hint)
+    if lines:
+        print("Header changed (accepted):\n" + "\n".join(lines))
+
+    write_json(state_path, {
+        "schema": schema.version,
+        "fingerprint": fingerprint(columns),
+        "header": columns,
+        "columns": mapping,
+    }, indent=2)
+    return mapping
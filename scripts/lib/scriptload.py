@@ -0,0 +1,20 @@
+"""Import the hyphenated utility scripts (e.g. preprocess-mpv-data.py) as modules."""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+from .paths import SCRIPTS_DIR
+
+
+def load_script(name: str) -> ModuleType:
+    """Load scripts/<name>.py once and return it as a module."""
+    module_name = name.replace("-", "_")
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    path = SCRIPTS_DIR / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,180 @@
+"""
+Single-pass Hugo shortcode transpiler.
+
+Each document is tokenized once into text and ``{{< ... >}}`` shortcode tags.
+Tags are dispatched through HANDLERS; paired shortcodes (``{{< x >}}...{{< /x >}}``)
+receive their already-transpiled inner content. Unknown shortcodes are kept
+verbatim so nothing is silently lost.
+
+Bump TRANSPILER_VERSION whenever a handler's output changes so incremental
+migrations re-transpile every file.
+"""
+
+import re
+import shlex
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+TRANSPILER_VERSION = 2
+
+TAG_PATTERN = re.compile(r'\{\{<\s*(/?)\s*([A-Za-z][\w-]*)(.*?)>\s*\}\}', re.DOTALL)
+
+
+@dataclass
+class Shortcode:
+    """A parsed shortcode invocation."""
+    name: str
+    args: list[str]
+    kwargs: dict[str, str]
+    inner: Optional[str] = None
+
+
+@dataclass
+class Handler:
+    render: Callable[[Shortcode], str]
+    paired: bool = False
+
+
+HANDLERS: dict[str, Handler] = {}
+
+
+def register(name: str, paired: bool = False):
+    """Decorator registering a shortcode handler."""
+    def decorator(fn):
+        HANDLERS[name] = Handler(fn, paired)
+        return fn
+    return decorator
+
+
+def parse_args(raw: str) -> tuple[list[str], dict[str, str]]:
+    """Split a shortcode argument string into positional and key="value" args."""
+    args, kwargs = [], {}
+    try:
+        parts = shlex.split(raw)
+    except ValueError:
+        parts = raw.split()
+    for part in parts:
+        key, sep, value = part.partition('=')
+        if sep and re.fullmatch(r'[A-Za-z_][\w-]*', key):
+            kwargs[key] = value
+        else:
+            args.append(part)
+    return args, kwargs
+
+
+# ── Handlers ────────────────────────────────────────────────────────────
+
+@register("icon")
+def _icon(sc: Shortcode) -> str:
+    # {{< icon name="download" pack="fas" >}} -> dropped
+    return ""
+
+
+@register("staticref", paired=True)
+def _staticref(sc: Shortcode) -> str:
+    # {{< staticref "path" "newtab" >}}text{{< /staticref >}} -> [text](/path)
+    if not sc.args:
+        return sc.inner or ""
+    return f"[{sc.inner}](/{sc.args[0]})"
+
+
+@register("figure")
+def _figure(sc: Shortcode) -> str:
+    # {{< figure src="..." caption="..." >}} -> ![](src)
+    src = sc.kwargs.get("src")
+    return f"![]({src})" if src else ""
+
+
+@register("youtube")
+def _youtube(sc: Shortcode) -> str:
+    video_id = sc.kwargs.get("id") or (sc.args[0] if sc.args else None)
+    if not video_id:
+        return ""
+    return f"[Watch on YouTube](https://www.youtube.com/watch?v={video_id})"
+
+
+@register("callout", paired=True)
+@register("alert", paired=True)
+def _callout(sc: Shortcode) -> str:
+    # Wowchemy callouts become blockquotes
+    lines = (sc.inner or "").strip().splitlines()
+    return "\n".join(f"> {line}" if line else ">" for line in lines)
+
+
+# ── Transpiler ──────────────────────────────────────────────────────────
+
+def _tokenize(content: str):
+    """Yield ("text", str) and ("tag", (closing, name, raw, source)) tokens."""
+    pos = 0
+    for m in TAG_PATTERN.finditer(content):
+        if m.start() > pos:
+            yield "text", content[pos:m.start()]
+        yield "tag", (m.group(1) == "/", m.group(2), m.group(3), m.group(0))
+        pos = m.end()
+    if pos < len(content):
+        yield "text", content[pos:]
+
+
+def transpile(content: str) -> str:
+    """Replace Hugo shortcodes in content with Astro-compatible markdown."""
+    # Stack of (shortcode, output buffer); bottom frame is the document itself
+    stack: list[tuple[Optional[Shortcode], list[str], str]] = [(None, [], "")]
+
+    for kind, value in _tokenize(content):
+        out = stack[-1][1]
+        if kind == "text":
+            out.append(value)
+            continue
+
+        closing, name, raw, source = value
+        handler = HANDLERS.get(name)
+
+        if closing:
+            if len(stack) > 1 and stack[-1][0].name == name:
+                sc, buf, _ = stack.pop()
+                sc.inner = "".join(buf)
+                stack[-1][1].append(HANDLERS[name].render(sc))
+            else:
+                out.append(source)
+            continue
+
+        if handler is None:
+            out.append(source)
+            continue
+
+        args, kwargs = parse_args(raw)
+        sc = Shortcode(name, args, kwargs)
+        if handler.paired:
+            stack.append((sc, [], source))
+        else:
+            out.append(handler.render(sc))
+
+    # Unclosed paired shortcodes: emit them untouched
+    while len(stack) > 1:
+        _, buf, source = stack.pop()
+        stack[-1][1].append(source + "".join(buf))
+
+    return "".join(stack[0][1])
+
+
+def transpile_file(source: str, dest: str, transform: bool, cached: Optional[dict]) -> Optional[dict]:
+    """
+    Migrate one markdown file (process-pool worker).
+
+    ``cached`` is the manifest entry from the previous run. Returns the new
+    manifest entry, or None when the file was skipped as unchanged.
+    """
+    from .digest import bytes_digest
+    from pathlib import Path
+
+    raw = Path(source).read_bytes()
+    digest = bytes_digest(raw)
+    entry = {"sha256": digest, "version": TRANSPILER_VERSION if transform else 0}
+    if cached == entry and Path(dest).exists():
+        return None
+
+    content = raw.decode('utf-8')
+    if transform:
+        content = transpile(content)
+    Path(dest).write_text(content, encoding='utf-8')
+    return entry
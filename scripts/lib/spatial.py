@@ -0,0 +1,64 @@
+"""
+Spatial pre-binning for point data on web-map (slippy) tiles.
+
+Points are assigned to Web Mercator tiles at several zoom levels and counted
+per tile, optionally per facet value (year, race, ...), so a map view can
+look counts up instead of clustering every point in the browser. Coordinates
+are also quantized to fixed-point integers for a compact point layer.
+"""
+
+import numpy as np
+
+MAX_LATITUDE = 85.05112878  # Web Mercator limit
+
+
+def quantize(values, scale: int) -> list:
+    """Fixed-point integers (round(value * scale)); NaN becomes None."""
+    values = np.asarray(values, dtype=float)
+    fixed = np.round(values * scale)
+    return [None if np.isnan(v) else int(v) for v in fixed]
+
+
+def tile_xy(lat, lon, zoom: int):
+    """Slippy-map tile column and row for each point at the given zoom."""
+    n = 1 << zoom
+    lat = np.radians(np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE))
+    x = np.floor((lon + 180.0) / 360.0 * n)
+    y = np.floor((1.0 - np.log(np.tan(lat) + 1 / np.cos(lat)) / np.pi) / 2.0 * n)
+    return np.clip(x, 0, n - 1).astype(np.int64), np.clip(y, 0, n - 1).astype(np.int64)
+
+
+def _facet_counts(inverse, tiles: int, values) -> dict:
+    """Per-tile counts for each facet value, aligned with the tile list."""
+    labels, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    counts = np.bincount(inverse * len(labels) + codes, minlength=tiles * len(labels))
+    counts = counts.reshape(tiles, len(labels))
+    return {label: counts[:, i].tolist() for i, label in enumerate(labels.tolist())}
+
+
+def tile_counts(lat, lon, zooms, facets=None) -> dict:
+    """Occupied tiles per zoom with totals and per-facet counts.
+
+    Returns {zoom: {"x": [...], "y": [...], "total": [...], <facet>: {value: [...]}}},
+    columnar so each facet value is one array aligned with the tile list.
+    Points with a missing coordinate are skipped.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    valid = ~(np.isnan(lat) | np.isnan(lon))
+    lat, lon = lat[valid], lon[valid]
+    facets = {name: np.asarray(values)[valid] for name, values in (facets or {}).items()}
+
+    result = {}
+    for zoom in zooms:
+        x, y = tile_xy(lat, lon, zoom)
+        keys, inverse, total = np.unique(x * (1 << zoom) + y, return_inverse=True, return_counts=True)
+        level = {
+            "x": (keys >> zoom).tolist(),
+            "y": (keys & ((1 << zoom) - 1)).tolist(),
+            "total": total.tolist(),
+        }
+        for name, values in facets.items():
+            level[name] = _facet_counts(inverse, len(keys), values)
+        result[str(zoom)] = level
+    return result
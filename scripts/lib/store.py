@@ -0,0 +1,150 @@
+"""
+Local SQLite analytical store for the cleaned pipeline tables.
+
+The data scripts load what they publish (MPV incidents, cascade cases) into
+data/db/analytics.db, next to the scrapers' story archive, with indexes on
+the usual filter columns. scripts/query-store.py runs filtered aggregates
+against it without reloading the JSON artifacts.
+
+Each table is replaced wholesale inside one transaction and tagged with the
+digest of the source it was built from (see the _tables catalogue), so a
+later run can check source_digest() and reuse the stored rows instead of
+re-parsing the original input.
+"""
+
+import json
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from .paths import REPO_ROOT
+
+DB_PATH = REPO_ROOT / "data" / "db" / "analytics.db"
+BATCH_ROWS = 5_000
+
+
+@dataclass
+class Table:
+    name: str
+    columns: dict                 # column -> SQLite type (TEXT, INTEGER, REAL)
+    indexes: list = field(default_factory=list)  # column names or tuples of them
+
+    def ddl(self) -> str:
+        cols = ", ".join(f"{c} {t}" for c, t in self.columns.items())
+        return f"CREATE TABLE {self.name} ({cols})"
+
+    def index_ddl(self) -> list[str]:
+        statements = []
+        for index in self.indexes:
+            cols = (index,) if isinstance(index, str) else tuple(index)
+            statements.append(
+                f"CREATE INDEX idx_{self.name}_{'_'.join(cols)} ON {self.name}({', '.join(cols)})"
+            )
+        return statements
+
+    def row(self, record: dict) -> tuple:
+        values = []
+        for col in self.columns:
+            value = record.get(col)
+            if isinstance(value, (list, dict)):
+                value = json.dumps(value, separators=(',', ':'))
+            elif isinstance(value, bool):
+                value = int(value)
+            values.append(value)
+        return tuple(values)
+
+
+def connect(path=DB_PATH) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS _tables (
+            name TEXT PRIMARY KEY,
+            source_sha256 TEXT,
+            rows INTEGER,
+            loaded_at TEXT
+        )
+    """)
+    return conn
+
+
+def source_digest(table: str, path=DB_PATH) -> str | None:
+    """Digest of the source the stored table was built from, if it exists."""
+    if not path.exists():
+        return None
+    with closing(connect(path)) as conn:
+        row = conn.execute("SELECT source_sha256 FROM _tables WHERE name = ?", (table,)).fetchone()
+    return row["source_sha256"] if row else None
+
+
+class TableWriter:
+    """
+    Replace a table with streamed rows in a single transaction.
+
+        with TableWriter(MPV_TABLE, digest) as table:
+            table.extend(records)
+
+    Readers keep seeing the previous contents until the commit. Indexes are
+    built once after the load, which is much faster than maintaining them
+    per insert.
+    """
+
+    def __init__(self, table: Table, digest: str | None, path=DB_PATH):
+        self.table = table
+        self.digest = digest
+        self.path = path
+        self.count = 0
+
+    def __enter__(self):
+        self.conn = connect(self.path)
+        self.conn.execute("BEGIN")
+        self.conn.execute(f"DROP TABLE IF EXISTS {self.table.name}")
+        self.conn.execute(self.table.ddl())
+        self._insert = (f"INSERT INTO {self.table.name} VALUES "
+                        f"({', '.join('?' * len(self.table.columns))})")
+        return self
+
+    def extend(self, records) -> None:
+        rows = [self.table.row(r) for r in records]
+        self.conn.executemany(self._insert, rows)
+        self.count += len(rows)
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is not None:
+                self.conn.rollback()
+                return False
+            for statement in self.table.index_ddl():
+                self.conn.execute(statement)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO _tables VALUES (?, ?, ?, ?)",
+                (self.table.name, self.digest, self.count, datetime.now(timezone.utc).isoformat()),
+            )
+            self.conn.commit()
+            self.conn.execute("ANALYZE")
+        finally:
+            self.conn.close()
+        return False
+
+
+def load_table(table: Table, records, digest: str | None, path=DB_PATH) -> int:
+    """Replace table with records (any iterable); returns the row count."""
+    with TableWriter(table, digest, path) as writer:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) == BATCH_ROWS:
+                writer.extend(batch)
+                batch = []
+        writer.extend(batch)
+    return writer.count
+
+
+def read_rows(table: str, columns, path=DB_PATH) -> list[dict]:
+    """All rows of a stored table, restricted to the given columns."""
+    with closing(connect(path)) as conn:
+        cursor = conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY rowid")
+        return [dict(row) for row in cursor]
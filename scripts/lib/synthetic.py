@@ -0,0 +1,190 @@
+"""
+Synthetic data generators for benchmarks.
+
+Everything is seeded so a given (generator, size) pair always produces the
+same data. Values deliberately include the mess the real sources contain:
+blank cells, "Unknown race", free-text ages, mixed-case categorical codes and
+numbers stored as text.
+"""
+
+import random
+from pathlib import Path
+
+# Current real-world sizes, i.e. the "1x" scale
+MPV_ROWS = 14_000
+URSUS_ROWS = 3_000
+PUBLICATIONS = 110
+
+EXCEL_MAX_ROWS = 1_048_575
+
+MPV_COLUMNS = [
+    "Victim's name", "Victim's age", "Victim's gender", "Victim's race",
+    "URL of image of victim", "Date of Incident (month/day/year)",
+    "Street Address of Incident", "City", "State", "Zipcode", "County",
+    "Agency responsible for death", "ORI Agency Identifier (if available)",
+    "Cause of death", "A brief description of the circumstances surrounding the death",
+    "Official disposition of death (justified or other)", "Criminal Charges?",
+    "Symptoms of mental illness?", "Armed/Unarmed Status",
+    "Alleged Weapon (Source: WaPo and Review of Cases Not Included in WaPo Database)",
+    "Alleged Threat Level (Source: WaPo)", "Fleeing (Source: WaPo)",
+    "Body Camera (Source: WaPo)", "Off-Duty Killing?", "MPV ID",
+    "latitude", "longitude", "Median household income",
+]
+
+RACES = ["White", "Black", "Hispanic", "Asian", "Native American", "Pacific Islander",
+         "Unknown race", "", None]
+STATES = ["CA", "TX", "FL", "AZ", "GA", "CO", "OK", "NY", "WA", "OH", "NC", "TN"]
+CITIES = ["Los Angeles", "Houston", "Phoenix", "Chicago", "Atlanta", "Denver",
+          "Tulsa", "Seattle", "Columbus", "Charlotte", "Memphis", "San Antonio"]
+CAUSES = ["Gunshot", "Taser", "Gunshot, Taser", "Physical Restraint", "Vehicle", "Other"]
+ARMED = ["Allegedly Armed", "Unarmed/Did Not Have Actual Weapon", "Vehicle", "Unclear", None]
+WEAPONS = ["gun", "knife", "vehicle", "no object", "toy weapon", "undetermined", None]
+FLEEING = ["Not Fleeing", "Car", "Foot", "Other", "not fleeing", None, ""]
+MENTAL = ["No", "Yes", "Unknown", "Drug or alcohol use", None]
+BODYCAM = ["No", "Yes", "Bystander Video", "Surveillance Video", "TRUE", None]
+CHARGES = ["No known charges", "Charged with a crime", "Charged, Acquitted", None]
+
+
+def _mpv_row(rng: random.Random, i: int) -> list:
+    year = rng.randint(2013, 2025)
+    age = rng.choice([str(rng.randint(14, 90)), rng.randint(14, 90), "Unknown", "40s", None])
+    lat = round(rng.uniform(25.0, 48.5), 6) if rng.random() > 0.03 else None
+    lon = round(rng.uniform(-124.0, -67.0), 6) if rng.random() > 0.03 else None
+    return [
+        f"Person {i}", age, rng.choice(["Male", "Female", "Unknown"]), rng.choice(RACES),
+        "", f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/{year}" if rng.random() > 0.002 else "not a date",
+        f"{rng.randint(1, 9999)} Main St", rng.choice(CITIES), rng.choice(STATES),
+        rng.randint(10000, 99999), "Some County", "Some Police Department", "",
+        rng.choice(CAUSES), "Officers responded to a call.", "Pending investigation",
+        rng.choice(CHARGES), rng.choice(MENTAL), rng.choice(ARMED), rng.choice(WEAPONS),
+        rng.choice(["attack", "other", "undetermined", None]), rng.choice(FLEEING),
+        rng.choice(BODYCAM), rng.choice(["Off-Duty", None]), i,
+        lat, lon, rng.choice([rng.randint(20000, 150000), None, "N/A"]),
+    ]
+
+
+def mpv_workbook(path: Path, rows: int, seed: int = 0) -> Path:
+    """
+    Write a synthetic MPV download with the given number of rows.
+
+    Uses .xlsx like the real download; falls back to .csv beyond Excel's row
+    limit. Returns the path actually written.
+    """
+    import pandas as pd
+
+    rng = random.Random(seed)
+    df = pd.DataFrame([_mpv_row(rng, i) for i in range(rows)], columns=MPV_COLUMNS)
+    path = Path(path)
+    if rows > EXCEL_MAX_ROWS:
+        path = path.with_suffix(".csv")
+        df.to_csv(path, index=False)
+    else:
+        path = path.with_suffix(".xlsx")
+        df.to_excel(path, index=False)
+    return path
+
+
+RESISTANCE = ["Armed/Deadly Force", "Physical Assault", "Passive", "None", "Unknown"]
+WOUND_STD = ["Head/Neck", "Chest", "Abdomen", "Extremities", "Unknown", None]
+RAW_LOCATIONS = ["head", "HEAD", "Neck/throat", "front_upper_chest", "FRONT_LOWER_TORSO",
+                 "Rear upper torso/back", "arms_hands", "FRONT_LEGS", "rear_below_waist",
+                 "NOT_APPLICABLE", "mystery_region"]
+CONTACT = ["call_for_service", "in_progress", "TRAFFIC_STOP", "WARRANT", "Call for Service",
+           "Crime in Progress / Investigating Suspicious Persons or Circumstances", None, ""]
+COUNTIES = ["Los Angeles County", "San Bernardino", "riverside county", "Orange", "San Diego", None]
+
+
+def ursus_csv(path: Path, rows: int, seed: int = 0) -> Path:
+    """Write a synthetic analysis-ready URSUS CSV (the cascade input)."""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    records = []
+    for _ in range(rows):
+        wound = rng.choice(WOUND_STD)
+        base = {"Head/Neck": 0.55, "Chest": 0.6, "Abdomen": 0.3}.get(wound, 0.05)
+        locs = rng.sample(RAW_LOCATIONS, rng.randint(1, 3))
+        records.append({
+            "race_std": rng.choice(["White", "Black", "Hispanic", "Asian", "Other"]),
+            "wound_location_std": wound,
+            "age_numeric": rng.choice([rng.randint(15, 80), None]) if rng.random() < 0.03 else rng.randint(15, 80),
+            "gender_std": rng.choice(["Male"] * 8 + ["Female", "Unknown"]),
+            "num_involved_officers": rng.randint(1, 8),
+            "resistance_std": rng.choice(RESISTANCE),
+            "fatal": int(rng.random() < base),
+            "received_force_location": '"' + ",".join(locs) + '"',
+            "wound_count": rng.choice([rng.randint(1, 9), None]),
+            "data_year": rng.randint(2016, 2024),
+            "contact_reason": rng.choice(CONTACT),
+            "county": rng.choice(COUNTIES),
+        })
+    path = Path(path).with_suffix(".csv")
+    pd.DataFrame(records).to_csv(path, index=False)
+    return path
+
+
+WORDS = ("police officer use force body camera legitimacy trust community policy "
+         "misconduct discretion stress burnout turnover oversight accountability "
+         "survey experiment vignette public perception shooting fatal injury race "
+         "disparity benchmark training de-escalation wellness leadership").split()
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def publication_tree(root: Path, count: int, seed: int = 0) -> Path:
+    """Write count synthetic W*.md publications in the site's frontmatter format."""
+    rng = random.Random(seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        oa_id = f"W{9_000_000_000 + i}"
+        title = _sentence(rng, rng.randint(5, 14)).rstrip(".")
+        abstract = " ".join(_sentence(rng, rng.randint(8, 25)) for _ in range(rng.randint(3, 10)))
+        authors = "\n".join(f"- Author {rng.randint(1, 200)}" for _ in range(rng.randint(1, 6)))
+        (root / f"{oa_id}.md").write_text(f"""---
+title: '{title}'
+authors:
+{authors}
+- Ian T. Adams
+date: '{rng.randint(2017, 2025)}-01-01'
+publication_types:
+- '2'
+publication: Journal of {rng.choice(WORDS).title()} Studies
+abstract: '{abstract}'
+summary: '{_sentence(rng, 20)}'
+featured: false
+links:
+- name: OpenAlex
+  url: https://openalex.org/{oa_id}
+---
+
+## Summary
+
+{abstract}
+
+**Citations:** {rng.randint(0, 300)} (as of January 2026)
+""", encoding='utf-8')
+    return root
+
+
+def hugo_posts(root: Path, count: int, seed: int = 0) -> Path:
+    """Write count Hugo page bundles containing a mix of shortcodes."""
+    rng = random.Random(seed)
+    for i in range(count):
+        bundle = Path(root) / f"post-{i}"
+        bundle.mkdir(parents=True, exist_ok=True)
+        paragraphs = []
+        for _ in range(rng.randint(5, 30)):
+            paragraphs.append(_sentence(rng, rng.randint(10, 40)))
+            roll = rng.random()
+            if roll < 0.2:
+                paragraphs.append('{{< figure src="figure1.jpg" caption="A figure" >}}')
+            elif roll < 0.35:
+                paragraphs.append('{{< staticref "media/cv.pdf" "newtab" >}}'
+                                  '{{< icon name="download" pack="fas" >}} Download{{< /staticref >}}')
+        (bundle / "index.md").write_text(
+            f"---\ntitle: Post {i}\ndate: '2024-01-01'\n---\n\n" + "\n\n".join(paragraphs) + "\n",
+            encoding='utf-8')
+    return Path(root)
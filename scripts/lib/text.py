@@ -0,0 +1,52 @@
+"""
+Tokenizer and light suffix-stripping stemmer for the search/similarity stages.
+
+src/components/publications/bm25.ts implements the same rules for queries in
+the browser; change both together (and bump TEXT_VERSION) or query terms will
+no longer match indexed terms. scripts/tests/tokenizer-cases.json pins the
+expected tokens for both (test_text.py and check-tokenizer.ts).
+"""
+
+import re
+import unicodedata
+
+TEXT_VERSION = 1
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be been being between both but by can could did do
+does during each for from had has have how if in into is it its may more most no not of on or
+other our over such than that the their them then there these they this those through to under
+was we were what when where which while who will with within would you your
+""".split())
+
+# (suffix, replacement), first match wins; the remaining stem must keep 3+ characters
+SUFFIX_RULES = [
+    ("ational", "ate"), ("ization", "ize"), ("ations", "ate"), ("ation", "ate"),
+    ("nesses", ""), ("ness", ""), ("ments", ""), ("ment", ""), ("ities", ""), ("ity", ""),
+    ("ings", ""), ("ing", ""), ("ies", "y"), ("ied", "y"), ("ers", ""), ("er", ""),
+    ("ed", ""), ("ly", ""), ("s", ""),
+]
+KEEP_ENDINGS = ("ss", "us", "is")
+
+
+def stem(word: str) -> str:
+    if len(word) <= 3 or word.isdigit():
+        return word
+    if not word.endswith(KEEP_ENDINGS):
+        for suffix, replacement in SUFFIX_RULES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[: -len(suffix)] + replacement
+                break
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased, accent-folded, stop-worded and stemmed terms."""
+    text = TAG_PATTERN.sub(" ", text or "")
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    return [stem(t) for t in TOKEN_PATTERN.findall(text) if len(t) > 1 and t not in STOPWORDS]
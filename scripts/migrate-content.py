@@ -4,18 +4,59 @@ Content Migration Script
 Migrates Hugo/Wowchemy content to Astro content collections.
 """
 
-import os
-import shutil
-import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from lib import cli, instrument
+from lib.assetsync import load_manifest, save_manifest, sync_tree
+from lib.paths import CACHE_DIR
+from lib.shortcodes import transpile, transpile_file
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent.parent
 HUGO_CONTENT = PROJECT_ROOT / "content"
 ASTRO_CONTENT = SCRIPT_DIR.parent / "src" / "content"
 
-def migrate_publications():
+TRANSPILE_MANIFEST = CACHE_DIR / "transpile-manifest.json"
+POOL_THRESHOLD = 64  # below this, process start-up costs more than it saves
+
+
+def collect_sources(source_dir, dest_dir):
+    """Map each Hugo page bundle or loose .md file to its Astro destination."""
+    jobs = []
+    for item in sorted(source_dir.iterdir()):
+        if item.is_dir():
+            index_file = item / "index.md"
+            if index_file.exists():
+                # Use the directory name as the slug
+                jobs.append((index_file, dest_dir / f"{item.name}.md"))
+        elif item.suffix == '.md':
+            jobs.append((item, dest_dir / item.name))
+    return jobs
+
+
+def run_migration(jobs, transform, manifest):
+    """Transpile jobs (in a process pool when there are many), skipping unchanged files."""
+    args = [
+        (str(src), str(dest), transform, manifest.get(dest.name))
+        for src, dest in jobs
+    ]
+    if len(args) >= POOL_THRESHOLD:
+        with ProcessPoolExecutor() as pool:
+            results = list(pool.map(transpile_file, *zip(*args), chunksize=16))
+    else:
+        results = [transpile_file(*a) for a in args]
+
+    written = 0
+    for (_, dest), entry in zip(jobs, results):
+        if entry is not None:
+            manifest[dest.name] = entry
+            written += 1
+    return written, len(jobs) - written
+
+
+def migrate_publications(manifest):
     """Migrate publication markdown files."""
     source_dir = HUGO_CONTENT / "publication"
     dest_dir = ASTRO_CONTENT / "publications"
@@ -26,28 +67,15 @@ def migrate_publications():
         print(f"Source directory not found: {source_dir}")
         return
 
-    count = 0
-    for pub_dir in source_dir.iterdir():
-        if pub_dir.is_dir():
-            index_file = pub_dir / "index.md"
-            if index_file.exists():
-                # Use the directory name as the slug
-                dest_file = dest_dir / f"{pub_dir.name}.md"
-
-                # Read and copy content
-                content = index_file.read_text(encoding='utf-8')
-
-                # Minor transformations if needed
-                # (The frontmatter should be mostly compatible)
-
-                dest_file.write_text(content, encoding='utf-8')
-                count += 1
-
-    print(f"Migrated {count} publications")
+    # Publication frontmatter is already compatible; copy bundles only
+    jobs = [(src, dest) for src, dest in collect_sources(source_dir, dest_dir)
+            if src.name == "index.md"]
+    written, skipped = run_migration(jobs, False, manifest.setdefault("publications", {}))
+    print(f"Migrated {written} publications ({skipped} unchanged)")
 
 
-def migrate_posts():
-    """Migrate blog posts."""
+def migrate_posts(manifest):
+    """Migrate blog posts, replacing Hugo shortcodes with Astro equivalents."""
     source_dir = HUGO_CONTENT / "post"
     dest_dir = ASTRO_CONTENT / "posts"
 
@@ -57,83 +85,30 @@ def migrate_posts():
         print(f"Source directory not found: {source_dir}")
         return
 
-    count = 0
-    for post_item in source_dir.iterdir():
-        if post_item.is_dir():
-            index_file = post_item / "index.md"
-            if index_file.exists():
-                dest_file = dest_dir / f"{post_item.name}.md"
-                content = index_file.read_text(encoding='utf-8')
-
-                # Replace Hugo shortcodes with Astro equivalents
-                content = replace_shortcodes(content)
-
-                dest_file.write_text(content, encoding='utf-8')
-                count += 1
-        elif post_item.suffix == '.md':
-            dest_file = dest_dir / post_item.name
-            content = post_item.read_text(encoding='utf-8')
-            content = replace_shortcodes(content)
-            dest_file.write_text(content, encoding='utf-8')
-            count += 1
-
-    print(f"Migrated {count} posts")
+    jobs = collect_sources(source_dir, dest_dir)
+    written, skipped = run_migration(jobs, True, manifest.setdefault("posts", {}))
+    print(f"Migrated {written} posts ({skipped} unchanged)")
 
 
 def replace_shortcodes(content: str) -> str:
     """Replace Hugo shortcodes with Astro-compatible markup."""
-
-    # Replace {{< icon name="download" pack="fas" >}} with simple text
-    content = re.sub(r'\{\{<\s*icon[^>]*>\s*\}\}', '', content)
-
-    # Replace {{< staticref "path" "newtab" >}}text{{< /staticref >}} with markdown link
-    content = re.sub(
-        r'\{\{<\s*staticref\s+"([^"]+)"\s*(?:"[^"]+")?\s*>\s*\}\}([^{]*)\{\{<\s*/staticref\s*>\s*\}\}',
-        r'[\2](/\1)',
-        content
-    )
-
-    # Replace other common shortcodes as needed
-    # {{< figure ... >}}
-    content = re.sub(
-        r'\{\{<\s*figure\s+src="([^"]+)"[^>]*>\s*\}\}',
-        r'![](\1)',
-        content
-    )
-
-    return content
+    return transpile(content)
 
 
 def copy_static_assets():
-    """Copy static assets to public directory."""
+    """Sync static assets into the public directory, copying only what changed."""
     astro_public = SCRIPT_DIR.parent / "public"
+    manifest = load_manifest()
+
+    # media (images, CV), pdfs, and data (JSON feeds)
+    for name, label in (("media", "media assets"), ("pdfs", "PDF assets"), ("data", "data feeds")):
+        source = PROJECT_ROOT / "static" / name
+        if not source.exists():
+            continue
+        report = sync_tree(source, astro_public / name, manifest.setdefault(name, {}))
+        print(f"Synced {label}: {report.summary()}")
 
-    # Copy media folder
-    source_media = PROJECT_ROOT / "static" / "media"
-    dest_media = astro_public / "media"
-    if source_media.exists():
-        if dest_media.exists():
-            shutil.rmtree(dest_media)
-        shutil.copytree(source_media, dest_media)
-        print(f"Copied media assets")
-
-    # Copy pdfs folder
-    source_pdfs = PROJECT_ROOT / "static" / "pdfs"
-    dest_pdfs = astro_public / "pdfs"
-    if source_pdfs.exists():
-        if dest_pdfs.exists():
-            shutil.rmtree(dest_pdfs)
-        shutil.copytree(source_pdfs, dest_pdfs)
-        print(f"Copied PDF assets")
-
-    # Copy data folder (JSON feeds)
-    source_data = PROJECT_ROOT / "static" / "data"
-    dest_data = astro_public / "data"
-    if source_data.exists():
-        if dest_data.exists():
-            shutil.rmtree(dest_data)
-        shutil.copytree(source_data, dest_data)
-        print(f"Copied data feeds")
+    save_manifest(manifest)
 
 
 def main():
@@ -142,13 +117,30 @@ def main():
     print(f"Astro content: {ASTRO_CONTENT}")
     print()
 
-    migrate_publications()
-    migrate_posts()
-    copy_static_assets()
+    manifest = load_manifest(TRANSPILE_MANIFEST)
+    with instrument.stage("publications"):
+        migrate_publications(manifest)
+    with instrument.stage("posts"):
+        migrate_posts(manifest)
+    save_manifest(manifest, TRANSPILE_MANIFEST)
+    with instrument.stage("assets"):
+        copy_static_assets()
 
     print()
     print("Migration complete!")
 
 
+def check():
+    """Validate source and destination paths without migrating anything."""
+    cli.run_checks([
+        (f"Hugo content: {HUGO_CONTENT}", HUGO_CONTENT.is_dir()),
+        (f"Astro content: {ASTRO_CONTENT}", ASTRO_CONTENT.is_dir()),
+    ])
+
+
 if __name__ == "__main__":
+    args = cli.parse_args(cli.make_parser("Migrate Hugo content to Astro collections."), "migrate-content")
+    if args.check:
+        check()
     main()
+    instrument.finish()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Split the large news feeds into a small "latest" page plus dated archives.
+
+The scrapers write each feed as one file (public/data/<feed>.json, ~2 MB for
+ai-police-news), but readers mostly look at the newest stories. This stage
+writes, per feed, to public/data/news/<feed>/:
+
+    index.json               manifest: updated, count, all tags, and the
+                             file name and count of every partition
+    latest.<hash>.json       the newest LATEST_COUNT stories (the first load)
+    <YYYY-MM>.<hash>.json    one archive per month, newest first; years with
+    <YYYY>.<hash>.json       fewer than MONTHLY_MIN stories get a single
+                             yearly archive instead of many tiny ones
+
+Partition file names carry a content hash, so they can be cached forever and
+only the partitions whose stories changed get new names; files no longer
+referenced by the manifest are removed. NewsFeedClient loads the manifest
+and the latest page, and fetches the archives only when the reader pages
+past them, searches or filters by tag.
+
+Google News summaries are just the linked title and the source in HTML
+(`<a href=...>title</a> <font ...>source</font>`); such a summary is
+dropped because it only repeats title/source. Real summaries are kept.
+
+Usage:
+    python scripts/partition-news-feeds.py                   # every feed in FEEDS
+    python scripts/partition-news-feeds.py k9-incidents
+"""
+
+import html
+import json
+import re
+import sys
+from collections import defaultdict
+
+from lib import cli
+from lib.digest import bytes_digest
+from lib.output import dumps, remove, report, write_json, write_text
+from lib.paths import PUBLIC_DATA
+
+FEEDS = ["ai-police-news", "k9-incidents"]
+OUTPUT_DIR = PUBLIC_DATA / "news"
+
+LATEST_COUNT = 60       # three client pages of 20
+MONTHLY_MIN = 120       # stories a year needs before it is split by month
+HASH_LENGTH = 10
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+PARTITION_FILE = re.compile(r"^(?:latest|\d{4}(?:-\d{2})?)\.[0-9a-f]+\.json$")
+
+
+def plain(text) -> str:
+    """Visible text of an HTML fragment, whitespace-normalized."""
+    return " ".join(html.unescape(TAG_PATTERN.sub(" ", text or "")).split())
+
+
+def is_redundant(story: dict) -> bool:
+    summary = plain(story.get("summary"))
+    title = plain(story.get("title"))
+    source = plain(story.get("source"))
+    return summary in ("", title, f"{title} {source}", f"{title} - {source}")
+
+
+def slim(story: dict) -> dict:
+    if is_redundant(story):
+        return {k: v for k, v in story.items() if k != "summary"}
+    return story
+
+
+def story_month(story: dict) -> str:
+    """YYYY-MM of the story date; undated stories go to "0000" (sorted last)."""
+    date = story.get("date") or story.get("date_discovered") or ""
+    return date[:7] if re.match(r"\d{4}-\d{2}", date) else "0000"
+
+
+def partition(stories: list[dict]) -> dict:
+    """{key: stories} in feed order, keyed by month or (sparse years) by year."""
+    months = [story_month(s) for s in stories]
+    per_year = defaultdict(int)
+    for month in months:
+        per_year[month[:4]] += 1
+
+    parts = defaultdict(list)
+    for story, month in zip(stories, months):
+        parts[month[:4] if per_year[month[:4]] < MONTHLY_MIN else month].append(story)
+    return dict(sorted(parts.items(), reverse=True))
+
+
+def write_partition(feed_dir, name: str, payload: dict) -> str:
+    """Write payload under a content-hashed file name; returns the name."""
+    text = dumps(payload)
+    filename = f"{name}.{bytes_digest(text.encode('utf-8'))[:HASH_LENGTH]}.json"
+    write_text(feed_dir / filename, text)
+    return filename
+
+
+def partition_feed(feed: str) -> None:
+    source = PUBLIC_DATA / f"{feed}.json"
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    stories = [slim(s) for s in data.get("stories", [])]
+    feed_dir = OUTPUT_DIR / feed
+    dropped = sum(1 for s in stories if "summary" not in s)
+
+    latest = stories[:LATEST_COUNT]
+    manifest = {
+        "updated": data.get("updated"),
+        "count": len(stories),
+        "tags": sorted({tag for s in stories for tag in s.get("tags") or []}),
+        "latest": {
+            "file": write_partition(feed_dir, "latest", {"count": len(latest), "stories": latest}),
+            "count": len(latest),
+        },
+        "partitions": [
+            {"key": key, "count": len(items),
+             "file": write_partition(feed_dir, key, {"key": key, "count": len(items), "stories": items})}
+            for key, items in partition(stories).items()
+        ],
+    }
+    # A new scrape timestamp alone does not change the manifest
+    write_json(feed_dir / "index.json", manifest, ignore_keys=("updated",))
+
+    referenced = {manifest["latest"]["file"]} | {p["file"] for p in manifest["partitions"]}
+    for path in feed_dir.iterdir():
+        if PARTITION_FILE.match(path.name) and path.name not in referenced:
+            remove(path)
+
+    latest_size = (feed_dir / manifest["latest"]["file"]).stat().st_size
+    print(f"{feed}: {len(stories)} stories -> latest ({len(latest)}, {latest_size / 1024:.0f} KB) "
+          f"+ {len(manifest['partitions'])} archives; {dropped} redundant summaries dropped")
+
+
+def main():
+    parser = cli.make_parser("Partition the news feeds into latest/archive files.")
+    parser.add_argument("feeds", nargs="*", default=FEEDS, help=f"feeds to partition (default: {', '.join(FEEDS)})")
+    args = cli.parse_args(parser, "partition-news-feeds")
+    if args.check:
+        cli.run_checks([(f"feed: {PUBLIC_DATA / f'{feed}.json'}", (PUBLIC_DATA / f"{feed}.json").exists())
+                        for feed in args.feeds])
+
+    missing = [feed for feed in args.feeds if not (PUBLIC_DATA / f"{feed}.json").exists()]
+    if missing:
+        sys.exit(f"ERROR: no feed file for {', '.join(missing)}")
+    for feed in args.feeds:
+        partition_feed(feed)
+    report()
+
+
+if __name__ == "__main__":
+    main()
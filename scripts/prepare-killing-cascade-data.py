@@ -3,24 +3,65 @@ Prepare case data for the Killing Cascade interactive dashboard.
 
 Reads California DOJ URSUS shooting data, fits the M5 logistic model
 (matching the paper specification), computes predicted fatality probabilities,
-and outputs de-identified case JSON for the frontend.
+and outputs de-identified case JSON for the frontend, plus model diagnostics
+(calibration, ROC/PR curves, AUC, confusion by threshold) in diagnostics.json.
 
 Source paper: "The Killing Cascade" (Nix & Adams, 2026)
 Data: CA DOJ URSUS, 2016-2024
+
+numpy, pandas and statsmodels are imported inside the stages that use them.
+The model is fitted by the NumPy IRLS engine in lib/logit.py by default;
+--engine statsmodels uses the reference implementation instead.
+
+--input is either the single analysis-ready CSV or a directory with one CSV
+per state/year partition (e.g. CA-2016.csv, CA-2017.csv, TX-2023.csv). Each
+partition is filtered to the M5 sample and wound-parsed on its own, in a
+process pool when several need it, and the result is cached in
+data/cache/killing-cascade/ by the partition's hash. Partitions are only
+concatenated for the model fit and the export, so adding a year cleans just
+that file.
 """
 
 import json
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-import numpy as np
-import pandas as pd
-import statsmodels.api as sm
+from lib import cli, instrument, store
+from lib.digest import bytes_digest, file_digest
+from lib.output import report, write_json
+from lib.paths import CACHE_DIR
 
 # Paths
 CA_DATA = Path(r"C:\Users\adams\dev\research\ca_doj_use_of_force\merged_paper\outputs\study2\california_analysis_ready.csv")
 OUTPUT_DIR = Path(__file__).resolve().parent.parent / "public" / "data" / "killing-cascade"
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+# Cleaned per-partition samples: <partition stem>/<input hash>.<sample_version()>.pkl
+PARTITION_CACHE = CACHE_DIR / "killing-cascade"
+POOL_THRESHOLD = 2  # partitions to clean before a process pool pays off
+
+# De-identified cases in the local analytical store (see scripts/query-store.py)
+STORE_PATH = store.DB_PATH
+CASES_TABLE = store.Table(
+    name="cascade",
+    columns={
+        "id": "INTEGER", "fatal": "INTEGER", "woundRegions": "TEXT", "woundCount": "INTEGER",
+        "numOfficers": "INTEGER", "race": "TEXT", "age": "INTEGER", "sex": "TEXT",
+        "armed": "INTEGER", "year": "INTEGER", "contactReason": "TEXT", "county": "TEXT",
+        "predictedPFatal": "REAL",
+    },
+    indexes=["year", "race", "county"],
+)
+
+ENGINES = ("numpy", "statsmodels")
+DEFAULT_ENGINE = "numpy"
+
+M5_VARS = [
+    "race_black", "race_hispanic", "age_10yr", "female",
+    "armed_assault", "num_involved_officers",
+    "wound_head_neck", "wound_chest", "wound_abdomen",
+]
 
 # ── Wound location mapping ──────────────────────────────────────────────
 # Maps the various formats in received_force_location to SVG body regions
@@ -75,6 +116,8 @@ WOUND_MAP = {
 
 def parse_wound_regions(location_str: str) -> list[str]:
     """Parse received_force_location into a list of unique SVG body regions."""
+    import pandas as pd
+
     if pd.isna(location_str):
         return []
     loc = str(location_str).strip().strip('"')
@@ -95,12 +138,65 @@ def parse_wound_regions(location_str: str) -> list[str]:
     return sorted(regions)
 
 
-def main():
-    print("Loading California data...")
-    df = pd.read_csv(CA_DATA)
-    print(f"  Total cases: {len(df):,}")
+# ── Clean contact_reason labels ────────────────────────────────────────
+CONTACT_REASON_MAP = {
+    "vehicle_bike_pedestrian": "Vehicle/Pedestrian Stop",
+    "call_for_service": "Call for Service",
+    "in_progress": "Crime in Progress",
+    "pre_planned": "Pre-Planned Activity",
+    "welfare_check": "Welfare Check",
+    "consensual": "Consensual Encounter",
+    "ambush": "Ambush",
+    "civil_disorder": "Civil Disorder",
+    "in_custody_event": "In-Custody Event",
+    "CRIMINAL_SUSPICIOUS_ACTIVITY": "Crime in Progress",
+    "COURT_ORDER": "Court Order",
+    "FOLLOWUP": "Follow-Up",
+    "MEDICAL": "Medical Call",
+    "OTHER": "Other",
+    "ROUTINE_PATROL": "Routine Patrol",
+    "TRAFFIC_STOP": "Traffic Stop",
+    "UNKNOWN": "Unknown",
+    "WARRANT": "Warrant Service",
+}
 
-    # ── Build regression sample (matches paper M5 specification) ────────
+# For cases with no parsed regions, fall back to wound_location_std
+WOUND_FALLBACK_MAP = {
+    "Head/Neck": ["head"],
+    "Chest": ["chest"],
+    "Abdomen": ["abdomen"],
+    "Extremities": ["arms"],  # default to arms for extremities
+}
+
+
+def clean_contact_reason(reason):
+    import pandas as pd
+
+    if pd.isna(reason):
+        return "Unknown"
+    r = str(reason).strip()
+    if not r:
+        return "Unknown"
+    # Check map first (for snake_case/uppercase values)
+    if r in CONTACT_REASON_MAP:
+        return CONTACT_REASON_MAP[r]
+    # Already readable — truncate long ones
+    return r[:60] if len(r) > 60 else r
+
+
+def clean_county(county):
+    import pandas as pd
+
+    if pd.isna(county):
+        return "Unknown"
+    c = str(county).strip()
+    # Remove " County" suffix, then title-case
+    c = c.replace(" County", "").replace(" county", "")
+    return c.title()
+
+
+def build_regression_sample(df):
+    """Filter to the paper's M5 sample and create model variables."""
     main_races = ["White", "Black", "Hispanic"]
     wound_locs = ["Head/Neck", "Chest", "Abdomen", "Extremities"]
 
@@ -108,7 +204,6 @@ def main():
     reg_df = reg_df[reg_df["wound_location_std"].isin(wound_locs)]
     reg_df = reg_df.dropna(subset=["age_numeric", "gender_std", "num_involved_officers"])
     reg_df = reg_df[reg_df["gender_std"] != "Unknown"]
-    print(f"  Regression sample: {len(reg_df):,}")
 
     # Create model variables
     reg_df["race_black"] = (reg_df["race_std"] == "Black").astype(int)
@@ -121,88 +216,123 @@ def main():
     reg_df["wound_head_neck"] = (reg_df["wound_location_std"] == "Head/Neck").astype(int)
     reg_df["wound_chest"] = (reg_df["wound_location_std"] == "Chest").astype(int)
     reg_df["wound_abdomen"] = (reg_df["wound_location_std"] == "Abdomen").astype(int)
+    return reg_df
 
-    # ── Fit M5 logistic model ───────────────────────────────────────────
-    m5_vars = [
-        "race_black", "race_hispanic", "age_10yr", "female",
-        "armed_assault", "num_involved_officers",
-        "wound_head_neck", "wound_chest", "wound_abdomen",
-    ]
-    y = reg_df["fatal"]
-    X = sm.add_constant(reg_df[m5_vars])
-    logit_model = sm.Logit(y, X).fit(disp=0)
 
-    print("\nM5 Logistic Model Summary:")
-    print(f"  Pseudo R²: {logit_model.prsquared:.4f}")
-    print(f"  N: {int(logit_model.nobs):,}")
-    print(f"  Intercept: {logit_model.params['const']:.4f}")
-    for var in m5_vars:
-        or_val = np.exp(logit_model.params[var])
-        print(f"  {var}: OR = {or_val:.3f}, coef = {logit_model.params[var]:.4f}")
+# Columns of the cleaned sample that the fit and export read
+SAMPLE_COLUMNS = [
+    "fatal", *M5_VARS, "race_std", "age_numeric", "gender_std", "wound_location_std",
+    "wound_regions", "wound_count", "data_year", "contact_reason", "county",
+]
+
+
+def input_partitions(ca_data) -> list[Path]:
+    """The input CSV, or every CSV in a partition directory, in name order."""
+    path = Path(ca_data)
+    if not path.is_dir():
+        return [path]
+    partitions = sorted(path.glob("*.csv"))
+    if not partitions:
+        raise FileNotFoundError(f"No partition CSVs in {path}")
+    return partitions
+
+
+def clean_partition(csv_path, cache_path):
+    """Worker: M5 sample with parsed wound regions for one partition, pickled to cache_path."""
+    import pandas as pd
+
+    reg_df = build_regression_sample(pd.read_csv(csv_path))
+    attach_wound_regions(reg_df)
+    reg_df = reg_df[[c for c in SAMPLE_COLUMNS if c in reg_df.columns]]
+    tmp = Path(cache_path).with_suffix(".tmp")
+    reg_df.to_pickle(tmp)
+    os.replace(tmp, cache_path)
+
+
+def sample_version() -> str:
+    """Digest of the cleaning code and tables only; unrelated edits keep the cache."""
+    import inspect
+
+    code = [inspect.getsource(f) for f in
+            (build_regression_sample, parse_wound_regions, attach_wound_regions, clean_partition)]
+    tables = json.dumps([M5_VARS, SAMPLE_COLUMNS, WOUND_MAP, WOUND_FALLBACK_MAP], sort_keys=True)
+    return bytes_digest("\n".join([*code, tables]).encode('utf-8'))[:12]
+
+
+def load_partitions(partitions, jobs=None):
+    """
+    Concatenated cleaned sample for all partitions and the combined source digest.
+
+    Partitions whose cached sample matches their hash (and the cleaning
+    code's version) are read from the cache; the rest are cleaned first.
+    """
+    import pandas as pd
+
+    version = sample_version()
+    digests = [file_digest(p) for p in partitions]
+    caches = [PARTITION_CACHE / p.stem / f"{d[:16]}.{version}.pkl" for p, d in zip(partitions, digests)]
+    stale = [(str(p), c) for p, c in zip(partitions, caches) if not c.exists()]
+    print(f"  Partitions: {len(partitions)} ({len(partitions) - len(stale)} cached, {len(stale)} to clean)")
+
+    for _, cache in stale:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+    if len(stale) >= POOL_THRESHOLD and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            list(pool.map(clean_partition, *zip(*stale)))
+    else:
+        for args in stale:
+            clean_partition(*args)
+
+    # Drop samples cached for earlier versions of these partitions
+    for cache in caches:
+        for old in cache.parent.glob("*.pkl"):
+            if old != cache:
+                old.unlink()
 
-    # Predicted probabilities
+    reg_df = pd.concat([pd.read_pickle(c) for c in caches], ignore_index=True)
+    source_digest = digests[0] if len(digests) == 1 else "-".join(d[:16] for d in digests)
+    return reg_df, source_digest
+
+
+def design_matrix(reg_df):
+    """M5 covariates with a leading constant column, as sm.add_constant builds it."""
+    X = reg_df[M5_VARS].astype(float)
+    X.insert(0, "const", 1.0)
+    return X
+
+
+def fit_model(reg_df, engine=DEFAULT_ENGINE):
+    """Fit the M5 logistic model and attach predicted probabilities."""
+    X = design_matrix(reg_df)
+    y = reg_df["fatal"]
+    if engine == "statsmodels":
+        sm = cli.require("statsmodels.api", "statsmodels")
+        logit_model = sm.Logit(y, X).fit(disp=0)
+    else:
+        from lib import logit
+        logit_model = logit.fit(X, y)
+        if not logit_model.converged:
+            print(f"  WARNING: IRLS did not converge in {logit_model.iterations} iterations")
     reg_df["predicted_p_fatal"] = logit_model.predict(X)
+    return logit_model
 
-    # ── Parse detailed wound regions for SVG ────────────────────────────
-    reg_df["wound_regions"] = reg_df["received_force_location"].apply(parse_wound_regions)
 
-    # For cases with no parsed regions, fall back to wound_location_std
-    fallback_map = {
-        "Head/Neck": ["head"],
-        "Chest": ["chest"],
-        "Abdomen": ["abdomen"],
-        "Extremities": ["arms"],  # default to arms for extremities
-    }
+def attach_wound_regions(reg_df):
+    """Parse detailed wound regions for the SVG body map."""
+    import pandas as pd
+
+    reg_df["wound_regions"] = reg_df["received_force_location"].apply(parse_wound_regions)
     for idx, row in reg_df.iterrows():
         if not row["wound_regions"] and pd.notna(row["wound_location_std"]):
-            reg_df.at[idx, "wound_regions"] = fallback_map.get(
+            reg_df.at[idx, "wound_regions"] = WOUND_FALLBACK_MAP.get(
                 row["wound_location_std"], []
             )
 
-    # ── Clean contact_reason labels ────────────────────────────────────
-    CONTACT_REASON_MAP = {
-        "vehicle_bike_pedestrian": "Vehicle/Pedestrian Stop",
-        "call_for_service": "Call for Service",
-        "in_progress": "Crime in Progress",
-        "pre_planned": "Pre-Planned Activity",
-        "welfare_check": "Welfare Check",
-        "consensual": "Consensual Encounter",
-        "ambush": "Ambush",
-        "civil_disorder": "Civil Disorder",
-        "in_custody_event": "In-Custody Event",
-        "CRIMINAL_SUSPICIOUS_ACTIVITY": "Crime in Progress",
-        "COURT_ORDER": "Court Order",
-        "FOLLOWUP": "Follow-Up",
-        "MEDICAL": "Medical Call",
-        "OTHER": "Other",
-        "ROUTINE_PATROL": "Routine Patrol",
-        "TRAFFIC_STOP": "Traffic Stop",
-        "UNKNOWN": "Unknown",
-        "WARRANT": "Warrant Service",
-    }
 
-    def clean_contact_reason(reason):
-        if pd.isna(reason):
-            return "Unknown"
-        r = str(reason).strip()
-        if not r:
-            return "Unknown"
-        # Check map first (for snake_case/uppercase values)
-        if r in CONTACT_REASON_MAP:
-            return CONTACT_REASON_MAP[r]
-        # Already readable — truncate long ones
-        return r[:60] if len(r) > 60 else r
-
-    # ── Clean county names ──────────────────────────────────────────────
-    def clean_county(county):
-        if pd.isna(county):
-            return "Unknown"
-        c = str(county).strip()
-        # Remove " County" suffix, then title-case
-        c = c.replace(" County", "").replace(" county", "")
-        return c.title()
+def build_cases(reg_df):
+    """Build the shuffled, de-identified case list for the frontend."""
+    import pandas as pd
 
-    # ── Build output JSON ───────────────────────────────────────────────
     cases = []
     indices = list(reg_df.index)
     random.seed(42)
@@ -226,15 +356,13 @@ def main():
             "predictedPFatal": round(float(row["predicted_p_fatal"]), 4),
         }
         cases.append(case)
+    return cases
 
-    # ── Write cases.json ────────────────────────────────────────────────
-    cases_path = OUTPUT_DIR / "cases.json"
-    with open(cases_path, "w") as f:
-        json.dump(cases, f, separators=(",", ":"))
-    print(f"\nWrote {len(cases):,} cases to {cases_path}")
-    print(f"  File size: {cases_path.stat().st_size / 1024:.1f} KB")
 
-    # ── Write model.json ────────────────────────────────────────────────
+def build_model_info(logit_model, reg_df):
+    import numpy as np
+
+    y = reg_df["fatal"]
     model_info = {
         "name": "M5: Logistic Regression with Wound Location",
         "n": int(logit_model.nobs),
@@ -256,16 +384,77 @@ def main():
             ), 1),
         },
     }
-    for var in m5_vars:
+    for var in M5_VARS:
         clean = var.replace("race_", "").replace("wound_", "").replace("_", " ").title()
         model_info["coefficients"][clean] = round(float(logit_model.params[var]), 4)
         model_info["oddsRatios"][clean] = round(float(np.exp(logit_model.params[var])), 3)
+    return model_info
+
+
+def check(ca_data=CA_DATA, output_dir=OUTPUT_DIR, engine=DEFAULT_ENGINE):
+    """Validate inputs and dependencies without loading any data."""
+    cli.run_checks([
+        (f"input CSV or partition dir: {ca_data}", Path(ca_data).exists()),
+        (f"output dir: {output_dir}", Path(output_dir).parent.is_dir()),
+        ("pandas installed", cli.available("pandas")),
+        ("numpy installed", cli.available("numpy")),
+        ("statsmodels installed", cli.available("statsmodels"), engine == "statsmodels"),
+    ])
+
 
-    model_path = OUTPUT_DIR / "model.json"
-    with open(model_path, "w") as f:
-        json.dump(model_info, f, indent=2)
+def main(ca_data=CA_DATA, output_dir=OUTPUT_DIR, engine=DEFAULT_ENGINE, jobs=None):
+    np = cli.require("numpy", "numpy")
+    cli.require("pandas", "pandas")
+
+    # ── Build regression sample (matches paper M5 specification) ────────
+    # Per partition: sample filter, model variables and wound regions
+    print(f"Loading case data from {ca_data}...")
+    partitions = input_partitions(ca_data)
+    with instrument.stage("build_sample", partitions=len(partitions)):
+        reg_df, source_digest = load_partitions(partitions, jobs)
+    print(f"  Regression sample: {len(reg_df):,}")
+
+    # ── Fit M5 logistic model ───────────────────────────────────────────
+    with instrument.stage("fit", rows=len(reg_df), engine=engine):
+        logit_model = fit_model(reg_df, engine)
+
+    print(f"\nM5 Logistic Model Summary ({engine}):")
+    print(f"  Pseudo R²: {logit_model.prsquared:.4f}")
+    print(f"  N: {int(logit_model.nobs):,}")
+    print(f"  Intercept: {logit_model.params['const']:.4f}")
+    for var in M5_VARS:
+        or_val = np.exp(logit_model.params[var])
+        print(f"  {var}: OR = {or_val:.3f}, coef = {logit_model.params[var]:.4f}")
+
+    # ── Build output JSON ───────────────────────────────────────────────
+    with instrument.stage("build_records"):
+        cases = build_cases(reg_df)
+
+    # ── Write cases.json ────────────────────────────────────────────────
+    output_dir = Path(output_dir)
+    cases_path = output_dir / "cases.json"
+    with instrument.stage("serialize_write"):
+        write_json(cases_path, cases, separators=(",", ":"))
+    print(f"\nWrote {len(cases):,} cases to {cases_path}")
+    print(f"  File size: {cases_path.stat().st_size / 1024:.1f} KB")
+    with instrument.stage("store_load", rows=len(cases)):
+        store.load_table(CASES_TABLE, cases, source_digest, STORE_PATH)
+
+    # ── Write model.json ────────────────────────────────────────────────
+    model_info = build_model_info(logit_model, reg_df)
+    model_path = output_dir / "model.json"
+    write_json(model_path, model_info, indent=2)
     print(f"Wrote model info to {model_path}")
 
+    # ── Write diagnostics.json ──────────────────────────────────────────
+    from lib.diagnostics import binary_diagnostics
+    with instrument.stage("diagnostics"):
+        diagnostics = binary_diagnostics(reg_df["fatal"], reg_df["predicted_p_fatal"])
+    diagnostics_path = output_dir / "diagnostics.json"
+    write_json(diagnostics_path, diagnostics, separators=(",", ":"))
+    print(f"Wrote diagnostics to {diagnostics_path} (AUC {diagnostics['auc']}, "
+          f"Brier {diagnostics['brier']})")
+
     # ── Summary stats ───────────────────────────────────────────────────
     fatal_cases = sum(1 for c in cases if c["fatal"])
     survived_cases = len(cases) - fatal_cases
@@ -283,4 +472,16 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = cli.make_parser("Prepare Killing Cascade case data and model summary.")
+    parser.add_argument("--input", type=Path, default=CA_DATA,
+                        help="analysis-ready URSUS CSV, or a directory of per-state/year CSVs")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--engine", choices=ENGINES, default=DEFAULT_ENGINE,
+                        help="logistic regression engine (statsmodels is the reference)")
+    parser.add_argument("--jobs", type=int, help="worker processes for cleaning partitions")
+    args = cli.parse_args(parser, "prepare-killing-cascade-data")
+    if args.check:
+        check(args.input, args.output_dir, args.engine)
+    main(args.input, args.output_dir, args.engine, args.jobs)
+    report()
+    instrument.finish()
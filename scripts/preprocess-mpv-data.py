@@ -2,64 +2,263 @@
 """
 MPV Data Preprocessing Script
 Downloads and processes the Mapping Police Violence dataset into optimized JSON for the dashboard.
+
+The SHA-256 of the downloaded workbook is stored in the output as
+``source_sha256``; when a new download hashes the same, the script exits
+before pandas is even imported.
+
+--stream processes the workbook in CHUNK_ROWS-row chunks (openpyxl read-only
+mode, or chunked read_csv) and serializes each chunk's records straight into
+mpv-data.json, with count/updated written as trailing members. Peak memory
+is then bounded by the chunk size plus a small per-record projection kept for
+the spatial index and rate tables, instead of the whole frame, the records
+list and the output dict at once.
+
+Alongside the records, public/data/mpv-spatial.json holds a spatial index
+for map views: incident counts per Web Mercator tile at several zoom levels,
+faceted by year and race, plus every record's coordinates as fixed-point
+integers (degrees * COORD_SCALE) in record order.
+
+If a local population table exists in data/population/, a join stage also
+writes public/data/mpv-rates.json: deaths and deaths per million by
+state (and city) x year x race. Expected long-format CSVs:
+
+    data/population/states.csv   state,year,race,population
+    data/population/cities.csv   state,city,year,race,population   (optional)
+
+state is the two-letter code used by MPV, race is one of the race_clean
+labels (White, Black, Hispanic, ...) or "All" for the total population.
+
+Input columns are located by MPV_SCHEMA (see lib/schema.py) from the header
+row alone, read before the workbook is parsed. The accepted header and
+mapping are kept in data/mpv-schema.json. If an upstream header change stops
+a field from resolving, or makes it resolve to a different column, the run
+aborts with a drift report. Pass --accept-schema once the new mapping has
+been checked.
 """
 
+import csv
 import json
+import os
 import re
-from datetime import datetime
+import sys
+from datetime import datetime, timezone
 from pathlib import Path
-import urllib.request
 import tempfile
 
-# Try to import pandas and openpyxl, provide helpful error if not installed
-try:
-    import pandas as pd
-except ImportError:
-    print("Please install pandas: pip install pandas openpyxl")
-    exit(1)
+from lib import cli, http, instrument, schema, store
+from lib.digest import file_digest
+from lib.output import JSONStream, report, write_json
 
 SCRIPT_DIR = Path(__file__).parent
 OUTPUT_PATH = SCRIPT_DIR.parent / "public" / "data" / "mpv-data.json"
+SPATIAL_PATH = SCRIPT_DIR.parent / "public" / "data" / "mpv-spatial.json"
+
+POPULATION_DIR = SCRIPT_DIR.parent / "data" / "population"
+RATES_PATH = SCRIPT_DIR.parent / "public" / "data" / "mpv-rates.json"
+RATE_PER = 1_000_000
+GEOGRAPHIES = {
+    'states': ['state'],
+    'cities': ['state', 'city'],
+}
+
+# Tile zoom levels (4 ~ whole US, 8 ~ metro area) and 1e-4 degree (~11 m) coordinates
+TILE_ZOOMS = [3, 4, 5, 6, 7, 8]
+COORD_SCALE = 10_000
 
 MPV_URL = "https://mappingpoliceviolence.us/s/MPVDatasetDownload.xlsx"
 
+# Accepted upstream header and column mapping (tracked, so CI diffs against it)
+SCHEMA_PATH = SCRIPT_DIR.parent / "data" / "mpv-schema.json"
+# Rules match cleaned column names (see clean_name); tokens are '_'-separated,
+# so token('age') matches victims_age but not agency_responsible or image_url
+MPV_SCHEMA = schema.Schema([
+    schema.Field('date', (schema.token('date'),), required=True),
+    schema.Field('race', (schema.contains('race', 'victim'), schema.token('race')), required=True),
+    schema.Field('age', (schema.token('age'),)),
+    schema.Field('fleeing', (schema.contains('fleeing'),)),
+    schema.Field('mental', (schema.contains('mental', 'symptom'),)),
+    schema.Field('state', (schema.exact('state'),), required=True),
+    schema.Field('city', (schema.exact('city'),)),
+    schema.Field('county', (schema.exact('county'),)),
+    # Exact names or suffixes only, so "location_type" and the like never match
+    schema.Field('lat', (r'^(?:latitude|lat)$|_lat$',), required=True),
+    schema.Field('lon', (r'^(?:longitude|lon|lng)$|_(?:lon|lng)$',), required=True),
+    schema.Field('cause', (schema.contains('cause', 'death'),)),
+    schema.Field('armed', (schema.contains('armed', 'unarmed'),)),
+    schema.Field('weapon', (schema.contains('weapon'),)),
+    schema.Field('bodycam', (schema.contains('body', 'camera'),)),
+    schema.Field('charges', (schema.contains('criminal', 'charge'),)),
+    schema.Field('income', (schema.contains('income'),)),
+])
+
+CHUNK_ROWS = 5_000
+# Record fields the spatial index and rate tables need in --stream mode
+AGGREGATE_FIELDS = ('latitude', 'longitude', 'year', 'race_clean', 'state', 'city')
+# Record fields loaded into the store but not published in mpv-data.json
+STORE_ONLY_FIELDS = ('county',)
+
+# Cleaned records in the local analytical store (see scripts/query-store.py)
+STORE_PATH = store.DB_PATH
+MPV_TABLE = store.Table(
+    name="mpv",
+    columns={
+        'date': 'TEXT', 'year': 'INTEGER', 'month': 'TEXT', 'day': 'TEXT', 'day_of_year': 'INTEGER',
+        'age_numeric': 'INTEGER', 'race_clean': 'TEXT', 'fleeing_clean': 'TEXT',
+        'mental_illness_symptoms': 'INTEGER', 'state': 'TEXT', 'city': 'TEXT', 'county': 'TEXT',
+        'latitude': 'REAL', 'longitude': 'REAL', 'cause_of_death': 'TEXT',
+        'armed_unarmed_status': 'TEXT', 'alleged_weapon': 'TEXT', 'body_camera': 'INTEGER',
+        'criminal_charges': 'TEXT', 'median_household_income': 'REAL',
+    },
+    indexes=['year', 'state', 'race_clean', 'county', ('state', 'year')],
+)
+
+# pandas' default na_values, which pd.read_excel applies and openpyxl does not
+NA_STRINGS = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+# National population by year
+POPULATION = {
+    2013: 316128839,
+    2014: 318857056,
+    2015: 320738994,
+    2016: 323071755,
+    2017: 325084756,
+    2018: 326687501,
+    2019: 328239523,
+    2020: 331449281,
+    2021: 331893745,
+    2022: 333287557,
+    2023: 334914895,
+    2024: 336673595,
+    2025: 338289857,
+}
+
 
 def download_data():
     """Download the MPV Excel file."""
     print("Downloading MPV data...")
     with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
-        urllib.request.urlretrieve(MPV_URL, tmp.name)
-        return tmp.name
+        path = tmp.name
+    http.download(MPV_URL, path)
+    return path
+
+
+def clean_name(col):
+    return re.sub(r'[^a-z0-9_]', '', str(col).lower().replace(' ', '_'))
 
 
 def clean_column_names(df):
     """Clean column names to be consistent."""
-    df.columns = [
-        re.sub(r'[^a-z0-9_]', '', col.lower().replace(' ', '_'))
-        for col in df.columns
-    ]
+    df.columns = [clean_name(col) for col in df.columns]
     return df
 
 
-def process_data(excel_path):
+def header_names(row):
+    """Raw header cells with the names pd.read_excel gives blank ones."""
+    return [str(c) if c is not None else f"Unnamed: {i}" for i, c in enumerate(row)]
+
+
+def read_header(excel_path):
+    """Cleaned column names from the header row only, without parsing the data."""
+    if str(excel_path).endswith('.csv'):
+        with open(excel_path, 'r', encoding='utf-8', newline='') as f:
+            return [clean_name(c) for c in next(csv.reader(f))]
+    openpyxl = cli.require("openpyxl", "openpyxl")
+    workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        row = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True))
+    finally:
+        workbook.close()
+    return [clean_name(c) for c in header_names(row)]
+
+
+def resolve_columns(excel_path, accept=False):
+    """Map MPV_SCHEMA fields to columns; raises schema.SchemaDrift on a bad header."""
+    columns = read_header(excel_path)
+    return schema.resolve_cached(MPV_SCHEMA, columns, SCHEMA_PATH, accept)
+
+
+def read_frame(excel_path):
+    """Load the raw workbook (or a CSV export) with cleaned column names."""
+    pd = cli.require("pandas", "pandas openpyxl")
+    if str(excel_path).endswith('.csv'):
+        df = pd.read_csv(excel_path, low_memory=False)
+    else:
+        df = pd.read_excel(excel_path)
+    return clean_column_names(df)
+
+
+def iter_chunks(excel_path, chunk_rows=CHUNK_ROWS):
+    """Yield the workbook (or CSV export) as DataFrames of at most chunk_rows rows."""
+    pd = cli.require("pandas", "pandas openpyxl")
+    if str(excel_path).endswith('.csv'):
+        for chunk in pd.read_csv(excel_path, chunksize=chunk_rows, low_memory=False):
+            yield clean_column_names(chunk)
+        return
+
+    openpyxl = cli.require("openpyxl", "openpyxl")
+    workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = header_names(next(rows))
+        width = len(header)
+
+        def frame(batch):
+            df = pd.DataFrame(batch, columns=header)
+            return clean_column_names(df.mask(df.isin(NA_STRINGS)))
+
+        batch = []
+        for row in rows:
+            batch.append(row[:width] + (None,) * (width - len(row)))
+            if len(batch) == chunk_rows:
+                yield frame(batch)
+                batch = []
+        if batch:
+            yield frame(batch)
+    finally:
+        workbook.close()
+
+
+def stream_records(excel_path, out, table, cols, chunk_rows=CHUNK_ROWS):
+    """Clean the workbook chunk by chunk into the JSON stream and the store; returns the aggregate projection."""
+    projection = []
+    for i, chunk in enumerate(iter_chunks(excel_path, chunk_rows)):
+        with instrument.stage("chunk", index=i, rows=len(chunk)):
+            df = classify(chunk, cols)
+            records = build_records(df, cols)
+            out.extend(public_record(r) for r in records)
+            table.extend(records)
+        projection.extend({k: r[k] for k in AGGREGATE_FIELDS} for r in records)
+    return projection
+
+
+def process_data(excel_path, cols=None):
     """Process the Excel data into the format needed by the dashboard."""
     print("Processing data...")
-    df = pd.read_excel(excel_path)
-    df = clean_column_names(df)
+    with instrument.stage("parse"):
+        df = read_frame(excel_path)
     print(f"Found {len(df.columns)} columns: {list(df.columns)[:20]}...")
+    if cols is None:
+        cols = MPV_SCHEMA.resolve(df.columns)
+        missing = MPV_SCHEMA.missing(cols)
+        if missing:
+            raise schema.SchemaDrift(f"Could not find columns for: {', '.join(missing)}")
+
+    with instrument.stage("classify"):
+        df = classify(df, cols)
+    with instrument.stage("build_records", rows=len(df)):
+        return build_records(df, cols)
 
-    # Find the date column
-    date_col = None
-    for col in df.columns:
-        if 'date' in col:
-            date_col = col
-            break
 
-    if date_col is None:
-        raise ValueError("Could not find date column")
+def classify(df, cols):
+    """Derive date parts and cleaned categorical columns from the resolved raw columns."""
+    import pandas as pd
 
     # Convert and clean data
-    df['date'] = pd.to_datetime(df[date_col], errors='coerce')
+    df['date'] = pd.to_datetime(df[cols['date']], errors='coerce')
     df = df.dropna(subset=['date'])
 
     df['year'] = df['date'].dt.year.astype(int)
@@ -86,39 +285,21 @@ def process_data(excel_path):
             return 'Pacific Islander'
         return 'Other'
 
-    race_col = None
-    for col in df.columns:
-        if 'race' in col and 'victim' in col:
-            race_col = col
-            break
-    if race_col is None:
-        for col in df.columns:
-            if 'race' in col:
-                race_col = col
-                break
-
+    race_col = cols['race']
     if race_col:
         df['race_clean'] = df[race_col].apply(clean_race)
     else:
         df['race_clean'] = 'Unknown'
 
     # Age
-    age_col = None
-    for col in df.columns:
-        if 'age' in col:
-            age_col = col
-            break
+    age_col = cols['age']
     if age_col:
         df['age_numeric'] = pd.to_numeric(df[age_col], errors='coerce')
     else:
         df['age_numeric'] = None
 
     # Fleeing status
-    fleeing_col = None
-    for col in df.columns:
-        if 'fleeing' in col:
-            fleeing_col = col
-            break
+    fleeing_col = cols['fleeing']
 
     def clean_fleeing(val):
         if pd.isna(val):
@@ -136,11 +317,7 @@ def process_data(excel_path):
         df['fleeing_clean'] = 'Unknown'
 
     # Mental illness symptoms
-    mental_col = None
-    for col in df.columns:
-        if 'mental' in col and 'symptom' in col:
-            mental_col = col
-            break
+    mental_col = cols['mental']
 
     def has_mental_symptoms(val):
         if pd.isna(val):
@@ -153,18 +330,24 @@ def process_data(excel_path):
     else:
         df['mental_illness_symptoms'] = False
 
-    # Other fields
-    state_col = next((c for c in df.columns if c == 'state'), None)
-    city_col = next((c for c in df.columns if c == 'city'), None)
-    # Be more specific with lat/lon to avoid matching columns like "location_type"
-    lat_col = next((c for c in df.columns if c == 'latitude' or c.endswith('_lat') or c == 'lat'), None)
-    lon_col = next((c for c in df.columns if c == 'longitude' or c.endswith('_lon') or c.endswith('_lng') or c == 'lon' or c == 'lng'), None)
-    cause_col = next((c for c in df.columns if 'cause' in c and 'death' in c), None)
-    armed_col = next((c for c in df.columns if 'armed' in c and 'unarmed' in c), None)
-    weapon_col = next((c for c in df.columns if 'weapon' in c), None)
-    bodycam_col = next((c for c in df.columns if 'body' in c and 'camera' in c), None)
-    charges_col = next((c for c in df.columns if 'criminal' in c and 'charge' in c), None)
-    income_col = next((c for c in df.columns if 'income' in c), None)
+    return df
+
+
+def build_records(df, cols):
+    """Build one JSON-ready dict per incident (store columns; see public_record)."""
+    import pandas as pd
+
+    state_col = cols['state']
+    city_col = cols['city']
+    county_col = cols['county']
+    lat_col = cols['lat']
+    lon_col = cols['lon']
+    cause_col = cols['cause']
+    armed_col = cols['armed']
+    weapon_col = cols['weapon']
+    bodycam_col = cols['bodycam']
+    charges_col = cols['charges']
+    income_col = cols['income']
 
     # Build records
     records = []
@@ -181,6 +364,7 @@ def process_data(excel_path):
             'mental_illness_symptoms': bool(row['mental_illness_symptoms']),
             'state': str(row.get(state_col, '')) if state_col and pd.notna(row.get(state_col)) else None,
             'city': str(row.get(city_col, '')) if city_col and pd.notna(row.get(city_col)) else None,
+            'county': str(row.get(county_col, '')) if county_col and pd.notna(row.get(county_col)) else None,
             'latitude': float(row.get(lat_col)) if lat_col and pd.notna(row.get(lat_col)) and isinstance(row.get(lat_col), (int, float)) else None,
             'longitude': float(row.get(lon_col)) if lon_col and pd.notna(row.get(lon_col)) and isinstance(row.get(lon_col), (int, float)) else None,
             'cause_of_death': str(row.get(cause_col, '')) if cause_col and pd.notna(row.get(cause_col)) else None,
@@ -195,50 +379,226 @@ def process_data(excel_path):
     return records
 
 
-def main():
-    # Download and process
-    excel_path = download_data()
-    records = process_data(excel_path)
-
-    # Population data
-    population = {
-        2013: 316128839,
-        2014: 318857056,
-        2015: 320738994,
-        2016: 323071755,
-        2017: 325084756,
-        2018: 326687501,
-        2019: 328239523,
-        2020: 331449281,
-        2021: 331893745,
-        2022: 333287557,
-        2023: 334914895,
-        2024: 336673595,
-        2025: 338289857,
-    }
+def public_record(record):
+    """A record as published in mpv-data.json (without STORE_ONLY_FIELDS)."""
+    return {k: v for k, v in record.items() if k not in STORE_ONLY_FIELDS}
 
-    # Build output
-    output = {
-        'updated': datetime.utcnow().isoformat() + 'Z',
+
+def build_spatial_index(records, source_digest):
+    """Tile counts per zoom (faceted by year and race) and quantized coordinates."""
+    from lib import spatial
+
+    nan = float('nan')
+    lat = [r['latitude'] if r['latitude'] is not None else nan for r in records]
+    lon = [r['longitude'] if r['longitude'] is not None else nan for r in records]
+    lat_q = spatial.quantize(lat, COORD_SCALE)
+    lon_q = spatial.quantize(lon, COORD_SCALE)
+    return {
+        'source_sha256': source_digest,
         'count': len(records),
-        'records': records,
-        'population': population,
+        'coordScale': COORD_SCALE,
+        # [lat0, lon0, lat1, lon1, ...] aligned with mpv-data.json records
+        'coords': [v for pair in zip(lat_q, lon_q) for v in pair],
+        'tiles': spatial.tile_counts(lat, lon, TILE_ZOOMS, facets={
+            'year': [r['year'] for r in records],
+            'race': [r['race_clean'] for r in records],
+        }),
     }
 
-    # Ensure output directory exists
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-    # Write JSON
-    print(f"Writing {len(records)} records to {OUTPUT_PATH}")
-    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
-        json.dump(output, f, separators=(',', ':'))
+def population_digest():
+    """Combined digest of the population tables, or None if there are none."""
+    tables = sorted(POPULATION_DIR.glob("*.csv"))
+    if not tables:
+        return None
+    return "-".join(file_digest(t)[:16] for t in tables)
+
+
+def load_population(kind):
+    """Population table for 'states' or 'cities', or None if not present."""
+    import pandas as pd
+
+    path = POPULATION_DIR / f"{kind}.csv"
+    if not path.exists():
+        return None
+    keys = GEOGRAPHIES[kind]
+    pop = pd.read_csv(path, dtype={k: str for k in keys + ['race']})
+    pop['year'] = pop['year'].astype(int)
+    return pop[keys + ['year', 'race', 'population']]
+
+
+def rate_table(records_df, pop, keys):
+    """Deaths and per-million rates by geography x year x race, as a nested lookup."""
+    import pandas as pd
+
+    deaths = pd.concat([
+        records_df.groupby(keys + ['year', 'race_clean']).size(),
+        records_df.assign(race_clean='All').groupby(keys + ['year', 'race_clean']).size(),
+    ]).rename('deaths').reset_index().rename(columns={'race_clean': 'race'})
+
+    # Population drives the join so geographies with no deaths still get a 0 rate
+    merged = pop.merge(deaths, on=keys + ['year', 'race'], how='left')
+    merged['deaths'] = merged['deaths'].fillna(0).astype(int)
+    merged['rate'] = (merged['deaths'] / merged['population'] * RATE_PER).round(2)
+    merged['geo'] = merged[keys].agg(', '.join, axis=1) if len(keys) > 1 else merged[keys[0]]
+
+    years = sorted(merged['year'].unique().tolist())
+    wide = merged.pivot_table(index=['geo', 'race'], columns='year', values=['deaths', 'rate'])
+    wide = wide.reindex(columns=pd.MultiIndex.from_product([['deaths', 'rate'], years]))
+
+    lookup = {}
+    for (geo, race), row in wide.iterrows():
+        lookup.setdefault(geo, {})[race] = {
+            'deaths': [None if pd.isna(v) else int(v) for v in row['deaths']],
+            'rate': [None if pd.isna(v) else float(v) for v in row['rate']],
+        }
+    return {'years': years, 'races': sorted(merged['race'].unique().tolist()), 'data': lookup}
 
-    print("Done!")
 
-    # Cleanup
-    import os
-    os.unlink(excel_path)
+def build_rate_tables(records, source_digest):
+    """Join deaths to the local population tables; None when no table is present."""
+    import pandas as pd
+
+    tables = {kind: load_population(kind) for kind in GEOGRAPHIES}
+    if all(pop is None for pop in tables.values()):
+        return None
+
+    records_df = pd.DataFrame(records, columns=['state', 'city', 'year', 'race_clean'])
+    output = {
+        'source_sha256': source_digest,
+        'population_sha256': population_digest(),
+        'per': RATE_PER,
+    }
+    for kind, pop in tables.items():
+        if pop is not None:
+            keys = GEOGRAPHIES[kind]
+            output[kind] = rate_table(records_df.dropna(subset=keys), pop, keys)
+    return output
+
+
+def previous_rates_digest():
+    try:
+        with open(RATES_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f).get('population_sha256')
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return None
+
+
+def previous_source_digest():
+    """Digest of the workbook the current output was built from, if recorded."""
+    # Read only the head: source_sha256 is near the top in both layouts
+    try:
+        with open(OUTPUT_PATH, 'r', encoding='utf-8') as f:
+            head = f.read(1024)
+    except OSError:
+        return None
+    match = re.search(r'"source_sha256":\s*"([0-9a-f]{64})"', head)
+    return match.group(1) if match else None
+
+
+def check():
+    """Validate paths and dependencies without downloading anything."""
+    cli.run_checks([
+        (f"output dir: {OUTPUT_PATH.parent}", OUTPUT_PATH.parent.is_dir()),
+        ("pandas installed", cli.available("pandas")),
+        ("openpyxl installed", cli.available("openpyxl")),
+        (f"population tables: {POPULATION_DIR} (rate tables)", population_digest() is not None, False),
+        (f"accepted header: {SCHEMA_PATH}", SCHEMA_PATH.exists(), False),
+        (f"HTTP cache mode: {http.mode()}", True),
+    ])
+
+
+def main(input_path=None, force=False, stream=False, accept_schema=False):
+    # Download (or use a local workbook)
+    if input_path:
+        excel_path = str(input_path)
+    else:
+        with instrument.stage("download"):
+            excel_path = download_data()
+
+    try:
+        build_output(excel_path, force, stream, accept_schema)
+    finally:
+        if not input_path:
+            os.unlink(excel_path)
+
+
+def build_output(excel_path, force=False, stream=False, accept_schema=False):
+    """Build every MPV artifact; returns the record count, or None if skipped."""
+    source_digest = file_digest(excel_path)
+    source_unchanged = not force and source_digest == previous_source_digest()
+    if (source_unchanged and SPATIAL_PATH.exists()
+            and population_digest() == previous_rates_digest()):
+        print("Source workbook unchanged since last run — nothing to do.")
+        return None
+
+    updated = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+    from_store = source_unchanged and store.source_digest(MPV_TABLE.name, STORE_PATH) == source_digest
+    if not from_store:
+        # Reject a drifted or broken download before parsing it
+        with instrument.stage("schema"):
+            cols = resolve_columns(excel_path, accept_schema)
+        print(f"Resolved columns: {', '.join(f'{k}={v}' for k, v in cols.items() if v)}")
+
+    if from_store:
+        # Only derived artifacts are stale: rebuild them from the stored records
+        print(f"Source workbook unchanged; rebuilding derived tables from {STORE_PATH.name}")
+        records = store.read_rows(MPV_TABLE.name, AGGREGATE_FIELDS, STORE_PATH)
+    elif stream:
+        print(f"Streaming records to {OUTPUT_PATH} in {CHUNK_ROWS:,}-row chunks")
+        with (JSONStream(OUTPUT_PATH, ignore_keys=('updated',)) as out,
+              store.TableWriter(MPV_TABLE, source_digest, STORE_PATH) as table):
+            out.header({'source_sha256': source_digest, 'population': POPULATION})
+            out.begin_array('records')
+            records = stream_records(excel_path, out, table, cols)
+            out.trailer({'count': out.count, 'updated': updated})
+    else:
+        records = process_data(excel_path, cols)
+
+        # Build output
+        output = {
+            'updated': updated,
+            'source_sha256': source_digest,
+            'count': len(records),
+            'records': [public_record(r) for r in records],
+            'population': POPULATION,
+        }
+
+        # Write JSON (a new 'updated' timestamp alone is not a change)
+        print(f"Writing {len(records)} records to {OUTPUT_PATH}")
+        with instrument.stage("serialize_write", rows=len(records)):
+            write_json(OUTPUT_PATH, output, ignore_keys=('updated',))
+        with instrument.stage("store_load", rows=len(records)):
+            store.load_table(MPV_TABLE, records, source_digest, STORE_PATH)
+
+    with instrument.stage("spatial_index", rows=len(records)):
+        spatial_index = build_spatial_index(records, source_digest)
+        write_json(SPATIAL_PATH, spatial_index)
+
+    with instrument.stage("population_join"):
+        rates = build_rate_tables(records, source_digest)
+    if rates is None:
+        print(f"No population tables in {POPULATION_DIR}; skipping rate tables")
+    else:
+        write_json(RATES_PATH, rates)
+    report()
+
+    print("Done!")
+    return len(records)
 
 
 if __name__ == "__main__":
-    main()
+    parser = cli.make_parser("Build public/data/mpv-data.json from the MPV workbook.")
+    parser.add_argument("--input", type=Path, help="process a local workbook instead of downloading")
+    parser.add_argument("--force", action="store_true", help="reprocess even if the source is unchanged")
+    parser.add_argument("--stream", action="store_true", help="process and write in bounded-memory chunks")
+    parser.add_argument("--accept-schema", action="store_true",
+                        help="accept an upstream header change and record the new column mapping")
+    args = cli.parse_args(parser, "preprocess-mpv-data")
+    if args.check:
+        check()
+    try:
+        main(args.input, args.force, args.stream, args.accept_schema)
+    except schema.SchemaDrift as e:
+        sys.exit(f"ERROR: {e}")
+    instrument.finish()
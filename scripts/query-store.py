@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Run filtered aggregates against the local analytical store (data/db/analytics.db).
+
+The MPV and Killing Cascade scripts load their cleaned tables there on every
+run. Examples:
+
+    python scripts/query-store.py --tables
+    python scripts/query-store.py mpv --by year,race_clean --where state=CA --where "year>=2020"
+    python scripts/query-store.py mpv --by state --where race_clean=Black,White --limit 10
+    python scripts/query-store.py cascade --by county --mean predictedPFatal --where fatal=1
+    python scripts/query-store.py --sql "SELECT state, COUNT(*) FROM mpv GROUP BY state"
+
+Filters are COLUMN OP VALUE with OP one of = != > >= < <= ~ (LIKE); a
+comma-separated value with = matches any of them. Column names are checked
+against the table schema and values are bound as parameters; values for TEXT
+columns stay strings (so a county code or ZIP like 01234 keeps its zero).
+"""
+
+import json
+import re
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from pathlib import Path
+
+from lib import cli, store
+
+FILTER_PATTERN = re.compile(r"^\s*(\w+)\s*(>=|<=|!=|=|>|<|~)\s*(.*?)\s*$")
+SQL_OPS = {"=": "=", "!=": "!=", ">": ">", ">=": ">=", "<": "<", "<=": "<=", "~": "LIKE"}
+
+
+def parse_value(text: str, column_type: str = ""):
+    """Filter value as int/float where it parses, except for TEXT columns."""
+    if "TEXT" in column_type.upper() or "CHAR" in column_type.upper():
+        return text
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def table_columns(conn, table: str) -> dict[str, str]:
+    """Column name -> declared type, in table order."""
+    return {row["name"]: row["type"] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def build_query(table, columns, by=(), where=(), mean=(), total=(), limit=None):
+    """
+    Compose a parameterized GROUP BY query; raises ValueError on unknown columns.
+
+    ``columns`` maps column names to declared types (see table_columns).
+    """
+    def known(col):
+        if col not in columns:
+            raise ValueError(f"unknown column '{col}' in {table}; available: {', '.join(columns)}")
+        return col
+
+    select = [known(c) for c in by] + ["COUNT(*) AS n"]
+    select += [f"ROUND(AVG({known(c)}), 4) AS mean_{c}" for c in mean]
+    select += [f"SUM({known(c)}) AS sum_{c}" for c in total]
+
+    clauses, params = [], []
+    for expression in where:
+        match = FILTER_PATTERN.match(expression)
+        if not match:
+            raise ValueError(f"cannot parse filter '{expression}' (expected COLUMN OP VALUE)")
+        col, op, raw = match.groups()
+        column_type = columns[known(col)]
+        values = ([parse_value(v, column_type) for v in raw.split(",")] if op in ("=", "!=")
+                  else [parse_value(raw, column_type)])
+        if len(values) > 1:
+            negate = "NOT " if op == "!=" else ""
+            clauses.append(f"{known(col)} {negate}IN ({', '.join('?' * len(values))})")
+        else:
+            clauses.append(f"{known(col)} {SQL_OPS[op]} ?")
+        params.extend(values)
+
+    sql = f"SELECT {', '.join(select)} FROM {table}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    if by:
+        sql += f" GROUP BY {', '.join(by)} ORDER BY n DESC, {', '.join(by)}"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    return sql, params
+
+
+def print_rows(rows, as_json=False):
+    if as_json:
+        print(json.dumps([dict(r) for r in rows], indent=2))
+        return
+    if not rows:
+        print("(no rows)")
+        return
+    headers = list(rows[0].keys())
+    cells = [[("" if v is None else str(v)) for v in row] for row in rows]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for c in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(c, widths)))
+
+
+def list_tables(conn):
+    rows = conn.execute("SELECT name, rows, source_sha256, loaded_at FROM _tables ORDER BY name").fetchall()
+    for row in rows:
+        cols = table_columns(conn, row["name"])
+        print(f"{row['name']:10s} {row['rows']:>8,} rows  loaded {row['loaded_at']}  "
+              f"source {(row['source_sha256'] or '')[:12]}")
+        print(f"           columns: {', '.join(cols)}")
+    if not rows:
+        print("Store is empty; run the MPV or cascade scripts first.")
+
+
+def main():
+    parser = cli.make_parser(__doc__.splitlines()[1])
+    parser.add_argument("table", nargs="?", help="table to query (see --tables)")
+    parser.add_argument("--by", default="", help="comma-separated group-by columns")
+    parser.add_argument("--where", action="append", default=[], help="filter, e.g. year>=2020 (repeatable)")
+    parser.add_argument("--mean", action="append", default=[], help="column to average (repeatable)")
+    parser.add_argument("--sum", action="append", default=[], help="column to sum (repeatable)")
+    parser.add_argument("--limit", type=int, help="maximum rows returned")
+    parser.add_argument("--sql", help="run a raw read-only SQL statement instead")
+    parser.add_argument("--tables", action="store_true", help="list stored tables and their columns")
+    parser.add_argument("--json", action="store_true", help="print rows as JSON")
+    parser.add_argument("--explain", action="store_true", help="show the query plan")
+    parser.add_argument("--db", type=Path, default=store.DB_PATH, help="store path")
+    args = cli.parse_args(parser, "query-store")
+
+    if args.check:
+        cli.run_checks([(f"store: {args.db}", args.db.exists())])
+    if not args.db.exists():
+        sys.exit(f"No store at {args.db}; run preprocess-mpv-data.py or prepare-killing-cascade-data.py first.")
+
+    # Read-only: queries can never modify the store
+    conn = sqlite3.connect(f"file:{args.db.as_posix()}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    with closing(conn):
+        if args.tables:
+            list_tables(conn)
+            return
+        if args.sql:
+            sql, params = args.sql, []
+        elif args.table:
+            tables = [r["name"] for r in conn.execute("SELECT name FROM _tables")]
+            if args.table not in tables:
+                sys.exit(f"ERROR: unknown table '{args.table}'; available: {', '.join(tables)}")
+            by = [c for c in args.by.split(",") if c]
+            try:
+                sql, params = build_query(args.table, table_columns(conn, args.table), by,
+                                          args.where, args.mean, args.sum, args.limit)
+            except ValueError as e:
+                sys.exit(f"ERROR: {e}")
+        else:
+            parser.error("give a table, --sql or --tables")
+
+        if args.explain:
+            for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params):
+                print(f"plan: {row['detail']}")
+        start = time.perf_counter()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            sys.exit(f"ERROR: {e}")
+        elapsed = time.perf_counter() - start
+        print_rows(rows, args.json)
+        print(f"\n{len(rows)} row(s) in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the data pipeline scripts.
+
+Generates synthetic inputs (see lib/synthetic.py) at multiples of today's
+real sizes and times each pipeline stage on them. Every (stage, scale) case
+runs in a fresh process so peak RSS is attributable to that case alone.
+
+Results are written as JSON to data/benchmarks/<date>-<commit>.json so runs
+can be compared across commits:
+
+    python scripts/run-benchmarks.py                        # all stages, 1x 10x 100x
+    python scripts/run-benchmarks.py --stages mpv-process --scales 1,10
+    python scripts/run-benchmarks.py --compare data/benchmarks/old.json
+
+Note: at 100x the MPV input exceeds Excel's row limit, so it is written as CSV.
+
+The cascade-bootstrap-numpy case first checks lib/logit.py against
+statsmodels (coefficients, standard errors, pseudo-R²) on the synthetic
+cascade sample and records an error if they disagree; the -statsmodels case
+times the same bootstrap refits as a loop of reference fits.
+cascade-partitioned runs the cascade export on the same rows split into one
+CSV per year and fails if any part of model.json (row count, every
+coefficient, odds ratio and rate) differs from the single-file fit.
+
+Start-up cost is measured too: the wall time of each script's `--check` run
+and the import time of each heavy library, both in fresh interpreters.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from lib import synthetic
+from lib.paths import CACHE_DIR, REPO_ROOT
+
+RESULTS_DIR = REPO_ROOT / "data" / "benchmarks"
+INPUT_CACHE = CACHE_DIR / "bench-inputs"
+DEFAULT_SCALES = [1, 10, 100]
+
+STARTUP_SCRIPTS = [
+    "fetch-scholar-metrics", "update-publication-citations", "preprocess-mpv-data",
+    "prepare-killing-cascade-data", "migrate-content", "update-cv",
+]
+HEAVY_MODULES = ["pandas", "numpy", "statsmodels.api", "scholarly", "requests", "openpyxl"]
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    # VmHWM resets on exec; ru_maxrss on Linux survives it and would include
+    # whatever the parent process had touched
+    try:
+        with open("/proc/self/status", 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+# ── Stage definitions ───────────────────────────────────────────────────
+# setup(scale) runs in the parent and returns picklable args (usually a path
+# to cached synthetic input); run(args, workdir) runs in the child and returns
+# the number of units processed.
+
+def setup_mpv(scale):
+    rows = synthetic.MPV_ROWS * scale
+    stem = INPUT_CACHE / f"mpv-{rows}"
+    for suffix in (".xlsx", ".csv"):
+        if stem.with_suffix(suffix).exists():
+            return str(stem.with_suffix(suffix))
+    INPUT_CACHE.mkdir(parents=True, exist_ok=True)
+    return str(synthetic.mpv_workbook(stem, rows))
+
+
+def run_mpv_process(path, workdir):
+    from lib.scriptload import load_script
+    records = load_script("preprocess-mpv-data").process_data(path)
+    return len(records)
+
+
+def run_mpv_serialize(path, workdir):
+    from lib.output import dumps
+    from lib.scriptload import load_script
+    records = load_script("preprocess-mpv-data").process_data(path)
+    start = time.perf_counter()
+    payload = dumps({"count": len(records), "records": records})
+    (Path(workdir) / "mpv-data.json").write_text(payload, encoding='utf-8')
+    return len(records), time.perf_counter() - start
+
+
+def _mpv_build(path, workdir, stream):
+    from lib.scriptload import load_script
+    mpv = load_script("preprocess-mpv-data")
+    mpv.OUTPUT_PATH = Path(workdir) / "mpv-data.json"
+    mpv.SPATIAL_PATH = Path(workdir) / "mpv-spatial.json"
+    mpv.RATES_PATH = Path(workdir) / "mpv-rates.json"
+    mpv.STORE_PATH = Path(workdir) / "analytics.db"
+    mpv.SCHEMA_PATH = Path(workdir) / "mpv-schema.json"
+    return mpv.build_output(path, force=True, stream=stream)
+
+
+def run_mpv_build(path, workdir):
+    return _mpv_build(path, workdir, stream=False)
+
+
+def run_mpv_stream(path, workdir):
+    return _mpv_build(path, workdir, stream=True)
+
+
+def setup_ursus(scale):
+    rows = synthetic.URSUS_ROWS * scale
+    path = INPUT_CACHE / f"ursus-{rows}.csv"
+    if not path.exists():
+        INPUT_CACHE.mkdir(parents=True, exist_ok=True)
+        synthetic.ursus_csv(path, rows)
+    return str(path)
+
+
+def run_cascade_export(path, workdir):
+    from lib.scriptload import load_script
+    cascade = load_script("prepare-killing-cascade-data")
+    cascade.STORE_PATH = Path(workdir) / "analytics.db"
+    cascade.PARTITION_CACHE = Path(workdir) / "partitions"
+    cascade.main(ca_data=path, output_dir=Path(workdir))
+    import pandas as pd
+    return len(pd.read_csv(path, usecols=["fatal"]))
+
+
+def setup_ursus_partitions(scale):
+    """The synthetic cascade CSV plus the same rows split into one CSV per year."""
+    import pandas as pd
+    path = setup_ursus(scale)
+    parts = Path(path).with_name(Path(path).stem + "-parts")
+    if not parts.exists():
+        tmp = parts.with_name(parts.name + ".tmp")
+        tmp.mkdir(exist_ok=True)
+        for year, group in pd.read_csv(path).groupby("data_year"):
+            group.to_csv(tmp / f"CA-{year}.csv", index=False)
+        tmp.rename(parts)
+    return path, str(parts)
+
+
+def run_cascade_partitioned(args, workdir):
+    """Cold partitioned run; raises if model.json differs from the single-file model."""
+    import pandas as pd
+    from lib.scriptload import load_script
+    path, parts = args
+    cascade = load_script("prepare-killing-cascade-data")
+    cascade.STORE_PATH = Path(workdir) / "analytics.db"
+    cascade.PARTITION_CACHE = Path(workdir) / "partitions"
+    start = time.perf_counter()
+    # In-process: pool workers cannot re-import a script loaded by load_script
+    cascade.main(ca_data=parts, output_dir=Path(workdir), jobs=1)
+    elapsed = time.perf_counter() - start
+
+    reg_df = cascade.build_regression_sample(pd.read_csv(path))
+    reference = cascade.build_model_info(cascade.fit_model(reg_df), reg_df)
+    with open(Path(workdir) / "model.json", 'r', encoding='utf-8') as f:
+        model = json.load(f)
+    if model["n"] != len(reg_df):
+        raise AssertionError(f"partitioned sample has {model['n']} rows, single file {len(reg_df)}")
+    differs = [key for key in reference if model.get(key) != reference[key]]
+    if differs:
+        raise AssertionError(f"partitioned model differs from the single-file fit: {differs}")
+    return len(reg_df), elapsed
+
+
+BOOTSTRAP_REPLICATES = 200
+PARITY_TOL = 1e-6
+
+
+def _cascade_sample(path):
+    import pandas as pd
+    from lib.scriptload import load_script
+    cascade = load_script("prepare-killing-cascade-data")
+    reg_df = cascade.build_regression_sample(pd.read_csv(path))
+    return cascade.design_matrix(reg_df), reg_df["fatal"].to_numpy(dtype=float)
+
+
+def check_logit_parity(X, y):
+    """Raise if the NumPy engine disagrees with statsmodels on the cascade model."""
+    import numpy as np
+    import statsmodels.api as sm
+    from lib import logit
+
+    reference = sm.Logit(y, X).fit(disp=0)
+    ours = logit.fit(X, y)
+    diffs = {
+        "params": np.max(np.abs(np.array(list(ours.params.values())) - reference.params.to_numpy())),
+        "bse": np.max(np.abs(np.array(list(ours.bse.values())) - reference.bse.to_numpy())),
+        "prsquared": abs(ours.prsquared - reference.prsquared),
+    }
+    bad = {k: v for k, v in diffs.items() if v > PARITY_TOL}
+    if bad:
+        raise AssertionError(f"logit engine differs from statsmodels: {bad}")
+
+
+def run_cascade_bootstrap_numpy(path, workdir):
+    from lib import logit
+    X, y = _cascade_sample(path)
+    check_logit_parity(X, y)
+    start = time.perf_counter()
+    weights = logit.bootstrap_weights(len(y), BOOTSTRAP_REPLICATES)
+    logit.fit_batch(X.to_numpy(), y, weights)
+    return BOOTSTRAP_REPLICATES, time.perf_counter() - start
+
+
+def run_cascade_bootstrap_statsmodels(path, workdir):
+    import numpy as np
+    import statsmodels.api as sm
+    from lib import logit
+    X, y = _cascade_sample(path)
+    X = X.to_numpy()
+    start = time.perf_counter()
+    for w in logit.bootstrap_weights(len(y), BOOTSTRAP_REPLICATES):
+        rows = np.repeat(np.arange(len(y)), w.astype(int))
+        sm.Logit(y[rows], X[rows]).fit(disp=0)
+    return BOOTSTRAP_REPLICATES, time.perf_counter() - start
+
+
+def setup_posts(scale):
+    count = synthetic.PUBLICATIONS * scale
+    root = INPUT_CACHE / f"posts-{count}"
+    if not root.exists():
+        synthetic.hugo_posts(root, count)
+    return str(root)
+
+
+def run_migrate(root, workdir):
+    from lib.scriptload import load_script
+    migrate = load_script("migrate-content")
+    jobs = migrate.collect_sources(Path(root), Path(workdir))
+    migrate.run_migration(jobs, True, {})
+    return len(jobs)
+
+
+def setup_publications(scale):
+    count = synthetic.PUBLICATIONS * scale
+    root = INPUT_CACHE / f"publications-{count}"
+    if not root.exists():
+        synthetic.publication_tree(root, count)
+    return str(root)
+
+
+def run_citations_update(root, workdir):
+    import shutil
+    from lib.scriptload import load_script
+    citations = load_script("update-publication-citations")
+    dest = Path(workdir) / "publications"
+    shutil.copytree(root, dest)
+    citations.PUBLICATIONS_DIR = dest
+    pub_files = citations.collect_publication_files()
+    counts = {oa_id: 1000 + i for i, oa_id in enumerate(pub_files)}
+    citations.update_citation_lines(pub_files, counts)
+    return len(pub_files)
+
+
+BENCHMARKS = {
+    "mpv-process": (setup_mpv, run_mpv_process, "rows"),
+    "mpv-serialize": (setup_mpv, run_mpv_serialize, "rows"),
+    "mpv-build": (setup_mpv, run_mpv_build, "rows"),
+    "mpv-stream": (setup_mpv, run_mpv_stream, "rows"),
+    "cascade-export": (setup_ursus, run_cascade_export, "rows"),
+    "cascade-partitioned": (setup_ursus_partitions, run_cascade_partitioned, "samples"),
+    "cascade-bootstrap-numpy": (setup_ursus, run_cascade_bootstrap_numpy, "fits"),
+    "cascade-bootstrap-statsmodels": (setup_ursus, run_cascade_bootstrap_statsmodels, "fits"),
+    "migrate-transpile": (setup_posts, run_migrate, "files"),
+    "citations-update": (setup_publications, run_citations_update, "files"),
+}
+
+
+# ── Runner ──────────────────────────────────────────────────────────────
+
+def _child(name, args, conn):
+    """Run one benchmark case in a fresh process and send back measurements."""
+    import contextlib
+    import io
+
+    _, run, _ = BENCHMARKS[name]
+    baseline = peak_rss_mb()
+    try:
+        with tempfile.TemporaryDirectory() as workdir, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = run(args, workdir)
+            wall = time.perf_counter() - start
+        # A stage may report (units, seconds) to time only part of its work
+        units, timed = result if isinstance(result, tuple) else (result, wall)
+        conn.send({"units": units, "wall_s": timed, "total_s": wall,
+                   "baseline_rss_mb": baseline, "peak_rss_mb": peak_rss_mb()})
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_case(name, scale):
+    setup, _, unit = BENCHMARKS[name]
+    args = setup(scale)
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(name, args, child))
+    proc.start()
+    child.close()
+    result = parent.recv() if parent.poll(None) else {"error": "no result"}
+    proc.join()
+
+    result.update({"stage": name, "scale": scale, "unit": unit})
+    if "error" not in result and result["wall_s"] > 0:
+        result["throughput"] = result["units"] / result["wall_s"]
+    return result
+
+
+def _wall(cmd, repeat=3, ok_codes=(0,)):
+    """Best-of-N wall time of a subprocess, or None if it could not run."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(cmd, cwd=REPO_ROOT / "scripts", capture_output=True)
+        elapsed = time.perf_counter() - start
+        if result.returncode not in ok_codes:
+            return None
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_startup():
+    """Time `--check` runs and heavy-library imports in fresh interpreters."""
+    interpreter = _wall([sys.executable, "-c", "pass"])
+    results = []
+    for name in STARTUP_SCRIPTS:
+        # --check exits 1 when a local input is missing; that still measures start-up
+        wall = _wall([sys.executable, f"{name}.py", "--check"], ok_codes=(0, 1))
+        results.append({"kind": "script-check", "name": name, "wall_s": wall})
+        print(f"  startup {name + ' --check':40s} {wall:.3f}s" if wall is not None
+              else f"  startup {name} --check failed")
+    for module in HEAVY_MODULES:
+        wall = _wall([sys.executable, "-c", f"import {module}"])
+        import_s = wall - interpreter if wall is not None else None
+        results.append({"kind": "import", "name": module, "wall_s": import_s})
+        print(f"  import  {module:40s} {import_s:.3f}s" if import_s is not None
+              else f"  import  {module:40s} not installed")
+    return {"interpreter_s": interpreter, "results": results}
+
+
+def git_commit():
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                            capture_output=True, text=True)
+    return result.stdout.strip() or "unknown"
+
+
+def fmt_row(r):
+    if "error" in r:
+        return f"  {r['stage']:30s} {r['scale']:>4}x  ERROR {r['error']}"
+    rss = f"{r['peak_rss_mb']:8.1f} MB" if r.get("peak_rss_mb") is not None else "       n/a"
+    return (f"  {r['stage']:30s} {r['scale']:>4}x  {r['units']:>9,} {r['unit']:5s} "
+            f"{r['wall_s']:9.3f}s  {r['throughput']:>12,.0f} {r['unit']}/s  {rss}")
+
+
+def compare(current, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    base = {(r["stage"], r["scale"]): r for r in baseline["results"] if "error" not in r}
+    print(f"\nComparison against {baseline.get('commit')} ({baseline_path}):")
+    for r in current:
+        b = base.get((r["stage"], r["scale"]))
+        if b is None or "error" in r:
+            continue
+        ratio = r["wall_s"] / b["wall_s"] if b["wall_s"] else float("inf")
+        flag = "  <-- slower" if ratio > 1.10 else ""
+        print(f"  {r['stage']:30s} {r['scale']:>4}x  {b['wall_s']:8.3f}s -> {r['wall_s']:8.3f}s "
+              f"({ratio:5.2f}x){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data pipeline stages.")
+    parser.add_argument("--stages", default=",".join(BENCHMARKS), help="comma-separated stage names")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="comma-separated multiples of current data sizes")
+    parser.add_argument("--output", type=Path, help="results JSON path")
+    parser.add_argument("--compare", type=Path, help="previous results JSON to compare against")
+    parser.add_argument("--no-startup", action="store_true", help="skip start-up/import timings")
+    args = parser.parse_args()
+    # Benchmarks must be deterministic and offline; inherited by every case and --check run
+    os.environ.setdefault("HTTP_CACHE", "replay")
+
+    stages = [s for s in args.stages.split(",") if s]
+    unknown = [s for s in stages if s not in BENCHMARKS]
+    if unknown:
+        sys.exit(f"Unknown stage(s): {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}")
+    scales = [int(s) for s in args.scales.split(",") if s]
+
+    startup = None if args.no_startup else measure_startup()
+
+    results = []
+    for name in stages:
+        for scale in scales:
+            r = run_case(name, scale)
+            print(fmt_row(r), flush=True)
+            results.append(r)
+
+    commit = git_commit()
+    out = args.output or RESULTS_DIR / f"{datetime.now(timezone.utc):%Y%m%d-%H%M%S}-{commit}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "startup": startup,
+            "results": results,
+        }, f, indent=2)
+    print(f"\nSaved results to {out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
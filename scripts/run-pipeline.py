@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Unified data pipeline runner.
+
+Runs the existing utility scripts as stages of one dependency graph instead
+of relying on separate workflows and staggered cron offsets. Independent
+stages run in parallel, each in its own subprocess; stages whose declared inputs
+are unchanged since their last successful run are skipped; a per-stage timing
+report is printed (and appended to $GITHUB_STEP_SUMMARY when set).
+
+Usage:
+    python scripts/run-pipeline.py                  # run everything
+    python scripts/run-pipeline.py mpv cascade      # selected stages (+ their dependencies)
+    python scripts/run-pipeline.py --force --jobs 2
+    python scripts/run-pipeline.py --list
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from lib.pipeline import FAILED, Stage, run_stages, timing_report, write_step_summary
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+# Hugo sources live next to the repo, as in migrate-content.py (PROJECT_ROOT)
+HUGO_ROOT = SCRIPT_DIR.parent.parent
+
+# Same local drop as CA_DATA in prepare-killing-cascade-data.py
+CASCADE_INPUT = r"C:\Users\adams\dev\research\ca_doj_use_of_force\merged_paper\outputs\study2\california_analysis_ready.csv"
+
+
+def cv_sources() -> list[str]:
+    try:
+        with open(SCRIPT_DIR / "artifact-sync.json", 'r', encoding='utf-8') as f:
+            return [a["source"] for a in json.load(f).get("artifacts", [])][:1]
+    except (OSError, json.JSONDecodeError, KeyError):
+        return []
+
+
+STAGES = [
+    Stage(
+        name="migrate",
+        script="migrate-content.py",
+        inputs=[str(HUGO_ROOT / "content" / "**" / "*.md"), str(HUGO_ROOT / "static" / "**" / "*")],
+        requires=[str(HUGO_ROOT / "content")],
+    ),
+    Stage(
+        name="mpv",
+        script="preprocess-mpv-data.py",
+        outputs=["public/data/mpv-data.json", "public/data/mpv-spatial.json", "public/data/mpv-rates.json",
+                 "data/mpv-schema.json"],
+    ),
+    Stage(
+        name="cascade",
+        script="prepare-killing-cascade-data.py",
+        inputs=[CASCADE_INPUT],
+        outputs=["public/data/killing-cascade/cases.json", "public/data/killing-cascade/model.json",
+                 "public/data/killing-cascade/diagnostics.json"],
+        requires=[CASCADE_INPUT],
+    ),
+    Stage(
+        name="discover",
+        script="discover-publications.py",
+        outputs=["data/openalex-discovery.json"],
+        after=["migrate"],
+    ),
+    Stage(
+        name="news-partitions",
+        script="partition-news-feeds.py",
+        inputs=["public/data/ai-police-news.json", "public/data/k9-incidents.json"],
+        outputs=["public/data/news/ai-police-news/index.json", "public/data/news/k9-incidents/index.json"],
+    ),
+    Stage(
+        name="scholar-metrics",
+        script="fetch-scholar-metrics.py",
+        outputs=["public/data/scholar-metrics.json"],
+        after=["migrate"],
+    ),
+    Stage(
+        name="citations",
+        script="update-publication-citations.py",
+        after=["migrate", "discover"],
+    ),
+    Stage(
+        name="search-index",
+        script="build-search-index.py",
+        inputs=["src/content/publications/*.md"],
+        outputs=["public/data/publications-search.json"],
+        after=["migrate", "discover", "citations"],
+    ),
+    Stage(
+        name="related",
+        script="build-related-publications.py",
+        inputs=["src/content/publications/*.md"],
+        outputs=["src/data/related-publications.json"],
+        after=["migrate", "discover", "citations"],
+    ),
+    Stage(
+        name="cv-sync",
+        script="update-cv.py",
+        requires=cv_sources(),
+    ),
+]
+
+
+def select(names: list[str]) -> list[Stage]:
+    """Return the named stages plus everything they depend on, in declaration order."""
+    by_name = {s.name: s for s in STAGES}
+    unknown = [n for n in names if n not in by_name]
+    if unknown:
+        sys.exit(f"Unknown stage(s): {', '.join(unknown)}. Use --list to see stages.")
+    wanted = set()
+    todo = list(names)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(by_name[name].after)
+    return [s for s in STAGES if s.name in wanted]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the data pipeline stages.")
+    parser.add_argument("stages", nargs="*", help="stages to run (default: all)")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="stages run in parallel")
+    parser.add_argument("--force", action="store_true", help="ignore the unchanged-input cache")
+    parser.add_argument("--verbose", "-v", action="store_true", help="print each stage's output")
+    parser.add_argument("--list", action="store_true", help="list stages and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for s in STAGES:
+            deps = f" (after {', '.join(s.after)})" if s.after else ""
+            print(f"{s.name:16s} {s.script}{deps}")
+        return
+
+    stages = select(args.stages) if args.stages else STAGES
+    print(f"Running {len(stages)} stage(s): {', '.join(s.name for s in stages)}\n")
+
+    start = time.perf_counter()
+    results = run_stages(stages, jobs=args.jobs, force=args.force, verbose=args.verbose)
+    total = time.perf_counter() - start
+
+    table = timing_report(results, total)
+    print("\n" + table)
+    write_step_summary("## Data pipeline\n\n" + table)
+
+    if any(r.status == FAILED for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
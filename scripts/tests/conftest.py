@@ -0,0 +1,18 @@
+"""Shared fixtures: small synthetic inputs from lib.synthetic."""
+
+import pytest
+
+from lib import synthetic
+
+
+@pytest.fixture(scope="session")
+def cascade_sample(tmp_path_factory):
+    """(reg_df, X, y) for the cascade M5 model on a synthetic URSUS extract."""
+    import pandas as pd
+
+    from lib.scriptload import load_script
+
+    cascade = load_script("prepare-killing-cascade-data")
+    path = synthetic.ursus_csv(tmp_path_factory.mktemp("ursus") / "ursus.csv", 2_000)
+    reg_df = cascade.build_regression_sample(pd.read_csv(path))
+    return reg_df, cascade.design_matrix(reg_df), reg_df["fatal"].to_numpy(dtype=float)
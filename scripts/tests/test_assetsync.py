@@ -0,0 +1,64 @@
+"""lib.assetsync.sync_tree: incremental copies and manifest-scoped deletes."""
+
+import os
+
+from lib.assetsync import sync_tree
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+def test_only_synced_files_are_deleted(tmp_path):
+    src, dst = tmp_path / "static" / "data", tmp_path / "public" / "data"
+    write(src / "feed.json", "{}")
+    write(src / "old" / "nested" / "gone.json", "[]")
+    manifest = {}
+    sync_tree(src, dst, manifest)
+
+    # A generated feed written straight into public/data, never synced
+    foreign = write(dst / "ai-police-news.json", '{"stories": []}')
+    foreign_nested = write(dst / "news" / "k9-incidents" / "index.json", "{}")
+    (src / "old" / "nested" / "gone.json").unlink()
+
+    report = sync_tree(src, dst, manifest)
+    assert report.deleted == 1
+    assert not (dst / "old").exists()  # emptied directories are pruned
+    assert foreign.exists() and foreign_nested.exists()
+    assert (dst / "feed.json").exists()
+    assert set(manifest) == {"feed.json"}
+
+
+def test_prune_stops_at_non_empty_directories(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    write(src / "a" / "b" / "synced.txt", "x")
+    manifest = {}
+    sync_tree(src, dst, manifest)
+    keep = write(dst / "a" / "foreign.txt", "y")
+    (src / "a" / "b" / "synced.txt").unlink()
+
+    sync_tree(src, dst, manifest)
+    assert not (dst / "a" / "b").exists()
+    assert keep.exists()
+    assert dst.exists()
+
+
+def test_touched_but_identical_file_is_skipped(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    source = write(src / "cv.pdf", "same bytes")
+    manifest = {}
+    sync_tree(src, dst, manifest)
+    dst_mtime = (dst / "cv.pdf").stat().st_mtime_ns
+
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    report = sync_tree(src, dst, manifest)
+    assert (report.copied, report.skipped) == (0, 1)
+    assert (dst / "cv.pdf").stat().st_mtime_ns == dst_mtime
+    assert manifest["cv.pdf"]["mtime_ns"] == source.stat().st_mtime_ns
+
+    write(source, "new bytes!")
+    assert sync_tree(src, dst, manifest).copied == 1
+    assert (dst / "cv.pdf").read_text(encoding='utf-8') == "new bytes!"
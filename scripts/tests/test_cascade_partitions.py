@@ -0,0 +1,73 @@
+"""prepare-killing-cascade-data.py: per-partition sample cache."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from lib import synthetic
+from lib.scriptload import load_script
+
+cascade = load_script("prepare-killing-cascade-data")
+
+
+@pytest.fixture
+def partitions(tmp_path, monkeypatch):
+    """The synthetic extract split by year, with stems that prefix one another."""
+    monkeypatch.setattr(cascade, "PARTITION_CACHE", tmp_path / "cache")
+    source = synthetic.ursus_csv(tmp_path / "ursus.csv", 1_200)
+    df = pd.read_csv(source)
+    parts = tmp_path / "parts"
+    parts.mkdir()
+    years = sorted(df["data_year"].unique())
+    names = ["CA", "CA.2017", *[f"CA-{y}" for y in years[2:]]]
+    for name, year in zip(names, years):
+        df[df["data_year"] == year].to_csv(parts / f"{name}.csv", index=False)
+    return source, cascade.input_partitions(parts)
+
+
+def test_partitioned_sample_matches_single_file(partitions):
+    source, parts = partitions
+    combined, _ = cascade.load_partitions(parts, jobs=1)
+    single, _ = cascade.load_partitions([source], jobs=1)
+    key = ["data_year", "age_numeric", "fatal", "wound_count"]
+    pd.testing.assert_frame_equal(combined.sort_values(key, kind="mergesort").reset_index(drop=True),
+                                  single.sort_values(key, kind="mergesort").reset_index(drop=True))
+
+
+def test_changed_partition_only_replaces_its_own_cache(partitions):
+    _, parts = partitions
+    cascade.load_partitions(parts, jobs=1)
+    before = {p: sorted((cascade.PARTITION_CACHE / p.stem).glob("*.pkl")) for p in parts}
+
+    # Rewriting "CA" must not touch "CA.2017", whose name starts with the same stem
+    ca = parts[0]
+    ca.write_text(ca.read_text(encoding='utf-8') + ca.read_text(encoding='utf-8').splitlines()[1] + "\n",
+                  encoding='utf-8')
+    cascade.load_partitions(parts, jobs=1)
+    after = {p: sorted((cascade.PARTITION_CACHE / p.stem).glob("*.pkl")) for p in parts}
+
+    assert len(after[ca]) == 1 and after[ca] != before[ca]
+    assert all(after[p] == before[p] for p in parts[1:])
+
+
+def load_variant(tmp_path, name, text):
+    import importlib.util
+
+    path = tmp_path / f"{name}.py"
+    path.write_text(text, encoding='utf-8')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_sample_version_tracks_cleaning_code_only(tmp_path):
+    source = Path(cascade.__file__).read_text(encoding='utf-8')
+    commented = load_variant(tmp_path, "commented", source.replace(
+        "def build_cases(reg_df):", "# An unrelated comment\ndef build_cases(reg_df):"))
+    changed = load_variant(tmp_path, "changed", source.replace(
+        'reg_df["age_10yr"] = reg_df["age_numeric"] / 10', 'reg_df["age_10yr"] = reg_df["age_numeric"] / 5'))
+
+    assert commented.sample_version() == cascade.sample_version()
+    assert changed.sample_version() != cascade.sample_version()
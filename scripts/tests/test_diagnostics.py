@@ -0,0 +1,87 @@
+"""lib.diagnostics against direct per-threshold computations."""
+
+import numpy as np
+import pytest
+
+from lib import diagnostics
+from lib.output import write_json
+
+
+@pytest.fixture
+def scores():
+    rng = np.random.default_rng(0)
+    y = (rng.random(400) < 0.3).astype(float)
+    # Informative but noisy, rounded so that tied scores occur
+    p = np.clip(np.round(0.3 + 0.3 * (y - 0.3) + rng.normal(0, 0.2, 400), 2), 0, 1)
+    return y, p
+
+
+def test_auc_is_the_mann_whitney_statistic(scores):
+    y, p = scores
+    pos, neg = p[y == 1], p[y == 0]
+    diff = pos[:, None] - neg[None, :]
+    expected = np.mean((diff > 0) + 0.5 * (diff == 0))
+    _, tps, fps = diagnostics.cumulative_counts(y, p)
+    auc, _ = diagnostics.roc_curve(tps, fps)
+    assert auc == pytest.approx(expected, abs=1e-12)
+
+
+def test_average_precision_and_curves(scores):
+    y, p = scores
+    thresholds = np.unique(p)[::-1]
+    tp = np.array([np.sum((p >= t) & (y == 1)) for t in thresholds])
+    fp = np.array([np.sum((p >= t) & (y == 0)) for t in thresholds])
+    recall, precision = tp / tp[-1], tp / (tp + fp)
+    expected_ap = np.sum(np.diff(np.r_[0, recall]) * precision)
+
+    result = diagnostics.binary_diagnostics(y, p)
+    assert result["averagePrecision"] == round(expected_ap, 4)
+
+    fpr, tpr = np.r_[0, fp / fp[-1]], np.r_[0, tp / tp[-1]]
+    for g, value in zip(result["roc"]["fpr"], result["roc"]["tpr"]):
+        assert value == round(tpr[fpr <= g + 1e-12].max(), 4)
+    for r, value in zip(result["pr"]["recall"], result["pr"]["precision"]):
+        assert value == round(precision[recall >= r - 1e-12].max(), 4)
+
+
+def test_threshold_confusion_matches_loop(scores):
+    y, p = scores
+    confusion = diagnostics.threshold_confusion(y, p)
+    for i, t in enumerate(confusion["thresholds"]):
+        predicted = p >= t
+        assert confusion["tp"][i] == np.sum(predicted & (y == 1))
+        assert confusion["fp"][i] == np.sum(predicted & (y == 0))
+        assert confusion["tn"][i] == np.sum(~predicted & (y == 0))
+        assert confusion["fn"][i] == np.sum(~predicted & (y == 1))
+
+
+def test_calibration_bins(scores):
+    y, p = scores
+    bins = diagnostics.calibration(y, p)
+    assert sum(b["count"] for b in bins) == len(y)
+    for b in bins:
+        upper_ok = p < b["upper"] if b["upper"] < 1 else p <= 1
+        mask = (p >= b["lower"]) & upper_ok
+        assert b["count"] == mask.sum()
+        assert b["meanPredicted"] == round(p[mask].mean(), 4)
+        assert b["observedRate"] == round(y[mask].mean(), 4)
+
+
+def test_perfect_separation():
+    y = np.array([0, 0, 1, 1], dtype=float)
+    result = diagnostics.binary_diagnostics(y, np.array([0.1, 0.2, 0.8, 0.9]))
+    assert result["auc"] == 1.0 and result["averagePrecision"] == 1.0
+    assert result["brier"] == round(np.mean([0.01, 0.04, 0.04, 0.01]), 4)
+
+
+@pytest.mark.parametrize("label", [0.0, 1.0])
+def test_single_class_has_null_curves(label, tmp_path):
+    y = np.full(50, label)
+    p = np.linspace(0, 1, 50)
+    result = diagnostics.binary_diagnostics(y, p)
+    assert result["auc"] is None and result["averagePrecision"] is None
+    assert result["roc"] is None and result["pr"] is None
+    assert result["positives"] == int(label) * 50
+    assert sum(b["count"] for b in result["calibration"]) == 50
+    # Serializable under allow_nan=False
+    write_json(tmp_path / "diagnostics.json", result)
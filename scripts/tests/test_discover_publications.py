@@ -0,0 +1,54 @@
+"""discover-publications.py: first-run guard and duplicate detection."""
+
+import json
+
+import pytest
+
+from lib.scriptload import load_script
+
+discover = load_script("discover-publications")
+
+
+def work(oa_id, title, doi=None, type_="article"):
+    return {"id": f"https://openalex.org/{oa_id}", "display_name": title, "type": type_,
+            "doi": f"https://doi.org/{doi}" if doi else None, "publication_date": "2026-05-01",
+            "authorships": [], "cited_by_count": 0}
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    pubs = tmp_path / "publications"
+    pubs.mkdir()
+    (pubs / "W1.md").write_text(
+        "---\ntitle: '“That’s What the Money’s for”: Alienation and Emotional Labor'\n"
+        "links:\n- name: DOI\n  url: https://doi.org/10.1/abc\n---\n", encoding='utf-8')
+    monkeypatch.setattr(discover, "PUBLICATIONS_DIR", pubs)
+    monkeypatch.setattr(discover, "STATE_PATH", tmp_path / "state.json")
+    monkeypatch.setattr(discover, "resolve_author_id", lambda state: "A1")
+    works = []
+    monkeypatch.setattr(discover, "iter_works", lambda filter_expr: iter(works))
+    return pubs, works
+
+
+def test_first_run_records_state_without_stubs(site):
+    pubs, works = site
+    works.append(work("W2", "A new paper"))
+    discover.main()
+    assert json.loads(discover.STATE_PATH.read_text())["author_id"] == "A1"
+    assert sorted(p.name for p in pubs.iterdir()) == ["W1.md"]
+
+    discover.main()
+    assert (pubs / "W2.md").exists()
+
+
+def test_backfill_skips_known_dois_titles_and_skip_types(site):
+    pubs, works = site
+    works += [
+        work("W3", "Other title", doi="10.1/ABC"),
+        work("W4", "\"That's what the money's for\": alienation and emotional labor", type_="preprint"),
+        work("W5", "Front matter", type_="paratext"),
+        work("W6", "Brand New Study"),
+        work("W7", "Brand new study.", type_="preprint"),
+    ]
+    discover.main(backfill=True)
+    assert sorted(p.name for p in pubs.iterdir()) == ["W1.md", "W6.md"]
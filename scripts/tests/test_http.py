@@ -0,0 +1,61 @@
+"""lib.http: cache modes and size-bounded eviction, with the network faked."""
+
+import os
+
+import pytest
+
+from lib import http
+
+
+@pytest.fixture
+def fake_net(tmp_path, monkeypatch):
+    monkeypatch.setattr(http, "HTTP_CACHE_DIR", tmp_path / "http")
+    monkeypatch.setattr(http, "_cache_bytes", None)
+    monkeypatch.setenv("HTTP_CACHE", "off")  # restored after the test, set_mode() included
+    calls = []
+
+    def fetch(url, params, timeout):
+        calls.append(url)
+        return http.Response(url, 200, url.encode() * 100)
+
+    monkeypatch.setattr(http, "_fetch", fetch)
+    return calls
+
+
+def test_default_mode_is_off(fake_net, monkeypatch):
+    monkeypatch.delenv("HTTP_CACHE")
+    assert http.mode() == "off"
+    http.get("https://example.org/a")
+    http.get("https://example.org/a")
+    assert len(fake_net) == 2
+    assert not http.HTTP_CACHE_DIR.exists()
+
+
+def test_use_then_replay(fake_net):
+    http.set_mode("use")
+    first = http.get("https://example.org/a")
+    second = http.get("https://example.org/a")
+    assert len(fake_net) == 1 and second.from_cache and second.content == first.content
+
+    http.set_mode("replay")
+    assert http.get("https://example.org/a").from_cache
+    with pytest.raises(http.CacheMiss):
+        http.get("https://example.org/b")
+
+
+def test_eviction_keeps_recently_used(fake_net, monkeypatch):
+    http.set_mode("use")
+    urls = [f"https://example.org/{i}" for i in range(5)]
+    for i, url in enumerate(urls):
+        http.get(url)
+        # Distinct, increasing "last used" times without sleeping
+        os.utime(http._paths(http.cache_key("GET", url, None))[1], (i, i))
+    http.get(urls[0])  # a hit refreshes the oldest entry
+
+    entry = len(urls[0]) * 100
+    monkeypatch.setenv("HTTP_CACHE_MAX_MB", str(4.5 * entry / 1024 / 1024))
+    http.get("https://example.org/new")
+
+    cached = [u for u in urls if http._load(http.cache_key("GET", u, None))]
+    assert urls[0] in cached and urls[1] not in cached
+    assert http._cache_bytes <= 4.5 * entry
@@ -0,0 +1,54 @@
+"""lib.logit against statsmodels.Logit, the reference implementation."""
+
+import numpy as np
+import pytest
+
+from lib import logit
+
+sm = pytest.importorskip("statsmodels.api")
+
+TOL = 1e-6
+
+
+def assert_matches(params, bse, prsquared, reference):
+    np.testing.assert_allclose(params, reference.params, atol=TOL)
+    np.testing.assert_allclose(bse, reference.bse, atol=TOL)
+    assert abs(prsquared - reference.prsquared) < TOL
+
+
+def test_single_fit_matches_statsmodels(cascade_sample):
+    _, X, y = cascade_sample
+    ours = logit.fit(X, y)
+    reference = sm.Logit(y, X).fit(disp=0)
+    assert ours.converged
+    assert ours.names == list(X.columns)
+    assert_matches(list(ours.params.values()), list(ours.bse.values()), ours.prsquared, reference)
+    np.testing.assert_allclose(ours.predict(X), reference.predict(X), atol=TOL)
+
+
+def test_bootstrap_batch_matches_refits(cascade_sample):
+    _, X, y = cascade_sample
+    X = X.to_numpy()
+    weights = logit.bootstrap_weights(len(y), 4, seed=1)
+    batch = logit.fit_batch(X, y, weights)
+    assert len(batch) == 4 and batch.converged.all()
+    for b, w in enumerate(weights):
+        rows = np.repeat(np.arange(len(y)), w.astype(int))
+        reference = sm.Logit(y[rows], X[rows]).fit(disp=0)
+        assert_matches(batch.params[b], batch.bse[b], batch.prsquared[b], reference)
+        assert batch.nobs[b] == len(rows)
+
+
+def test_singular_replicate_fails_alone(cascade_sample):
+    _, X, y = cascade_sample
+    X = X.to_numpy()
+    weights = logit.bootstrap_weights(len(y), 3, seed=2)
+    # Replicate 1 drops every row where the first covariate is set: a zero column
+    weights[1, X[:, 1] != 0] = 0
+    batch = logit.fit_batch(X, y, weights)
+
+    assert not batch.converged[1]
+    assert np.isnan(batch.params[1]).all() and np.isnan(batch.bse[1]).all()
+    assert batch.converged[[0, 2]].all()
+    single = logit.fit_batch(X, y, weights[[0, 2]])
+    np.testing.assert_allclose(batch.params[[0, 2]], single.params)
@@ -0,0 +1,62 @@
+"""lib.output: change detection for write_json() and JSONStream."""
+
+import json
+
+from lib import output
+from lib.output import JSONStream, UNCHANGED, WRITTEN, write_json
+
+
+def stream(path, records, updated):
+    with JSONStream(path, ignore_keys=('updated',)) as out:
+        out.header({'source': 'test'})
+        out.begin_array('records')
+        out.extend(records)
+        out.trailer({'count': len(records), 'updated': updated})
+
+
+def test_write_json_skips_identical_content(tmp_path):
+    path = tmp_path / "a.json"
+    assert write_json(path, {"a": 1, "b": [1, 2]})
+    mtime = path.stat().st_mtime_ns
+    assert not write_json(path, {"a": 1, "b": [1, 2]})
+    assert output.STATS[path] == UNCHANGED
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_write_json_ignore_keys(tmp_path):
+    path = tmp_path / "metrics.json"
+    write_json(path, {"total": 3, "updated": "2026-01-01"}, ignore_keys=("updated",))
+    assert not write_json(path, {"total": 3, "updated": "2026-02-01"}, ignore_keys=("updated",))
+    # The old timestamp is kept when nothing else changed
+    assert json.loads(path.read_text())["updated"] == "2026-01-01"
+
+    assert write_json(path, {"total": 4, "updated": "2026-02-01"}, ignore_keys=("updated",))
+    assert output.STATS[path] == WRITTEN
+    assert json.loads(path.read_text()) == {"total": 4, "updated": "2026-02-01"}
+
+
+def test_write_json_key_order_alone_is_not_a_change(tmp_path):
+    path = tmp_path / "order.json"
+    write_json(path, {"a": 1, "b": {"x": 1, "y": 2}})
+    before = path.read_bytes()
+    assert not write_json(path, {"b": {"y": 2, "x": 1}, "a": 1})
+    assert path.read_bytes() == before
+    assert write_json(path, {"b": {"y": 3, "x": 1}, "a": 1})
+
+
+def test_stream_new_trailer_timestamp_is_unchanged(tmp_path):
+    path = tmp_path / "data.json"
+    records = [{"id": i, "name": f"r{i}"} for i in range(5)]
+    stream(path, records, "2026-01-01T00:00:00Z")
+    before = path.read_bytes()
+    assert json.loads(before)["count"] == 5
+
+    stream(path, records, "2026-03-01T00:00:00Z")
+    assert output.STATS[path] == UNCHANGED
+    assert path.read_bytes() == before
+    assert not list(tmp_path.glob(".*.tmp"))
+
+    stream(path, records[:4], "2026-03-01T00:00:00Z")
+    assert output.STATS[path] == WRITTEN
+    assert json.loads(path.read_text()) == {
+        "source": "test", "records": records[:4], "count": 4, "updated": "2026-03-01T00:00:00Z"}
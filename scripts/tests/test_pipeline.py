@@ -0,0 +1,88 @@
+"""lib.pipeline.run_stages: skip and re-run on fingerprint changes."""
+
+import pytest
+
+from lib import pipeline
+from lib.pipeline import FAILED, OK, UNCHANGED, Stage, run_stages
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    scripts = tmp_path / "scripts"
+    scripts.mkdir()
+    # Appends one line per run so tests can count executions
+    (scripts / "count.py").write_text(
+        "import sys\n"
+        "with open(sys.argv[1], 'a') as f:\n"
+        "    f.write('run\\n')\n", encoding='utf-8')
+    (scripts / "fail.py").write_text("raise SystemExit('boom')\n", encoding='utf-8')
+    monkeypatch.setattr(pipeline, "SCRIPTS_DIR", scripts)
+    monkeypatch.setattr(pipeline, "STATE_PATH", tmp_path / "state.json")
+
+    data = tmp_path / "data"
+    (data / "raw" / "nested").mkdir(parents=True)
+    (data / "input.csv").write_text("a,b\n1,2\n", encoding='utf-8')
+    (data / "raw" / "nested" / "part.csv").write_text("x\n1\n", encoding='utf-8')
+    return tmp_path
+
+
+def stage(tmp_path, **kwargs):
+    log = tmp_path / "runs.log"
+    return Stage("count", "count.py", args=[str(log)], outputs=[str(log)], **kwargs)
+
+
+def runs(tmp_path):
+    return (tmp_path / "runs.log").read_text().count("run")
+
+
+def statuses(stages):
+    return [r.status for r in run_stages(stages, jobs=1)]
+
+
+def test_unchanged_inputs_skip_and_changes_rerun(workspace):
+    s = stage(workspace, inputs=[str(workspace / "data" / "input.csv"), str(workspace / "data" / "raw")])
+    assert statuses([s]) == [OK]
+    assert statuses([s]) == [UNCHANGED]
+    assert runs(workspace) == 1
+
+    (workspace / "data" / "input.csv").write_text("a,b\n1,3\n", encoding='utf-8')
+    assert statuses([s]) == [OK]
+    assert statuses([s]) == [UNCHANGED]
+
+    # A file deep inside a directory input counts too
+    (workspace / "data" / "raw" / "nested" / "part.csv").write_text("x\n2\n", encoding='utf-8')
+    assert statuses([s]) == [OK]
+    (workspace / "data" / "raw" / "nested" / "new.csv").write_text("y\n", encoding='utf-8')
+    assert statuses([s]) == [OK]
+    assert runs(workspace) == 4
+
+
+def test_script_change_missing_output_and_force_rerun(workspace):
+    s = stage(workspace, inputs=[str(workspace / "data" / "*.csv")])
+    assert statuses([s]) == [OK]
+
+    script = workspace / "scripts" / "count.py"
+    script.write_text(script.read_text() + "# edited\n", encoding='utf-8')
+    assert statuses([s]) == [OK]
+
+    (workspace / "runs.log").unlink()
+    assert statuses([s]) == [OK]
+    assert [r.status for r in run_stages([s], jobs=1, force=True)] == [OK]
+    assert runs(workspace) == 2
+
+
+def test_stages_without_inputs_always_run(workspace):
+    s = stage(workspace)
+    statuses([s])
+    statuses([s])
+    assert runs(workspace) == 2
+
+
+def test_failures_block_dependents_and_are_not_recorded(workspace):
+    bad = Stage("bad", "fail.py", inputs=[str(workspace / "data" / "input.csv")])
+    s = stage(workspace, inputs=[str(workspace / "data" / "input.csv")], after=["bad"])
+    results = run_stages([bad, s], jobs=1)
+    assert [r.status for r in results] == [FAILED, pipeline.BLOCKED]
+    assert "boom" in results[0].detail
+    assert "bad" not in pipeline.load_state()
+    assert statuses([bad]) == [FAILED]
@@ -0,0 +1,61 @@
+"""preprocess-mpv-data.py: --stream must produce exactly what the in-memory path does."""
+
+import json
+
+import pytest
+
+from lib import store, synthetic
+from lib.scriptload import load_script
+
+mpv = load_script("preprocess-mpv-data")
+
+ROWS = 700
+
+
+@pytest.fixture(scope="module")
+def workbook(tmp_path_factory):
+    return synthetic.mpv_workbook(tmp_path_factory.mktemp("mpv") / "mpv", ROWS)
+
+
+def build(workbook, out_dir, monkeypatch, stream):
+    population = out_dir / "population"
+    population.mkdir(parents=True)
+    (population / "states.csv").write_text(
+        "state,year,race,population\n"
+        + "".join(f"{s},{y},All,{1_000_000 + y}\n" for s in synthetic.STATES for y in range(2013, 2026)),
+        encoding='utf-8')
+    for name, filename in (("OUTPUT_PATH", "mpv-data.json"), ("SPATIAL_PATH", "mpv-spatial.json"),
+                           ("RATES_PATH", "mpv-rates.json"), ("STORE_PATH", "analytics.db"),
+                           ("SCHEMA_PATH", "mpv-schema.json")):
+        monkeypatch.setattr(mpv, name, out_dir / filename)
+    monkeypatch.setattr(mpv, "POPULATION_DIR", population)
+    # Several chunks, the last one partial
+    monkeypatch.setattr(mpv, "CHUNK_ROWS", 256)
+    assert mpv.build_output(str(workbook), force=True, stream=stream) > 0
+    return out_dir
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_stream_matches_in_memory(workbook, tmp_path, monkeypatch):
+    memory = build(workbook, tmp_path / "memory", monkeypatch, stream=False)
+    streamed = build(workbook, tmp_path / "stream", monkeypatch, stream=True)
+
+    data, data_streamed = load(memory / "mpv-data.json"), load(streamed / "mpv-data.json")
+    data.pop("updated"), data_streamed.pop("updated")
+    assert data_streamed == data
+    assert data["count"] == len(data["records"]) > 0
+    # County is queryable in the store but not published
+    assert not any("county" in r for r in data["records"])
+
+    assert load(memory / "mpv-rates.json")["states"]
+    for name in ("mpv-spatial.json", "mpv-rates.json", "mpv-schema.json"):
+        assert (streamed / name).read_bytes() == (memory / name).read_bytes(), name
+
+    columns = list(mpv.MPV_TABLE.columns)
+    rows = store.read_rows("mpv", columns, memory / "analytics.db")
+    assert store.read_rows("mpv", columns, streamed / "analytics.db") == rows
+    assert any(r["county"] for r in rows)
@@ -0,0 +1,76 @@
+"""query-store.py: filter parsing and query composition against a small store."""
+
+from contextlib import closing
+
+import pytest
+
+from lib import store
+from lib.scriptload import load_script
+
+query = load_script("query-store")
+
+TABLE = store.Table(
+    name="incidents",
+    columns={"year": "INTEGER", "state": "TEXT", "zip": "TEXT", "score": "REAL"},
+    indexes=["year"],
+)
+ROWS = [
+    {"year": 2020, "state": "CA", "zip": "01234", "score": 0.5},
+    {"year": 2021, "state": "CA", "zip": "90001", "score": 1.5},
+    {"year": 2021, "state": "NY", "zip": "01234", "score": 2.0},
+    {"year": 2022, "state": "TX", "zip": "75001", "score": None},
+]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    path = tmp_path / "analytics.db"
+    store.load_table(TABLE, ROWS, "digest", path)
+    with closing(store.connect(path)) as conn:
+        yield conn
+
+
+def run(conn, **kwargs):
+    sql, params = query.build_query(TABLE.name, query.table_columns(conn, TABLE.name), **kwargs)
+    return [dict(r) for r in conn.execute(sql, params)]
+
+
+def test_parse_value_respects_column_type():
+    assert query.parse_value("2020", "INTEGER") == 2020
+    assert query.parse_value("0.25", "REAL") == 0.25
+    assert query.parse_value("CA", "INTEGER") == "CA"
+    assert query.parse_value("01234", "TEXT") == "01234"
+    assert query.parse_value("1e3", "TEXT") == "1e3"
+
+
+def test_table_columns_reports_declared_types(conn):
+    assert query.table_columns(conn, TABLE.name) == TABLE.columns
+
+
+def test_text_filters_keep_leading_zeros(conn):
+    assert run(conn, by=["state"], where=["zip=01234"]) == [
+        {"state": "CA", "n": 1}, {"state": "NY", "n": 1}]
+    assert run(conn, where=["zip!=01234,90001"]) == [{"n": 1}]
+
+
+def test_grouping_filters_and_aggregates(conn):
+    rows = run(conn, by=["year"], where=["year>=2021", "state=CA,NY"], mean=["score"], total=["score"])
+    assert rows == [{"year": 2021, "n": 2, "mean_score": 1.75, "sum_score": 3.5}]
+    assert run(conn, by=["state"], limit=1) == [{"state": "CA", "n": 2}]
+    assert run(conn, where=["state~%A"]) == [{"n": 2}]
+
+
+def test_values_are_bound_as_parameters():
+    sql, params = query.build_query("incidents", TABLE.columns, where=["state=CA' OR '1'='1"])
+    assert "CA" not in sql
+    assert params == ["CA' OR '1'='1"]
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"by": ["county"]}, "unknown column 'county'"),
+    ({"where": ["county=x"]}, "unknown column 'county'"),
+    ({"where": ["year 2020"]}, "cannot parse filter"),
+])
+def test_invalid_queries_raise(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        query.build_query("incidents", TABLE.columns, **kwargs)
@@ -0,0 +1,69 @@
+"""build-related-publications.py: top_neighbours on a fixed tiny corpus."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+
+from lib.scriptload import load_script  # noqa: E402
+
+related = load_script("build-related-publications")
+
+
+def doc(doc_id, **tf):
+    return {"id": doc_id, "tf": tf}
+
+
+# 0-2 are identical (exact ties), 3 shares one term with them, 4 shares nothing
+CORPUS = [
+    doc("W0", police=2, camera=1),
+    doc("W1", police=2, camera=1),
+    doc("W2", police=2, camera=1),
+    doc("W3", camera=1, burnout=3),
+    doc("W4", canine=1),
+]
+
+
+@pytest.fixture
+def matrix():
+    return related.tfidf_matrix(CORPUS)
+
+
+def test_rows_are_unit_length(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    assert norms == pytest.approx(np.ones(len(CORPUS)))
+
+
+def test_self_is_never_a_neighbour(matrix):
+    neighbours = related.top_neighbours(matrix, k=10, min_similarity=0.0)
+    for i, row in enumerate(neighbours):
+        assert i not in row
+
+
+def test_k_larger_than_row_nonzeros(matrix):
+    neighbours = related.top_neighbours(matrix, k=10, min_similarity=0.0)
+    assert neighbours[3] == [0, 1, 2]
+    assert neighbours[4] == []
+
+
+def test_ties_order_by_row_index_and_k_truncates(matrix):
+    neighbours = related.top_neighbours(matrix, k=2, min_similarity=0.0)
+    assert neighbours[0] == [1, 2]
+    assert neighbours[1] == [0, 2]
+    assert neighbours[2] == [0, 1]
+    # Identical documents outrank the partial match
+    assert related.top_neighbours(matrix, k=3, min_similarity=0.0)[0] == [1, 2, 3]
+
+
+def test_min_similarity_drops_weak_links(matrix):
+    similarity = (matrix @ matrix.T).toarray()
+    cutoff = (similarity[0, 3] + 1.0) / 2
+    neighbours = related.top_neighbours(matrix, k=10, min_similarity=cutoff)
+    assert neighbours[0] == [1, 2]
+    assert neighbours[3] == []
+
+
+def test_build_related_maps_ids():
+    files = {f"{d['id']}.md": d for d in reversed(CORPUS)}
+    assert related.build_related(files)["W4"] == []
+    assert related.build_related(files)["W0"][:2] == ["W1", "W2"]
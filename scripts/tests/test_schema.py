@@ -0,0 +1,87 @@
+"""lib.schema.resolve_cached: baseline recording and header drift handling."""
+
+import json
+
+import pytest
+
+from lib import schema
+from lib.schema import Field, Schema, SchemaDrift, resolve_cached
+
+SCHEMA = Schema([
+    Field('date', (schema.token('date'),), required=True),
+    Field('race', (schema.contains('race', 'victim'), schema.token('race')), required=True),
+    Field('city', (schema.exact('city'),)),
+    Field('county', (schema.exact('county'),)),
+])
+HEADER = ['victim_name', 'date_of_incident', 'victim_race', 'city', 'county', 'zipcode']
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    path = tmp_path / "schema.json"
+    resolve_cached(SCHEMA, HEADER, path)
+    return path
+
+
+def state(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_first_run_records_the_baseline(tmp_path, capsys):
+    path = tmp_path / "schema.json"
+    mapping = resolve_cached(SCHEMA, HEADER, path)
+    assert mapping == {'date': 'date_of_incident', 'race': 'victim_race', 'city': 'city', 'county': 'county'}
+    assert "recording the current one as the baseline" in capsys.readouterr().out
+    assert state(path)["header"] == HEADER
+    assert state(path)["columns"] == mapping
+
+
+def test_unchanged_header_uses_the_accepted_mapping(state_path, monkeypatch):
+    monkeypatch.setattr(Schema, "resolve", lambda self, columns: pytest.fail("re-resolved"))
+    assert resolve_cached(SCHEMA, HEADER, state_path)["race"] == 'victim_race'
+
+
+def test_renamed_mapped_column_is_drift(state_path):
+    renamed = [c if c != 'victim_race' else 'race_of_victim' for c in HEADER]
+    with pytest.raises(SchemaDrift, match=r"field 'race' moved: 'victim_race' -> 'race_of_victim'") as e:
+        resolve_cached(SCHEMA, renamed, state_path)
+    assert "--accept-schema" in str(e.value)
+    # Nothing recorded until accepted
+    assert state(state_path)["header"] == HEADER
+
+
+def test_dropped_optional_column_is_drift(state_path):
+    dropped = [c for c in HEADER if c != 'county']
+    with pytest.raises(SchemaDrift, match=r"field 'county' no longer resolves \(was 'county'\)"):
+        resolve_cached(SCHEMA, dropped, state_path)
+
+
+def test_added_unmapped_column_is_accepted(state_path, capsys):
+    added = HEADER + ['notes']
+    mapping = resolve_cached(SCHEMA, added, state_path)
+    assert mapping == state(state_path)["columns"]
+    assert state(state_path)["header"] == added
+    assert "added columns:   notes" in capsys.readouterr().out
+
+
+def test_newly_resolving_field_is_accepted(tmp_path):
+    path = tmp_path / "schema.json"
+    resolve_cached(SCHEMA, [c for c in HEADER if c != 'city'], path)
+    assert resolve_cached(SCHEMA, HEADER, path)["city"] == 'city'
+
+
+def test_accept_records_the_new_mapping(state_path):
+    renamed = [c if c != 'victim_race' else 'race_of_victim' for c in HEADER if c != 'county']
+    mapping = resolve_cached(SCHEMA, renamed, state_path, accept=True)
+    assert mapping['race'] == 'race_of_victim' and mapping['county'] is None
+    assert state(state_path)["header"] == renamed
+    # The accepted header is now the baseline
+    assert resolve_cached(SCHEMA, renamed, state_path) == mapping
+
+
+def test_missing_required_field_fails_even_when_accepted(state_path):
+    header = [c for c in HEADER if c != 'date_of_incident']
+    with pytest.raises(SchemaDrift, match="required fields not found: date") as e:
+        resolve_cached(SCHEMA, header, state_path, accept=True)
+    assert "--accept-schema" not in str(e.value)
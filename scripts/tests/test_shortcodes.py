@@ -0,0 +1,75 @@
+"""lib.shortcodes: the single-pass transpiler against the old regex replacements."""
+
+import re
+
+import pytest
+
+from lib.shortcodes import TRANSPILER_VERSION, parse_args, transpile, transpile_file
+
+
+def legacy_replace(content: str) -> str:
+    """The regex chain migrate-content.py used before the transpiler."""
+    content = re.sub(r'\{\{<\s*icon[^>]*>\s*\}\}', '', content)
+    content = re.sub(
+        r'\{\{<\s*staticref\s+"([^"]+)"\s*(?:"[^"]+")?\s*>\s*\}\}([^{]*)\{\{<\s*/staticref\s*>\s*\}\}',
+        r'[\2](/\1)',
+        content
+    )
+    content = re.sub(r'\{\{<\s*figure\s+src="([^"]+)"[^>]*>\s*\}\}', r'![](\1)', content)
+    return content
+
+
+@pytest.mark.parametrize("content", [
+    'Download {{< icon name="download" pack="fas" >}} here.',
+    '{{< staticref "uploads/cv.pdf" "newtab" >}}my CV{{< /staticref >}}',
+    '{{< staticref "media/a.pdf" >}}A{{< /staticref >}} and {{< staticref "media/b.pdf" >}}B{{< /staticref >}}',
+    '{{< figure src="featured.png" caption="A caption" >}}',
+    '{{<figure src="x.jpg">}}\n\nText after.',
+    'No shortcodes at all.\n',
+])
+def test_matches_legacy_regexes(content):
+    assert transpile(content) == legacy_replace(content)
+
+
+def test_nested_paired_shortcodes_see_transpiled_inner():
+    content = '{{< staticref "cv.pdf" >}}{{< icon name="download" >}}CV{{< /staticref >}}'
+    assert transpile(content) == "[CV](/cv.pdf)"
+
+
+def test_callout_becomes_blockquote():
+    content = "{{< callout note >}}\nFirst line\n\nSecond line\n{{< /callout >}}"
+    assert transpile(content) == "> First line\n>\n> Second line"
+
+
+def test_youtube_positional_and_keyword():
+    url = "[Watch on YouTube](https://www.youtube.com/watch?v=abc123)"
+    assert transpile('{{< youtube abc123 >}}') == url
+    assert transpile('{{< youtube id="abc123" >}}') == url
+
+
+def test_unknown_and_unbalanced_shortcodes_are_kept():
+    for content in ('{{< gallery album="x" >}}',
+                    '{{< staticref "a.pdf" >}}never closed',
+                    'stray {{< /staticref >}} close'):
+        assert transpile(content) == content
+
+
+def test_parse_args():
+    assert parse_args(' "uploads/cv.pdf" "newtab" ') == (["uploads/cv.pdf", "newtab"], {})
+    assert parse_args(' src="a b.png" caption="x" ') == ([], {"src": "a b.png", "caption": "x"})
+    # Unbalanced quotes fall back to whitespace splitting
+    assert parse_args(' "broken ') == (['"broken'], {})
+
+
+def test_transpile_file_skips_unchanged(tmp_path):
+    src, dest = tmp_path / "post.md", tmp_path / "out.md"
+    src.write_text('{{< figure src="a.png" >}}', encoding='utf-8')
+
+    entry = transpile_file(str(src), str(dest), True, None)
+    assert entry["version"] == TRANSPILER_VERSION
+    assert dest.read_text(encoding='utf-8') == "![](a.png)"
+    assert transpile_file(str(src), str(dest), True, entry) is None
+
+    # Copy-only migrations record version 0, so switching modes rewrites the file
+    assert transpile_file(str(src), str(dest), False, entry)["version"] == 0
+    assert dest.read_text(encoding='utf-8') == '{{< figure src="a.png" >}}'
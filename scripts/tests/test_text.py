@@ -0,0 +1,43 @@
+"""lib.text tokenize/stem on fixed cases shared with the browser tokenizer.
+
+tokenizer-cases.json is also checked against src/components/publications/bm25.ts
+by scripts/check-tokenizer.ts (npm run test:tokenizer); edit the cases, both
+implementations and TEXT_VERSION together.
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from lib.paths import REPO_ROOT
+from lib.text import TEXT_VERSION, stem, tokenize
+
+CASES_PATH = Path(__file__).with_name("tokenizer-cases.json")
+
+with open(CASES_PATH, 'r', encoding='utf-8') as f:
+    CASES = json.load(f)
+
+
+def test_cases_match_text_version():
+    assert CASES["version"] == TEXT_VERSION
+
+
+@pytest.mark.parametrize("case", CASES["tokenize"], ids=lambda c: c["text"][:30] or "empty")
+def test_tokenize(case):
+    assert tokenize(case["text"]) == case["tokens"]
+
+
+@pytest.mark.parametrize("word, expected", CASES["stem"].items())
+def test_stem(word, expected):
+    assert stem(word) == expected
+
+
+@pytest.mark.skipif(not (REPO_ROOT / "node_modules" / ".bin" / "tsx").exists() or not shutil.which("node"),
+                    reason="tsx not installed (npm install)")
+def test_browser_tokenizer_matches():
+    result = subprocess.run([str(REPO_ROOT / "node_modules" / ".bin" / "tsx"), "scripts/check-tokenizer.ts"],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
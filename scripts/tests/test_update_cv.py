@@ -0,0 +1,72 @@
+"""update-cv.py: change detection against the last pushed digest."""
+
+import pytest
+
+from lib.scriptload import load_script
+
+update_cv = load_script("update-cv")
+
+
+@pytest.fixture
+def sync(tmp_path, monkeypatch):
+    """A CV artifact in tmp_path and a fake push that can be made to fail."""
+    monkeypatch.setattr(update_cv, "STATE_PATH", tmp_path / "state.json")
+    pushes = []
+    outcome = {"ok": True}
+
+    def fake_push(paths, message):
+        pushes.append(message)
+        return outcome["ok"]
+
+    monkeypatch.setattr(update_cv, "commit_and_push", fake_push)
+    source = tmp_path / "cv.pdf"
+    source.write_bytes(b"v1")
+    artifact = update_cv.Artifact(source, tmp_path / "repo" / "public" / "media" / "cv.pdf")
+    monkeypatch.setattr(update_cv.Artifact, "key", property(lambda self: "public/media/cv.pdf"))
+    return artifact, pushes, outcome
+
+
+def test_failed_push_is_retried_even_when_dest_matches(sync):
+    artifact, pushes, outcome = sync
+    outcome["ok"] = False
+    assert not update_cv.sync_once([artifact], update_cv.load_state())
+    assert artifact.dest.read_bytes() == b"v1"
+
+    # Fresh process, pending list lost: the copied file must still count as changed
+    state = update_cv.load_state()
+    state["pending"] = []
+    outcome["ok"] = True
+    assert update_cv.sync_once([artifact], state)
+    assert len(pushes) == 2
+
+    state = update_cv.load_state()
+    assert state["pending"] == []
+    assert state["files"]["public/media/cv.pdf"]["sha256"] == update_cv.file_digest(artifact.source)
+
+
+def test_unchanged_source_skips_git(sync):
+    artifact, pushes, _ = sync
+    update_cv.sync_once([artifact], update_cv.load_state())
+    update_cv.sync_once([artifact], update_cv.load_state())
+    assert len(pushes) == 1
+
+
+def test_legacy_state_is_migrated(sync, tmp_path, monkeypatch):
+    artifact, pushes, _ = sync
+    update_cv.sync_once([artifact], update_cv.load_state())
+    pushed = update_cv.load_state()["files"]["public/media/cv.pdf"]
+
+    # Only the old single-CV state file exists: nothing to push
+    legacy = tmp_path / "cv-sync.json"
+    update_cv.STATE_PATH.rename(legacy)
+    legacy.write_text(update_cv.json.dumps(pushed), encoding='utf-8')
+    monkeypatch.setattr(update_cv, "LEGACY_STATE_PATH", legacy)
+    assert update_cv.sync_once([artifact], update_cv.load_state())
+    assert len(pushes) == 1
+
+
+def test_dest_outside_repo_is_rejected(tmp_path):
+    config = tmp_path / "artifact-sync.json"
+    config.write_text('{"artifacts": [{"source": "cv.pdf", "dest": "../cv.pdf"}]}', encoding='utf-8')
+    with pytest.raises(ValueError, match="outside the repository"):
+        update_cv.load_config(config)
@@ -1,57 +1,318 @@
 """
-Auto-update CV PDF in the website repo from local Google Drive source.
-Copies the file, commits, and pushes only if the PDF has actually changed.
+Auto-update the CV PDF (and other local artifacts) in the website repo.
+Copies changed files, commits, and pushes only if something actually changed.
 
-Run manually:   python scripts/update-cv.py
+The set of synced artifacts lives in scripts/artifact-sync.json. Each entry
+maps a local source file or directory to a destination inside the repo:
+
+    {"source": "G:\\...\\cv.pdf",   "dest": "public/media/cv.pdf"}
+    {"source": "D:\\papers\\pdfs", "dest": "public/pdfs"}
+
+Change detection happens before the working tree or git is touched: a file
+source is compared (stat first, then a streaming SHA-256) against the digest
+of the last pushed copy cached in data/cache/, which is only updated after a
+successful push; a directory source is mirrored
+through lib.assetsync. An unchanged run costs stat calls and no subprocesses.
+
+Run once:       python scripts/update-cv.py
+Run as service: python scripts/update-cv.py --watch
 Schedule via:   Windows Task Scheduler (see repo README or CLAUDE.md)
+
+In --watch mode the script stays resident and listens for filesystem
+notifications (watchdog, if installed; stat polling otherwise). Bursts of
+changes are debounced and coalesced into a single commit-and-push.
 """
 
+import json
 import shutil
-import subprocess
 import sys
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
-REPO_ROOT = Path(__file__).resolve().parent.parent
-CV_SOURCE = Path(r"G:\Other computers\My Computer\R\CV-stuff\(new) CV Academic and Website\cv.pdf")
-CV_DEST = REPO_ROOT / "public" / "media" / "cv.pdf"
+from lib import cli
+from lib.assetsync import sync_tree
+from lib.digest import file_digest
+from lib.gitops import commit_and_push
+from lib.output import atomic_replace, dumps
+from lib.paths import CACHE_DIR, REPO_ROOT
 
+CONFIG_PATH = Path(__file__).resolve().parent / "artifact-sync.json"
+STATE_PATH = CACHE_DIR / "artifact-sync-state.json"
+# Written by the single-CV version of this script: {"sha256", "size", "mtime_ns"}
+LEGACY_STATE_PATH = CACHE_DIR / "cv-sync.json"
+LEGACY_KEY = "public/media/cv.pdf"
 
-def run(cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
-    return subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True, **kwargs)
 
+@dataclass
+class Artifact:
+    source: Path
+    dest: Path
+
+    @property
+    def key(self) -> str:
+        return self.dest.relative_to(REPO_ROOT).as_posix()
+
+
+def load_config(path: Path = CONFIG_PATH) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    artifacts = []
+    for a in config.get("artifacts", []):
+        dest = (REPO_ROOT / a["dest"]).resolve()
+        if not dest.is_relative_to(REPO_ROOT):
+            raise ValueError(f"{path}: dest {a['dest']!r} is outside the repository")
+        artifacts.append(Artifact(Path(a["source"]), dest))
+    config["artifacts"] = artifacts
+    return config
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def load_state() -> dict:
+    state = _read_json(STATE_PATH)
+    if not state:
+        # First run after the move to multiple artifacts: keep the CV's pushed digest
+        legacy = _read_json(LEGACY_STATE_PATH)
+        if legacy.get("sha256"):
+            state = {"files": {LEGACY_KEY: legacy}}
+    state.setdefault("files", {})
+    state.setdefault("dirs", {})
+    state.setdefault("pending", [])
+    return state
+
+
+def save_state(state: dict) -> None:
+    atomic_replace(STATE_PATH, dumps(state, indent=2).encode('utf-8'))
+
+
+def sync_file(artifact: Artifact, state: dict, pushed: dict) -> bool:
+    """
+    Copy a single-file artifact if it differs from the last pushed copy.
+
+    Only the digest recorded after a successful push counts: a destination
+    that already matches the source (copied by a run whose commit or push
+    failed) is still reported as changed. The new digest goes into pushed,
+    which the caller records once the push succeeds.
+    """
+    entry = state["files"].get(artifact.key, {})
+    retry = artifact.key in state["pending"]
+    st = artifact.source.stat()
+    if (not retry
+            and entry.get("size") == st.st_size
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and artifact.dest.exists()):
+        return False
+
+    digest = file_digest(artifact.source)
+    record = {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if not retry and digest == entry.get("sha256") and artifact.dest.exists():
+        # Same content as pushed, only touched: refresh the stat fast path
+        state["files"][artifact.key] = record
+        return False
+
+    if not (artifact.dest.exists()
+            and artifact.dest.stat().st_size == st.st_size
+            and file_digest(artifact.dest) == digest):
+        artifact.dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(artifact.source, artifact.dest)
+        print(f"Copied {artifact.source.name} -> {artifact.key}")
+    pushed[artifact.key] = record
+    return True
+
+
+def sync_dir(artifact: Artifact, state: dict) -> bool:
+    """Mirror a directory artifact; True if anything was copied or deleted."""
+    report = sync_tree(artifact.source, artifact.dest, state["dirs"].setdefault(artifact.key, {}))
+    if report.copied or report.deleted:
+        print(f"Synced {artifact.key}: {report.summary()}")
+        return True
+    return False
 
-def main():
-    if not CV_SOURCE.exists():
-        print(f"ERROR: CV source not found: {CV_SOURCE}")
-        print("Is Google Drive mounted?")
-        sys.exit(1)
 
-    # Copy the file
-    shutil.copy2(CV_SOURCE, CV_DEST)
-    print(f"Copied {CV_SOURCE.name} -> {CV_DEST.relative_to(REPO_ROOT)}")
+def sync_once(artifacts: list[Artifact], state: dict) -> bool:
+    """Sync every available artifact and push anything pending. False on failure."""
+    pending = set(state["pending"])
+    pushed = {}
+    ok = True
+    for artifact in artifacts:
+        if not artifact.source.exists():
+            print(f"ERROR: source not found: {artifact.source}")
+            print("Is Google Drive mounted?")
+            ok = False
+            continue
+        changed = (sync_dir(artifact, state) if artifact.source.is_dir()
+                   else sync_file(artifact, state, pushed))
+        if changed:
+            pending.add(artifact.key)
 
-    # Check if anything actually changed
-    result = run(["git", "diff", "--quiet", "--", str(CV_DEST.relative_to(REPO_ROOT))])
-    if result.returncode == 0:
-        print("CV unchanged — nothing to commit.")
-        return
+    # Persist before git so a failed push is retried on the next pass
+    state["pending"] = sorted(pending)
+    save_state(state)
+    if not pending:
+        return ok
 
-    # Stage, commit, push
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    run(["git", "add", str(CV_DEST.relative_to(REPO_ROOT))])
-    commit_msg = f"Update CV PDF ({timestamp})"
-    result = run(["git", "commit", "-m", commit_msg])
-    if result.returncode != 0:
-        print(f"Commit failed:\n{result.stderr}")
-        sys.exit(1)
-    print(f"Committed: {commit_msg}")
+    names = [Path(key).name for key in state["pending"]]
+    if names == ["cv.pdf"]:
+        message = f"Update CV PDF ({timestamp})"
+    else:
+        message = f"Update site artifacts: {', '.join(names)} ({timestamp})"
+
+    if not commit_and_push([REPO_ROOT / key for key in state["pending"]], message):
+        return False
+    state["files"].update(pushed)
+    state["pending"] = []
+    save_state(state)
+    return ok
+
+
+class ChangeMonitor:
+    """Collects change notifications and reports when a burst has settled."""
+
+    def __init__(self, artifacts: list[Artifact], debounce: float, max_delay: float, poll: float):
+        self.artifacts = artifacts
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll = poll
+        self._lock = threading.Lock()
+        self._first_event = None
+        self._last_event = None
+        self._observer = None
+        self._signature = self._stat_signature()
+
+    def notify(self, path: str = "") -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._first_event is None:
+                self._first_event = now
+            self._last_event = now
+
+    def start(self) -> None:
+        if not cli.available("watchdog"):
+            print(f"watchdog not installed; polling every {self.poll:.0f}s")
+            return
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        monitor = self
+        sources = [a.source for a in self.artifacts]
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # Atomic-rename saves (editors, OneDrive) land on dest_path
+                for raw in (event.src_path, getattr(event, "dest_path", "")):
+                    path = Path(raw) if raw else None
+                    if path and any(path == s or s in path.parents for s in sources):
+                        monitor.notify(raw)
+                        return
+
+        self._observer = Observer()
+        watched = set()
+        for artifact in self.artifacts:
+            is_dir = artifact.source.is_dir()
+            target = artifact.source if is_dir else artifact.source.parent
+            if target.exists() and (target, is_dir) not in watched:
+                self._observer.schedule(Handler(), str(target), recursive=is_dir)
+                watched.add((target, is_dir))
+        self._observer.start()
+        print(f"Watching {len(watched)} location(s) for changes")
+
+    def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+
+    def _stat_signature(self) -> tuple:
+        sig = []
+        for artifact in self.artifacts:
+            src = artifact.source
+            paths = sorted(src.rglob("*")) if src.is_dir() else [src]
+            for p in paths:
+                try:
+                    st = p.stat()
+                    sig.append((str(p), st.st_size, st.st_mtime_ns))
+                except OSError:
+                    sig.append((str(p), None, None))
+        return tuple(sig)
+
+    def wait_for_burst(self) -> None:
+        """Block until changes arrive and have been quiet for the debounce window."""
+        while True:
+            time.sleep(1 if self._observer else self.poll)
+            if self._observer is None:
+                signature = self._stat_signature()
+                if signature != self._signature:
+                    self._signature = signature
+                    self.notify()
+
+            with self._lock:
+                if self._first_event is None:
+                    continue
+                now = time.monotonic()
+                settled = now - self._last_event >= self.debounce
+                overdue = now - self._first_event >= self.max_delay
+                if settled or overdue:
+                    self._first_event = self._last_event = None
+                    return
+
+
+def watch(config: dict, state: dict) -> None:
+    artifacts = config["artifacts"]
+    monitor = ChangeMonitor(
+        artifacts,
+        debounce=config.get("debounce_seconds", 30),
+        max_delay=config.get("max_delay_seconds", 300),
+        poll=config.get("poll_seconds", 10),
+    )
+    monitor.start()
+    try:
+        while True:
+            monitor.wait_for_burst()
+            start = time.perf_counter()
+            sync_once(artifacts, state)
+            print(f"Sync pass finished in {time.perf_counter() - start:.2f}s")
+    except KeyboardInterrupt:
+        print("Stopping watcher.")
+    finally:
+        monitor.stop()
+
+
+def main():
+    parser = cli.make_parser(__doc__.splitlines()[1])
+    parser.add_argument("--watch", action="store_true", help="run as a long-lived sync service")
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH, help="artifact config JSON")
+    args = cli.parse_args(parser, "update-cv")
+
+    try:
+        config = load_config(args.config)
+    except ValueError as e:
+        sys.exit(f"ERROR: {e}")
+    if args.check:
+        cli.run_checks(
+            [(f"source: {a.source}", a.source.exists()) for a in config["artifacts"]]
+            + [("watchdog installed (--watch notifications)", cli.available("watchdog"), False)]
+        )
+    state = load_state()
+
+    # Always start with one full pass so changes made while stopped are picked up
+    start = time.perf_counter()
+    ok = sync_once(config["artifacts"], state)
+    if not state["pending"]:
+        print(f"Artifacts up to date. ({time.perf_counter() - start:.2f}s)")
 
-    result = run(["git", "push"])
-    if result.returncode != 0:
-        print(f"Push failed:\n{result.stderr}")
+    if args.watch:
+        watch(config, state)
+    elif not ok:
         sys.exit(1)
-    print("Pushed to origin.")
 
 
 if __name__ == "__main__":
@@ -9,17 +9,13 @@ Update per-publication citation counts using OpenAlex (primary) and Google Schol
 """
 
 import re
-import sys
 import time
 import unicodedata
 from datetime import datetime, timezone
 from pathlib import Path
 
-try:
-    import requests
-except ImportError:
-    print("ERROR: requests not installed. Run: pip install requests")
-    sys.exit(1)
+from lib import cli, http, instrument
+from lib.output import report, write_text
 
 SCRIPT_DIR = Path(__file__).parent
 PUBLICATIONS_DIR = SCRIPT_DIR.parent / "src" / "content" / "publications"
@@ -53,10 +49,13 @@ def fetch_openalex_citations(oa_ids):
         }
         print(f"  OpenAlex batch {batch_num}/{len(batches)} ({len(batch)} IDs)...")
 
+        from_cache = False
         try:
-            resp = requests.get(OPENALEX_API, params=params, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
+            with instrument.stage("http_batch", source="openalex", batch=batch_num):
+                resp = http.get(OPENALEX_API, params=params, timeout=30)
+                from_cache = resp.from_cache
+                resp.raise_for_status()
+                data = resp.json()
 
             for work in data.get("results", []):
                 # Extract ID like "W2774954674" from "https://openalex.org/W2774954674"
@@ -68,8 +67,8 @@ def fetch_openalex_citations(oa_ids):
         except Exception as e:
             print(f"    WARNING: OpenAlex batch {batch_num} failed: {e}")
 
-        # Be polite to the API
-        if batch_num < len(batches):
+        # Be polite to the API (cached responses never reached it)
+        if batch_num < len(batches) and not from_cache:
             time.sleep(1)
 
     return counts
@@ -98,6 +97,9 @@ def read_title_from_file(path):
 
 def fetch_scholar_citations(pub_files, openalex_counts):
     """Fallback: fetch citation counts from Google Scholar for pubs with 0 or missing OpenAlex counts."""
+    if http.offline():
+        print("  HTTP replay mode: skipping Scholar fallback (not cacheable)")
+        return {}
     try:
         from scholarly import scholarly, ProxyGenerator
     except ImportError:
@@ -176,13 +178,24 @@ def update_citation_lines(pub_files, citation_counts):
             continue
 
         new_text = text.replace(old_line, new_line, 1)
-        path.write_text(new_text, encoding="utf-8")
+        write_text(path, new_text)
         updated += 1
         print(f"  Updated {oa_id}: {old_line} -> {new_line}")
 
     return updated, skipped
 
 
+def check():
+    """Validate paths and dependencies without fetching anything."""
+    cli.run_checks([
+        (f"publications dir: {PUBLICATIONS_DIR} ({len(collect_publication_files())} W*.md files)",
+         PUBLICATIONS_DIR.is_dir()),
+        ("requests installed (urllib is used otherwise)", cli.available("requests"), False),
+        (f"HTTP cache mode: {http.mode()}", True),
+        ("scholarly installed (Scholar fallback)", cli.available("scholarly"), False),
+    ])
+
+
 def main():
     print("=" * 60)
     print("Per-Publication Citation Update")
@@ -205,7 +218,8 @@ def main():
 
     # Step 3: Scholar fallback for pubs OpenAlex missed or returned 0
     print("\nStep 2: Google Scholar fallback...")
-    scholar_counts = fetch_scholar_citations(pub_files, openalex_counts)
+    with instrument.stage("scholar_fallback"):
+        scholar_counts = fetch_scholar_citations(pub_files, openalex_counts)
 
     # Step 4: Merge — take the higher count from either source
     merged = dict(openalex_counts)
@@ -216,7 +230,8 @@ def main():
 
     # Step 5: Update files
     print(f"\nStep 3: Updating publication files...")
-    updated, skipped = update_citation_lines(pub_files, merged)
+    with instrument.stage("write", files=len(pub_files)):
+        updated, skipped = update_citation_lines(pub_files, merged)
 
     # Summary
     print(f"\n{'=' * 60}")
@@ -226,4 +241,10 @@ def main():
 
 
 if __name__ == "__main__":
+    args = cli.parse_args(cli.make_parser("Update per-publication citation counts."),
+                          "update-publication-citations")
+    if args.check:
+        check()
     main()
+    report()
+    instrument.finish()
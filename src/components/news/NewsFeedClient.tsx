@@ -7,7 +7,7 @@ interface NewsStory {
   source: string;
   date: string;
   date_discovered: string;
-  summary: string;
+  summary?: string; // dropped by partition-news-feeds.py when it only repeats title/source
   story_type?: string;
   relevance_score?: number;
   key_entities?: string;
@@ -22,6 +22,28 @@ interface NewsFeed {
   stories: NewsStory[];
 }
 
+// Partitioned feed written by scripts/partition-news-feeds.py
+interface FeedManifest {
+  updated: string;
+  count: number;
+  tags: string[];
+  latest: { file: string; count: number };
+  partitions: { key: string; file: string; count: number }[];
+}
+
+interface LoadedFeed extends NewsFeed {
+  tags?: string[];
+  archives?: string[]; // archive URLs not loaded yet (all or nothing)
+}
+
+const dirOf = (url: string) => url.slice(0, url.lastIndexOf('/') + 1);
+
+async function fetchJson<T>(url: string): Promise<T> {
+  const response = await fetch(url);
+  if (!response.ok) throw new Error('Failed to fetch feed');
+  return response.json();
+}
+
 interface NewsFeedClientProps {
   feedUrl: string;
   title: string;
@@ -30,8 +52,9 @@ interface NewsFeedClientProps {
 }
 
 export default function NewsFeedClient({ feedUrl, title, description, accentColor = 'primary' }: NewsFeedClientProps) {
-  const [feed, setFeed] = useState<NewsFeed | null>(null);
+  const [feed, setFeed] = useState<LoadedFeed | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingArchives, setLoadingArchives] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [searchQuery, setSearchQuery] = useState('');
   const [selectedTag, setSelectedTag] = useState<string | null>(null);
@@ -41,10 +64,22 @@ export default function NewsFeedClient({ feedUrl, title, description, accentColo
   useEffect(() => {
     async function fetchFeed() {
       try {
-        const response = await fetch(feedUrl);
-        if (!response.ok) throw new Error('Failed to fetch feed');
-        const data = await response.json();
-        setFeed(data);
+        const data = await fetchJson<NewsFeed | FeedManifest>(feedUrl);
+        if ('partitions' in data) {
+          // Manifest: show the latest page now, keep the archives for later
+          const base = dirOf(feedUrl);
+          const latest = await fetchJson<{ stories: NewsStory[] }>(base + data.latest.file);
+          const complete = data.latest.count >= data.count;
+          setFeed({
+            updated: data.updated,
+            count: data.count,
+            tags: data.tags,
+            stories: latest.stories,
+            archives: complete ? undefined : data.partitions.map((p) => base + p.file),
+          });
+        } else {
+          setFeed(data);
+        }
       } catch (err) {
         setError(err instanceof Error ? err.message : 'An error occurred');
       } finally {
@@ -57,6 +92,7 @@ export default function NewsFeedClient({ feedUrl, title, description, accentColo
   // Get unique tags from all stories
   const allTags = useMemo(() => {
     if (!feed) return [];
+    if (feed.tags) return feed.tags;
     const tagSet = new Set<string>();
     feed.stories.forEach((story) => {
       story.tags?.forEach((tag) => tagSet.add(tag));
@@ -83,7 +119,28 @@ export default function NewsFeedClient({ feedUrl, title, description, accentColo
     return filteredStories.slice(startIndex, startIndex + itemsPerPage);
   }, [filteredStories, currentPage]);
 
-  const totalPages = Math.ceil(filteredStories.length / itemsPerPage);
+  // Until the archives are in, unfiltered paging counts every story in the feed
+  const filtering = searchQuery !== '' || selectedTag !== null;
+  const totalStories = feed && feed.archives && !filtering ? feed.count : filteredStories.length;
+  const totalPages = Math.ceil(totalStories / itemsPerPage);
+
+  // Load the archives once the reader searches, filters or pages past the latest stories
+  const archives = feed?.archives;
+  const needArchives = !!archives && (filtering || currentPage * itemsPerPage > (feed?.stories.length ?? 0));
+  useEffect(() => {
+    if (!needArchives || !archives || loadingArchives || error) return;
+    setLoadingArchives(true);
+    Promise.all(archives.map((url) => fetchJson<{ stories: NewsStory[] }>(url)))
+      .then((parts) => {
+        setFeed((current) => current && {
+          ...current,
+          stories: parts.flatMap((part) => part.stories),
+          archives: undefined,
+        });
+      })
+      .catch((err) => setError(err instanceof Error ? err.message : 'An error occurred'))
+      .finally(() => setLoadingArchives(false));
+  }, [needArchives, archives, loadingArchives, error]);
 
   // Reset page when filters change
   useEffect(() => {
@@ -221,7 +278,9 @@ export default function NewsFeedClient({ feedUrl, title, description, accentColo
 
       {/* Results count */}
       <p className="text-sm text-gray-500 dark:text-gray-400 mb-4">
-        Showing {paginatedStories.length} of {filteredStories.length} stories
+        {needArchives
+          ? 'Loading archive...'
+          : `Showing ${paginatedStories.length} of ${totalStories} stories`}
       </p>
 
       {/* Stories grid */}
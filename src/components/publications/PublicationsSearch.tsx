@@ -1,4 +1,6 @@
-import { useState, useMemo } from 'react';
+import { useState, useMemo, useEffect } from 'react';
+import { loadIndex, search as searchIndex } from './bm25';
+import type { SearchIndex } from './bm25';
 
 interface Publication {
   slug: string;
@@ -23,6 +25,20 @@ export default function PublicationsSearch({ publications, onCountChange }: Prop
   const [search, setSearch] = useState('');
   const [yearFilter, setYearFilter] = useState<string>('all');
   const [viewMode, setViewMode] = useState<'publications' | 'preprints'>('publications');
+  const [index, setIndex] = useState<SearchIndex | null>(null);
+
+  // Load the prebuilt BM25 index on first search; without it, matching falls back to substrings
+  useEffect(() => {
+    if (search !== '' && !index) {
+      loadIndex().then(setIndex);
+    }
+  }, [search, index]);
+
+  // Relevance scores by slug (abstracts are indexed, so this also finds full-text matches)
+  const scores = useMemo(
+    () => (index && search !== '' ? searchIndex(index, search) : new Map<string, number>()),
+    [index, search]
+  );
 
   // Separate publications and preprints
   const { pubs, preprints } = useMemo(() => {
@@ -49,20 +65,26 @@ export default function PublicationsSearch({ publications, onCountChange }: Prop
         pub.authors.some(a => a.toLowerCase().includes(searchLower)) ||
         pub.publication?.toLowerCase().includes(searchLower) ||
         pub.summary?.toLowerCase().includes(searchLower) ||
-        pub.year.toString().includes(searchLower);
+        pub.year.toString().includes(searchLower) ||
+        scores.has(pub.slug);
 
       const matchesYear = yearFilter === 'all' || pub.year.toString() === yearFilter;
 
       return matchesSearch && matchesYear;
     });
 
+    // Most relevant first; the sort is stable, so unscored matches keep their order
+    if (scores.size > 0) {
+      result.sort((a, b) => (scores.get(b.slug) ?? 0) - (scores.get(a.slug) ?? 0));
+    }
+
     // Notify parent of count change
     if (onCountChange) {
       onCountChange(result.length);
     }
 
     return result;
-  }, [baseData, search, yearFilter, onCountChange]);
+  }, [baseData, search, yearFilter, scores, onCountChange]);
 
   // Group filtered results by year
   const groupedByYear = useMemo(() => {
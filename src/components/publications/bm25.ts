@@ -0,0 +1,115 @@
+/**
+ * Client-side BM25 scoring over the prebuilt publications index
+ * (public/data/publications-search.json, built by scripts/build-search-index.py).
+ *
+ * tokenize() mirrors scripts/lib/text.py exactly — same stopwords, suffix rules
+ * and accent folding — so query terms line up with indexed terms. Change both
+ * together and bump TEXT_VERSION; `npm run test:tokenizer` checks this file
+ * against the shared cases in scripts/tests/tokenizer-cases.json.
+ */
+
+export const TEXT_VERSION = 1;
+export const INDEX_URL = '/data/publications-search.json';
+
+export interface SearchIndex {
+  version: number;
+  k1: number;
+  b: number;
+  docs: string[];
+  lengths: number[];
+  avgdl: number;
+  terms: Record<string, number[]>;
+}
+
+const STOPWORDS = new Set(`
+a about after all also an and any are as at be been being between both but by can could did do
+does during each for from had has have how if in into is it its may more most no not of on or
+other our over such than that the their them then there these they this those through to under
+was we were what when where which while who will with within would you your
+`.split(/\s+/).filter(Boolean));
+
+const SUFFIX_RULES: [string, string][] = [
+  ['ational', 'ate'], ['ization', 'ize'], ['ations', 'ate'], ['ation', 'ate'],
+  ['nesses', ''], ['ness', ''], ['ments', ''], ['ment', ''], ['ities', ''], ['ity', ''],
+  ['ings', ''], ['ing', ''], ['ies', 'y'], ['ied', 'y'], ['ers', ''], ['er', ''],
+  ['ed', ''], ['ly', ''], ['s', ''],
+];
+const KEEP_ENDINGS = ['ss', 'us', 'is'];
+
+export function stem(word: string): string {
+  if (word.length <= 3 || /^\d+$/.test(word)) return word;
+  if (!KEEP_ENDINGS.some(e => word.endsWith(e))) {
+    for (const [suffix, replacement] of SUFFIX_RULES) {
+      if (word.endsWith(suffix) && word.length - suffix.length >= 3) {
+        word = word.slice(0, -suffix.length) + replacement;
+        break;
+      }
+    }
+  }
+  if (word.endsWith('e') && word.length > 4) word = word.slice(0, -1);
+  return word;
+}
+
+export function tokenize(text: string): string[] {
+  const folded = (text || '')
+    .replace(/<[^>]+>/g, ' ')
+    .normalize('NFKD')
+    .replace(/[^\x00-\x7f]/g, '')
+    .toLowerCase();
+  return (folded.match(/[a-z0-9]+/g) || [])
+    .filter(t => t.length > 1 && !STOPWORDS.has(t))
+    .map(stem);
+}
+
+let pending: Promise<SearchIndex | null> | null = null;
+
+/** Fetch the index once; resolves to null if it is missing or from another tokenizer version. */
+export function loadIndex(): Promise<SearchIndex | null> {
+  if (!pending) {
+    pending = fetch(INDEX_URL)
+      .then(r => (r.ok ? r.json() : null))
+      .then((index: SearchIndex | null) => (index && index.version === TEXT_VERSION ? index : null))
+      .catch(() => null);
+  }
+  return pending;
+}
+
+/**
+ * BM25 scores by slug for documents containing every query term (AND).
+ * The last term also matches as a prefix, so partially typed words still hit.
+ */
+export function search(index: SearchIndex, query: string): Map<string, number> {
+  const queryTerms = [...new Set(tokenize(query))];
+  const scores = new Map<string, number>();
+  if (queryTerms.length === 0) return scores;
+
+  const n = index.docs.length;
+  const totals = new Float64Array(n);
+  const matched = new Uint16Array(n);
+
+  queryTerms.forEach((term, i) => {
+    const isLast = i === queryTerms.length - 1;
+    const expansions = isLast
+      ? Object.keys(index.terms).filter(t => t.startsWith(term))
+      : index.terms[term] ? [term] : [];
+    const hit = new Uint8Array(n);
+    for (const t of expansions) {
+      const postings = index.terms[t];
+      const df = postings.length / 2;
+      const idf = Math.log(1 + (n - df + 0.5) / (df + 0.5));
+      for (let j = 0; j < postings.length; j += 2) {
+        const doc = postings[j];
+        const tf = postings[j + 1];
+        const norm = index.k1 * (1 - index.b + index.b * index.lengths[doc] / index.avgdl);
+        totals[doc] += idf * (tf * (index.k1 + 1)) / (tf + norm);
+        hit[doc] = 1;
+      }
+    }
+    for (let doc = 0; doc < n; doc++) matched[doc] += hit[doc];
+  });
+
+  for (let doc = 0; doc < n; doc++) {
+    if (matched[doc] === queryTerms.length) scores.set(index.docs[doc], totals[doc]);
+  }
+  return scores;
+}